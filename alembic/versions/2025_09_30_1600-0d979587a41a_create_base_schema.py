@@ -0,0 +1,138 @@
+"""create base schema
+
+Revision ID: 0d979587a41a
+Revises:
+Create Date: 2025-09-30 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import context, op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0d979587a41a'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+room_status = sa.Enum('WAITING', 'ACTIVE', 'FINISHED', name='roomstatus')
+round_status = sa.Enum('QUESTION', 'ANSWERING', 'VOTING', 'RESULTS', 'COMPLETED', name='roundstatus')
+
+
+def upgrade() -> None:
+    # Databases built by the app's old create_all on import already have these
+    # tables; adopt them instead of failing. Offline --sql output assumes none exist.
+    existing = set() if context.is_offline_mode() else set(sa.inspect(op.get_bind()).get_table_names())
+
+    if 'users' not in existing:
+        op.create_table(
+            'users',
+            sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column('email', sa.String(length=255), nullable=False),
+            sa.Column('username', sa.String(length=100), nullable=False),
+            sa.Column('password_hash', sa.String(length=255), nullable=False),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_users_id', 'users', ['id'])
+        op.create_index('ix_users_email', 'users', ['email'], unique=True)
+
+    if 'rooms' not in existing:
+        op.create_table(
+            'rooms',
+            sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column('code', sa.String(length=10), nullable=False),
+            sa.Column('host_id', postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column('status', room_status, nullable=False),
+            sa.Column('max_players', sa.Integer(), nullable=True),
+            sa.Column('total_rounds', sa.Integer(), nullable=True),
+            sa.Column('current_round', sa.Integer(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(['host_id'], ['users.id']),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_rooms_id', 'rooms', ['id'])
+        op.create_index('ix_rooms_code', 'rooms', ['code'], unique=True)
+
+    if 'room_participants' not in existing:
+        op.create_table(
+            'room_participants',
+            sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column('room_id', postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column('joined_at', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(['room_id'], ['rooms.id'], ondelete='CASCADE'),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+            sa.PrimaryKeyConstraint('id')
+        )
+
+    if 'rounds' not in existing:
+        op.create_table(
+            'rounds',
+            sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column('room_id', postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column('round_number', sa.Integer(), nullable=False),
+            sa.Column('question', sa.Text(), nullable=False),
+            sa.Column('status', round_status, nullable=False),
+            sa.Column('started_at', sa.DateTime(), nullable=True),
+            sa.Column('ends_at', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(['room_id'], ['rooms.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_rounds_id', 'rounds', ['id'])
+
+    if 'answers' not in existing:
+        op.create_table(
+            'answers',
+            sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column('round_id', postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column('content', sa.Text(), nullable=False),
+            sa.Column('submitted_at', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(['round_id'], ['rounds.id'], ondelete='CASCADE'),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_answers_id', 'answers', ['id'])
+
+    if 'votes' not in existing:
+        op.create_table(
+            'votes',
+            sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column('round_id', postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column('voter_id', postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column('answer_id', postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(['answer_id'], ['answers.id'], ondelete='CASCADE'),
+            sa.ForeignKeyConstraint(['round_id'], ['rounds.id'], ondelete='CASCADE'),
+            sa.ForeignKeyConstraint(['voter_id'], ['users.id']),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('round_id', 'voter_id', name='uq_round_voter')
+        )
+        op.create_index('ix_votes_id', 'votes', ['id'])
+
+    if 'scores' not in existing:
+        op.create_table(
+            'scores',
+            sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column('room_id', postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column('round_id', postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column('points', sa.Integer(), nullable=True),
+            sa.ForeignKeyConstraint(['room_id'], ['rooms.id'], ondelete='CASCADE'),
+            sa.ForeignKeyConstraint(['round_id'], ['rounds.id'], ondelete='CASCADE'),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_scores_id', 'scores', ['id'])
+
+
+def downgrade() -> None:
+    for table in ('scores', 'votes', 'answers', 'rounds', 'room_participants', 'rooms', 'users'):
+        op.drop_table(table)
+    # Postgres keeps enum types after their tables are dropped
+    if op.get_context().dialect.name == 'postgresql':
+        op.execute('DROP TYPE IF EXISTS roundstatus')
+        op.execute('DROP TYPE IF EXISTS roomstatus')
@@ -1,25 +1,29 @@
 """add questions column to rooms
 
 Revision ID: 2c0bceac9e7a
-Revises: 
+Revises: 0d979587a41a
 Create Date: 2025-09-30 16:02:30.238464
 
 """
 from typing import Sequence, Union
-from alembic import op
+from alembic import context, op
 import sqlalchemy as sa
 
 
 # revision identifiers, used by Alembic.
 revision: str = '2c0bceac9e7a'
-down_revision: Union[str, None] = None
+down_revision: Union[str, None] = '0d979587a41a'
 branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
 
 def upgrade() -> None:
-    # Add questions column to rooms table
-    op.add_column('rooms', sa.Column('questions', sa.JSON(), nullable=True))
+    # Add questions column to rooms table (already there if create_all made the table)
+    columns = set() if context.is_offline_mode() else {
+        column['name'] for column in sa.inspect(op.get_bind()).get_columns('rooms')
+    }
+    if 'questions' not in columns:
+        op.add_column('rooms', sa.Column('questions', sa.JSON(), nullable=True))
 
 
 def downgrade() -> None:
@@ -0,0 +1,31 @@
+"""add summary column to rounds
+
+Revision ID: 7d41e9a3b5c2
+Revises: 2c0bceac9e7a
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d41e9a3b5c2'
+down_revision: Union[str, None] = '2c0bceac9e7a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Add summary column to rounds table (already there if create_all made the table)
+    columns = set() if context.is_offline_mode() else {
+        column['name'] for column in sa.inspect(op.get_bind()).get_columns('rounds')
+    }
+    if 'summary' not in columns:
+        op.add_column('rounds', sa.Column('summary', sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    # Remove summary column from rounds table
+    op.drop_column('rounds', 'summary')
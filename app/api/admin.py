@@ -0,0 +1,59 @@
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import PlainTextResponse
+from app.config import settings
+from app.dependencies import require_admin
+from app.services.drain import drain
+from app.utils.profiler import sampling_profiler, handler_profiler, ProfilerBusyError
+from app.utils.exceptions import BadRequestException, ConflictException
+
+router = APIRouter(prefix="/api/admin", tags=["Admin"], dependencies=[Depends(require_admin)])
+
+
+def _check_duration(seconds: float):
+    if seconds > settings.PROFILE_MAX_SECONDS:
+        raise BadRequestException(f"seconds must be at most {settings.PROFILE_MAX_SECONDS}")
+
+
+@router.get("/profile", response_class=PlainTextResponse)
+async def sample_profile(
+    seconds: float = Query(10, gt=0),
+    interval_ms: float = Query(5, ge=1, le=1000)
+):
+    """
+    Sample this worker's stacks for `seconds` and return collapsed stacks
+    (one "frame;frame;frame count" line per stack), ready for flamegraph.pl or speedscope
+    """
+    _check_duration(seconds)
+    try:
+        stacks = await sampling_profiler.profile(seconds, interval_ms / 1000)
+    except ProfilerBusyError as e:
+        raise ConflictException(str(e))
+    return PlainTextResponse(stacks)
+
+
+@router.get("/profile/handlers")
+async def profile_handlers(seconds: float = Query(10, gt=0)):
+    """Per Socket.IO handler wall, CPU and DB time recorded over the next `seconds`"""
+    _check_duration(seconds)
+    try:
+        handlers = await handler_profiler.collect(seconds)
+    except ProfilerBusyError as e:
+        raise ConflictException(str(e))
+    return {"seconds": seconds, "handlers": handlers}
+
+
+@router.post("/drain", status_code=202)
+async def start_drain():
+    """
+    Take this worker out of rotation for a rolling deploy: refuse new games, finish
+    in-flight work, then move clients to other workers. Same as sending SIGUSR1.
+    """
+    from app.websocket.events import sio
+    started = drain.start(sio)
+    return {"started": started, **drain.status()}
+
+
+@router.get("/drain")
+async def drain_status():
+    """Progress of a drain started on this worker"""
+    return drain.status()
@@ -1,23 +1,26 @@
-from fastapi import APIRouter, Depends, Response, status
+from fastapi import APIRouter, Depends, Request, Response, status
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.schemas.user import UserCreate, UserLogin, UserResponse
 from app.schemas.auth import AuthResponse
 from app.services.auth_service import AuthService
-from app.utils.security import create_access_token
+from app.utils.security import create_user_access_token
+from app.utils.rate_limit import enforce_auth_rate_limit
 from app.dependencies import get_current_user
 from app.models.user import User
+from app.utils.responses import model_response
 
 router = APIRouter(prefix="/api/auth", tags=["Authentication"])
 
 
 @router.post("/register", response_model=AuthResponse, status_code=status.HTTP_201_CREATED)
-async def register(user_data: UserCreate, response: Response, db: Session = Depends(get_db)):
+async def register(user_data: UserCreate, request: Request, response: Response, db: Session = Depends(get_db)):
     """Register a new user"""
-    user = AuthService.register(user_data, db)
+    await enforce_auth_rate_limit(request, user_data.email)
+    user = await AuthService.register_async(user_data, db)
 
     # Create access token
-    access_token = create_access_token(data={"sub": str(user.id)})
+    access_token = create_user_access_token(user)
 
     # Set httponly cookie
     response.set_cookie(
@@ -35,12 +38,13 @@ async def register(user_data: UserCreate, response: Response, db: Session = Depe
 
 
 @router.post("/login", response_model=AuthResponse)
-async def login(credentials: UserLogin, response: Response, db: Session = Depends(get_db)):
+async def login(credentials: UserLogin, request: Request, response: Response, db: Session = Depends(get_db)):
     """Login user"""
-    user = AuthService.authenticate(credentials.email, credentials.password, db)
+    await enforce_auth_rate_limit(request, credentials.email)
+    user = await AuthService.authenticate_async(credentials.email, credentials.password, db)
 
     # Create access token
-    access_token = create_access_token(data={"sub": str(user.id)})
+    access_token = create_user_access_token(user)
 
     # Set httponly cookie
     response.set_cookie(
@@ -65,4 +69,4 @@ async def logout(response: Response):
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_info(current_user: User = Depends(get_current_user)):
     """Get current user info"""
-    return UserResponse.model_validate(current_user)
+    return model_response(UserResponse.model_validate(current_user))
@@ -9,8 +9,9 @@ from app.schemas.game import (
 )
 from app.services.game_service import GameService
 from app.services.room_service import RoomService
-from app.dependencies import get_current_user
-from app.models.user import User
+from app.dependencies import get_current_principal
+from app.schemas.records import Principal
+from app.utils.responses import model_response
 
 router = APIRouter(prefix="/api/game", tags=["Game"])
 
@@ -18,7 +19,7 @@ router = APIRouter(prefix="/api/game", tags=["Game"])
 @router.post("/{room_code}/start")
 async def start_game(
     room_code: str,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """Start the game (host only)"""
@@ -30,46 +31,46 @@ async def start_game(
 async def submit_answer(
     round_id: UUID,
     answer_data: AnswerSubmit,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """Submit an answer for a round"""
     answer = GameService.submit_answer(round_id, current_user.id, answer_data.content, db)
-    return AnswerResponse(
+    return model_response(AnswerResponse(
         id=answer.id,
         content=answer.content,
         vote_count=0,
         is_own_answer=True
-    )
+    ), status_code=status.HTTP_201_CREATED)
 
 
 @router.get("/rounds/{round_id}/answers", response_model=List[AnswerResponse])
 async def get_round_answers(
     round_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """Get all answers for a round"""
     answers = GameService.get_round_answers(round_id, db)
+    vote_counts = GameService.get_round_vote_counts(round_id, db)
 
     response = []
     for answer in answers:
-        vote_count = GameService.get_answer_vote_count(answer.id, db)
         response.append(AnswerResponse(
             id=answer.id,
             content=answer.content,
-            vote_count=vote_count,
+            vote_count=vote_counts.get(answer.id, 0),
             is_own_answer=(answer.user_id == current_user.id)
         ))
 
-    return response
+    return model_response(response)
 
 
 @router.post("/rounds/{round_id}/vote", status_code=status.HTTP_201_CREATED)
 async def submit_vote(
     round_id: UUID,
     vote_data: VoteSubmit,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """Submit a vote for an answer"""
@@ -80,23 +81,21 @@ async def submit_vote(
 @router.get("/{room_code}/leaderboard", response_model=LeaderboardResponse)
 async def get_leaderboard(
     room_code: str,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """Get leaderboard for a room"""
     room = RoomService.get_room(room_code, db)
     leaderboard_data = GameService.get_leaderboard(room.id, db)
 
-    # Get user details
-    scores = []
-    for entry in leaderboard_data:
-        user = db.query(User).filter(User.id == entry['user_id']).first()
-        if user:
-            scores.append(ScoreResponse(
-                user_id=user.id,
-                username=user.username,
-                total_points=entry['total_points'],
-                round_points=0
-            ))
+    scores = [
+        ScoreResponse(
+            user_id=entry.user_id,
+            username=entry.username,
+            total_points=entry.score,
+            round_points=0
+        )
+        for entry in leaderboard_data
+    ]
 
-    return LeaderboardResponse(scores=scores)
\ No newline at end of file
+    return model_response(LeaderboardResponse(scores=scores))
\ No newline at end of file
@@ -0,0 +1,28 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+from app.dependencies import require_admin
+from app.utils.metrics import registry
+from app.services.ai_metrics import ai_stats
+
+# The JSON snapshots include per-room spend, so they are for operators only;
+# /metrics carries no room labels and stays open for the scraper
+router = APIRouter(prefix="/api/metrics", tags=["Metrics"], dependencies=[Depends(require_admin)])
+prometheus_router = APIRouter(tags=["Metrics"])
+
+
+@router.get("")
+async def get_metrics():
+    """Snapshot of in-process counters, gauges and histogram totals"""
+    return registry.snapshot()
+
+
+@router.get("/ai")
+async def get_ai_metrics(top_rooms: int = 20):
+    """Model call latency, tokens, estimated cost, fallback rate and parse yield, plus the costliest rooms"""
+    return ai_stats.summary(top_rooms)
+
+
+@prometheus_router.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Every registered metric in Prometheus text format"""
+    return PlainTextResponse(registry.render_prometheus(), media_type="text/plain; version=0.0.4")
@@ -1,12 +1,18 @@
-from fastapi import APIRouter, Depends, status, Request
+from fastapi import APIRouter, Depends, status, Request, Response
 from sqlalchemy.orm import Session
 from typing import List
 from app.database import get_db
 from app.schemas.room import RoomCreate, RoomJoin, RoomResponse, RoomDetailResponse
 from app.schemas.user import UserInRoom
 from app.services.room_service import RoomService
-from app.dependencies import get_current_user
-from app.models.user import User
+from app.services.drain import drain
+from app.services.room_cache import cache_requests, room_details
+from app.dependencies import get_current_principal
+from app.schemas.records import Principal
+from app.config import settings
+from app.utils.db_routing import use_primary
+from app.utils.exceptions import ServiceUnavailableException
+from app.utils.responses import dump_model_json, model_response
 
 router = APIRouter(prefix="/api/rooms", tags=["Rooms"])
 
@@ -14,19 +20,22 @@ router = APIRouter(prefix="/api/rooms", tags=["Rooms"])
 @router.post("", response_model=RoomResponse, status_code=status.HTTP_201_CREATED)
 async def create_room(
     room_data: RoomCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """Create a new game room"""
+    if drain.draining:
+        # New games belong on a worker that is staying up
+        raise ServiceUnavailableException("Server is restarting", settings.DRAIN_RECONNECT_SPREAD_SECONDS)
     room = RoomService.create_room(room_data, current_user.id, db)
-    return RoomResponse.model_validate(room)
+    return model_response(RoomResponse.model_validate(room), status_code=status.HTTP_201_CREATED)
 
 
 @router.post("/join", response_model=RoomResponse)
 async def join_room(
     join_data: RoomJoin,
     request: Request,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """Join an existing room"""
@@ -42,36 +51,62 @@ async def join_room(
             'user_id': str(current_user.id),
             'username': current_user.username,
             'participant_count': len(participants),
-            'participants': [{'id': str(p.id), 'username': p.username} for p in participants]
+            'participants': [p.to_dict() for p in participants]
         }, room=join_data.code)
     except Exception as e:
         # Log but don't fail the request if WebSocket emission fails
         print(f"WebSocket emission failed: {e}")
 
-    return RoomResponse.model_validate(room)
+    return model_response(RoomResponse.model_validate(room))
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
 
 
 @router.get("/{room_code}", response_model=RoomDetailResponse)
 async def get_room(
     room_code: str,
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
-    """Get room details"""
-    room = RoomService.get_room(room_code, db)
-    participants = RoomService.get_room_participants(room.id, db)
+    """
+    Get room details. Bodies are cached per room version, and a matching
+    If-None-Match gets 304 without touching the database.
+    """
+    cached = room_details.get(room_code)
+    outcome = "hit"
+    if cached is None:
+        outcome = "miss"
+        since = room_details.begin()
+        # The body is stored under the newest version, so it must not come from a lagging replica
+        use_primary(db)
+        room = RoomService.get_room(room_code, db)
+        participants = RoomService.get_room_participants(room.id, db)
+        detail = RoomDetailResponse(
+            **RoomResponse.model_validate(room).model_dump(),
+            participants=[UserInRoom.model_validate(p) for p in participants],
+            participant_count=len(participants)
+        )
+        cached = room_details.store(room_code, room.id, dump_model_json(detail), since)
+
+    headers = {"Cache-Control": "private, no-cache"}
+    if cached.etag is not None:
+        headers["ETag"] = cached.etag
+        if _etag_matches(request.headers.get("if-none-match", ""), cached.etag):
+            cache_requests.inc(outcome="not_modified")
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
 
-    return RoomDetailResponse(
-        **RoomResponse.model_validate(room).model_dump(),
-        participants=[UserInRoom.model_validate(p) for p in participants],
-        participant_count=len(participants)
-    )
+    cache_requests.inc(outcome=outcome)
+    return Response(cached.body, media_type="application/json", headers=headers)
 
 
 @router.delete("/{room_code}/leave")
 async def leave_room(
     room_code: str,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """Leave a room"""
@@ -88,7 +123,7 @@ async def leave_room(
             'user_id': str(current_user.id),
             'username': current_user.username,
             'participant_count': len(participants),
-            'participants': [{'id': str(p.id), 'username': p.username} for p in participants]
+            'participants': [p.to_dict() for p in participants]
         }, room=room_code)
     except Exception as e:
         print(f"WebSocket emission failed: {e}")
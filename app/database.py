@@ -1,16 +1,32 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from app.config import settings
+from app.utils.db_pool import engine_options
+from app.utils.db_routing import RoutingSession
+from app.utils.query_stats import install as install_query_stats
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20
-)
+# Pool size, timeouts and pooler (PgBouncer) mode come from the DB_* settings
+engine = create_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL))
+
+# Optional read replica for @replica_read service calls (see app.utils.db_routing)
+replica_engine = None
+if settings.DATABASE_REPLICA_URL:
+    replica_engine = create_engine(settings.DATABASE_REPLICA_URL, **engine_options(settings.DATABASE_REPLICA_URL))
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Count statements per HTTP request / socket event (see app.utils.query_stats)
+install_query_stats()
+
+SessionLocal = sessionmaker(
+    class_=RoutingSession,
+    autocommit=False,
+    autoflush=False,
+    bind=engine,
+    replica=replica_engine
+)
 
 Base = declarative_base()
 
@@ -24,6 +40,33 @@ def get_db():
         db.close()
 
 
+_current_session: ContextVar[Optional[Session]] = ContextVar("db_session", default=None)
+
+
+@contextmanager
+def session_scope() -> Iterator[Session]:
+    """
+    Session for one socket event or background job. Nested scopes in the same
+    event reuse it; the outermost scope rolls back on error and returns the
+    connection to the pool on every path.
+    """
+    db = _current_session.get()
+    if db is not None:
+        yield db
+        return
+
+    db = SessionLocal()
+    token = _current_session.set(db)
+    try:
+        yield db
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        _current_session.reset(token)
+        db.close()
+
+
 def init_db():
     """Initialize database tables"""
     Base.metadata.create_all(bind=engine)
\ No newline at end of file
@@ -1,12 +1,16 @@
-from fastapi import Depends, Cookie, HTTPException, status
+import hmac
+from fastapi import Depends, Cookie, Header, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import Optional
 from uuid import UUID
 from app.database import get_db
 from app.utils.security import verify_token
+from app.utils.db_routing import set_actor
 from app.services.auth_service import AuthService
 from app.models.user import User
-from app.utils.exceptions import AuthenticationException
+from app.schemas.records import Principal
+from app.config import settings
+from app.utils.exceptions import AuthenticationException, ForbiddenException
 
 
 async def get_current_user(
@@ -25,6 +29,7 @@ async def get_current_user(
 
         if user_id is None:
             raise AuthenticationException("Invalid token payload")
+        set_actor(user_id)
 
         user = AuthService.get_user_by_id(user_id, db)
         return user
@@ -35,6 +40,38 @@ async def get_current_user(
         raise AuthenticationException(f"Authentication error: {str(e)}")
 
 
+async def get_current_principal(
+    access_token: Optional[str] = Cookie(None),
+    db: Session = Depends(get_db)
+) -> Principal:
+    """
+    Dependency returning the caller's id and username from the token claims.
+    Only tokens issued before the username claim existed fall back to a user lookup.
+    """
+    if not access_token:
+        raise AuthenticationException("Not authenticated")
+
+    try:
+        payload = verify_token(access_token)
+        user_id: str = payload.get("sub")
+
+        if user_id is None:
+            raise AuthenticationException("Invalid token payload")
+        set_actor(user_id)
+
+        username = payload.get("username")
+        if username is None:
+            user = AuthService.get_user_by_id(user_id, db)
+            return Principal(user.id, user.username)
+
+        return Principal(UUID(user_id), username)
+
+    except ValueError:
+        raise AuthenticationException("Could not validate credentials")
+    except Exception as e:
+        raise AuthenticationException(f"Authentication error: {str(e)}")
+
+
 async def get_current_user_optional(
     access_token: Optional[str] = Cookie(None),
     db: Session = Depends(get_db)
@@ -56,4 +93,15 @@ async def get_current_user_optional(
         return user
 
     except:
-        return None
\ No newline at end of file
+        return None
+
+
+async def require_admin(x_admin_key: Optional[str] = Header(None)) -> None:
+    """
+    Dependency guarding operator endpoints with the shared ADMIN_API_KEY.
+    Always refuses while no key is configured.
+    """
+    if not settings.ADMIN_API_KEY:
+        raise ForbiddenException("Admin endpoints are disabled")
+    if not x_admin_key or not hmac.compare_digest(x_admin_key.encode(), settings.ADMIN_API_KEY.encode()):
+        raise ForbiddenException("Invalid admin key")
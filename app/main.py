@@ -1,18 +1,28 @@
+import asyncio
+import importlib
+import signal
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 import socketio
 from app.config import settings
-from app.database import engine, Base
-from app.api import auth, rooms, game
+from app.database import engine, SessionLocal
+from app.api import auth, rooms, game, metrics, admin
 from app.websocket.events import sio
-from app.utils.logger import get_logger
+from app.utils.logger import configure_logging, get_logger, shutdown_logging
+from app.utils.instrumentation import MetricsMiddleware, pool_stats_collector, room_status_collector
+from app.utils.metrics import registry
+from app.utils.responses import DefaultJSONResponse
+from app.utils.password_hasher import password_hasher
+from app.services.question_pool import question_pool
+from app.services.question_feed import question_feeds
+from app.services.round_summary import round_summaries
+from app.services.question_corpus import question_corpus
+from app.services.drain import drain
 from app import models  # Import models to register them with Base
 
 logger = get_logger(__name__)
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
-
 # Create FastAPI app
 app = FastAPI(
     title="Real-Time Voting Game API",
@@ -20,6 +30,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=DefaultJSONResponse,
 )
 
 # CORS middleware
@@ -31,10 +42,20 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# REST latency per route template
+app.add_middleware(MetricsMiddleware)
+
 # Include routers
 app.include_router(auth.router)
 app.include_router(rooms.router)
 app.include_router(game.router)
+app.include_router(metrics.router)
+app.include_router(metrics.prometheus_router)
+app.include_router(admin.router)
+
+# Gauges refreshed on each /metrics scrape
+registry.add_collector(pool_stats_collector(engine))
+registry.add_collector(room_status_collector(SessionLocal))
 
 
 @app.get("/")
@@ -45,10 +66,41 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint"""
+    """Health check endpoint (503 while draining, so the load balancer stops routing here)"""
+    if drain.draining:
+        return JSONResponse({"status": "draining", "phase": drain.phase}, status_code=503)
     return {"status": "healthy"}
 
 
+@app.on_event("startup")
+async def startup():
+    """Start the logging pipeline and background question generation"""
+    configure_logging()
+    if not settings.use_template_questions:
+        # Load the model SDK off the event loop; the client itself is built on first call
+        asyncio.get_running_loop().run_in_executor(None, importlib.import_module, "openai")
+    question_pool.warm(settings.question_pool_categories)
+
+    # uvicorn owns SIGTERM/SIGINT, so deploys ask for a drain with SIGUSR1 first
+    drain_signal = getattr(signal, "SIGUSR1", None)
+    if drain_signal is not None:
+        try:
+            asyncio.get_running_loop().add_signal_handler(drain_signal, drain.start, sio)
+        except (NotImplementedError, RuntimeError):
+            logger.warning("Drain signal handler not available on this platform")
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Release worker pools and background tasks"""
+    password_hasher.shutdown()
+    await question_pool.close()
+    await question_feeds.close()
+    await round_summaries.close()
+    question_corpus.close()
+    shutdown_logging()
+
+
 # Create Socket.IO ASGI app
 socket_app = socketio.ASGIApp(sio, app, socketio_path="/socket.io")
 
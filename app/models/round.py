@@ -25,6 +25,7 @@ class Round(Base):
     status = Column(Enum(RoundStatus), default=RoundStatus.QUESTION, nullable=False)
     started_at = Column(DateTime, default=datetime.utcnow)
     ends_at = Column(DateTime, nullable=True)
+    summary = Column(Text, nullable=True)
 
     # Relationships
     room = relationship("Room", back_populates="rounds")
@@ -30,6 +30,7 @@ class RoundResponse(BaseModel):
     status: RoundStatus
     started_at: datetime
     ends_at: Optional[datetime] = None
+    summary: Optional[str] = None
 
     class Config:
         from_attributes = True
@@ -0,0 +1,62 @@
+from typing import Any, Dict
+from uuid import UUID
+
+
+class ParticipantRecord:
+    """Lightweight (id, username) row for participant lists and broadcasts"""
+    __slots__ = ("id", "username")
+
+    def __init__(self, id: UUID, username: str):
+        self.id = id
+        self.username = username
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'id': str(self.id), 'username': self.username}
+
+    def __repr__(self):
+        return f"<ParticipantRecord {self.username}>"
+
+
+class AnswerRecord:
+    """Lightweight answer row without ORM identity-map tracking"""
+    __slots__ = ("id", "user_id", "content")
+
+    def __init__(self, id: UUID, user_id: UUID, content: str):
+        self.id = id
+        self.user_id = user_id
+        self.content = content
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Anonymized form used in voting broadcasts"""
+        return {'id': str(self.id), 'content': self.content}
+
+    def __repr__(self):
+        return f"<AnswerRecord {self.id}>"
+
+
+class LeaderboardRecord:
+    """Aggregated score row for a single user in a room"""
+    __slots__ = ("user_id", "username", "score")
+
+    def __init__(self, user_id: UUID, username: str, score: int):
+        self.user_id = user_id
+        self.username = username
+        self.score = score
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'user_id': str(self.user_id), 'username': self.username, 'score': self.score}
+
+    def __repr__(self):
+        return f"<LeaderboardRecord {self.username}={self.score}>"
+
+
+class Principal:
+    """Authenticated identity taken from the access token claims"""
+    __slots__ = ("id", "username")
+
+    def __init__(self, id: UUID, username: str):
+        self.id = id
+        self.username = username
+
+    def __repr__(self):
+        return f"<Principal {self.username}>"
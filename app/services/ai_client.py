@@ -0,0 +1,428 @@
+import asyncio
+import contextlib
+import enum
+import heapq
+import itertools
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Deque, Dict, List, Optional, Tuple
+from app.config import settings
+from app.utils.metrics import registry
+from app.utils.logger import get_logger
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+logger = get_logger(__name__)
+
+calls = registry.counter(
+    "ai_upstream_calls_total",
+    "Model calls through the resilient client by outcome",
+    ["call_site", "outcome"]
+)
+hedges = registry.counter(
+    "ai_hedged_requests_total",
+    "Second requests sent after the hedge delay, by which request won",
+    ["call_site", "winner"]
+)
+circuit_state = registry.gauge(
+    "ai_circuit_open",
+    "1 while the AI circuit breaker is open or half-open"
+)
+queue_depth = registry.gauge(
+    "ai_queue_depth",
+    "Model calls waiting for an outbound slot, by priority",
+    ["priority"]
+)
+inflight = registry.gauge(
+    "ai_inflight_calls",
+    "Model calls currently holding an outbound slot"
+)
+queue_wait = registry.histogram(
+    "ai_queue_wait_seconds",
+    "Time spent waiting for an outbound slot, by priority",
+    ["priority"],
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+)
+shed = registry.counter(
+    "ai_shed_total",
+    "Model calls rejected by the outbound scheduler, by priority",
+    ["priority"]
+)
+
+
+class Priority(enum.IntEnum):
+    """Outbound call classes; lower values are served first"""
+    INTERACTIVE = 0  # a host is waiting on start_game
+    FALLBACK = 1  # a round is missing its question
+    BACKGROUND = 2  # pool refills and round summaries
+
+
+# Priority of model calls made from the current task; set by callers and inherited
+# by the tasks they spawn
+current_priority: ContextVar[Priority] = ContextVar("ai_current_priority", default=Priority.INTERACTIVE)
+
+
+def set_priority(priority: Priority):
+    current_priority.set(priority)
+
+
+class AIUnavailableError(Exception):
+    """The model could not answer within policy; callers should use local questions"""
+
+
+class CircuitOpenError(AIUnavailableError):
+    pass
+
+
+class AIDeadlineExceeded(AIUnavailableError):
+    pass
+
+
+class AIOverloadedError(AIUnavailableError):
+    """Shed by the outbound scheduler instead of queueing"""
+
+
+class CircuitBreaker:
+    """Opens after consecutive failures, then lets a single trial call through after reset_timeout"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0, clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+
+    def allow(self) -> bool:
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN and self.clock() - self.opened_at >= self.reset_timeout:
+            self.state = self.HALF_OPEN
+            self._trial_in_flight = False
+        if self.state == self.HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self):
+        if self.state != self.CLOSED:
+            logger.info("AI circuit closed")
+        self.state = self.CLOSED
+        self.failures = 0
+        self._trial_in_flight = False
+        circuit_state.set(0)
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                logger.warning("AI circuit opened after %s consecutive failures", self.failures)
+            self.state = self.OPEN
+            self.opened_at = self.clock()
+            self._trial_in_flight = False
+            circuit_state.set(1)
+
+    def release_trial(self):
+        """Let the next call try after the trial ended without a success or failure"""
+        if self.state == self.HALF_OPEN:
+            self._trial_in_flight = False
+
+
+class LatencyTracker:
+    """Recent successful call latencies for one call site"""
+
+    def __init__(self, window: int = 200):
+        self._samples: Deque[float] = deque(maxlen=window)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def add(self, seconds: float):
+        self._samples.append(seconds)
+
+    def percentile(self, p: float) -> Optional[float]:
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+
+class OutboundScheduler:
+    """
+    Global cap on concurrent model calls. Waiting calls are served by priority,
+    then arrival order. Background calls are shed once shed_background_depth calls
+    are queued, and only interactive calls may queue past max_queue.
+    """
+
+    def __init__(self, max_concurrency: int = 8, max_queue: int = 100, shed_background_depth: int = 4):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.shed_background_depth = shed_background_depth
+        self.active = 0
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._depth: Dict[Priority, int] = {priority: 0 for priority in Priority}
+
+    def queued(self, priority: Optional[Priority] = None) -> int:
+        if priority is None:
+            return sum(self._depth.values())
+        return self._depth[priority]
+
+    def _set_depth(self, priority: Priority, delta: int):
+        self._depth[priority] += delta
+        queue_depth.set(self._depth[priority], priority=priority.name.lower())
+
+    def try_acquire(self) -> bool:
+        """Take a slot only if one is free and nobody is waiting"""
+        if self.active < self.max_concurrency and not self.queued():
+            self.active += 1
+            inflight.set(self.active)
+            return True
+        return False
+
+    async def acquire(self, priority: Priority, timeout: Optional[float] = None):
+        label = priority.name.lower()
+        if self.try_acquire():
+            queue_wait.observe(0.0, priority=label)
+            return
+
+        depth = self.queued()
+        if (priority == Priority.BACKGROUND and depth >= self.shed_background_depth) or (
+            priority != Priority.INTERACTIVE and depth >= self.max_queue
+        ):
+            shed.inc(priority=label)
+            raise AIOverloadedError(f"Outbound AI queue is full ({depth} waiting)")
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (int(priority), next(self._sequence), future))
+        self._set_depth(priority, 1)
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(future, timeout)
+        except BaseException:
+            if future.done() and not future.cancelled():
+                # The slot was handed over just as we gave up; pass it on
+                self.release()
+            else:
+                future.cancel()
+                self._set_depth(priority, -1)
+            raise
+        queue_wait.observe(time.perf_counter() - started, priority=label)
+
+    def release(self):
+        """Hand the slot to the highest-priority waiter, or free it"""
+        while self._waiters:
+            priority, _, future = heapq.heappop(self._waiters)
+            if future.done():
+                continue
+            self._set_depth(Priority(priority), -1)
+            future.set_result(None)
+            return
+        self.active -= 1
+        inflight.set(self.active)
+
+
+class ResilientAIClient:
+    """
+    Wraps chat completions with a per-call-site deadline, a hedged second request
+    once the call outlives the site's latency percentile, and a circuit breaker.
+    """
+
+    def __init__(
+        self,
+        client_factory: Optional[Callable[[], "AsyncOpenAI"]] = None,
+        deadlines: Optional[Dict[str, float]] = None,
+        default_deadline: float = 10.0,
+        hedge_percentile: float = 0.95,
+        hedge_min_samples: int = 20,
+        breaker: Optional[CircuitBreaker] = None,
+        scheduler: Optional[OutboundScheduler] = None
+    ):
+        self._client_factory = client_factory or _default_client
+        self._client: Optional["AsyncOpenAI"] = None
+        self.deadlines = deadlines or {}
+        self.default_deadline = default_deadline
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.breaker = breaker or CircuitBreaker()
+        self.scheduler = scheduler or OutboundScheduler()
+        self._latency: Dict[str, LatencyTracker] = {}
+
+    @property
+    def client(self) -> "AsyncOpenAI":
+        if self._client is None:
+            self._client = self._client_factory()
+        return self._client
+
+    def _tracker(self, call_site: str) -> LatencyTracker:
+        tracker = self._latency.get(call_site)
+        if tracker is None:
+            tracker = self._latency[call_site] = LatencyTracker()
+        return tracker
+
+    def hedge_delay(self, call_site: str) -> Optional[float]:
+        """Seconds to wait before hedging, or None until enough samples are collected"""
+        tracker = self._tracker(call_site)
+        if self.hedge_percentile <= 0 or len(tracker) < self.hedge_min_samples:
+            return None
+        return tracker.percentile(self.hedge_percentile)
+
+    async def _acquire(self, call_site: str, budget: float) -> float:
+        """Wait for an outbound slot within the call's budget; returns the budget left"""
+        started = time.perf_counter()
+        try:
+            await self.scheduler.acquire(current_priority.get(), budget)
+        except AIOverloadedError:
+            calls.inc(call_site=call_site, outcome="shed")
+            raise
+        except asyncio.TimeoutError:
+            calls.inc(call_site=call_site, outcome="queue_timeout")
+            raise AIDeadlineExceeded(f"{call_site} spent its {budget:.1f}s deadline waiting for a slot")
+        return max(0.0, budget - (time.perf_counter() - started))
+
+    @contextlib.asynccontextmanager
+    async def _admitted(self, call_site: str, budget: float) -> AsyncIterator[float]:
+        """Pass the circuit breaker, then hold an outbound slot; yields the budget left"""
+        if not self.breaker.allow():
+            calls.inc(call_site=call_site, outcome="circuit_open")
+            raise CircuitOpenError("AI upstream circuit is open")
+        trial = self.breaker.state == CircuitBreaker.HALF_OPEN
+        try:
+            budget = await self._acquire(call_site, budget)
+            try:
+                yield budget
+            finally:
+                self.scheduler.release()
+        except BaseException:
+            # Shed, cancelled or closed early: the trial gave no verdict, so hand it on
+            if trial:
+                self.breaker.release_trial()
+            raise
+
+    async def chat(self, call_site: str, deadline: Optional[float] = None, **kwargs) -> Any:
+        """chat.completions.create(**kwargs) under the call site's resilience policy"""
+        budget = deadline or self.deadlines.get(call_site, self.default_deadline)
+        async with self._admitted(call_site, budget) as budget:
+            started = time.perf_counter()
+            try:
+                response = await asyncio.wait_for(self._hedged(call_site, budget, kwargs), budget)
+            except asyncio.TimeoutError:
+                self.breaker.record_failure()
+                calls.inc(call_site=call_site, outcome="timeout")
+                raise AIDeadlineExceeded(f"{call_site} exceeded its {budget:.1f}s deadline")
+            except Exception:
+                self.breaker.record_failure()
+                calls.inc(call_site=call_site, outcome="error")
+                raise
+
+        self.breaker.record_success()
+        self._tracker(call_site).add(time.perf_counter() - started)
+        calls.inc(call_site=call_site, outcome="ok")
+        return response
+
+    async def stream(self, call_site: str, deadline: Optional[float] = None, **kwargs) -> AsyncIterator[str]:
+        """
+        Content deltas of a streamed chat completion. The whole stream shares the
+        call site's deadline; streams are never hedged.
+        """
+        budget = deadline or self.deadlines.get(call_site, self.default_deadline)
+        async with self._admitted(call_site, budget) as budget:
+            loop = asyncio.get_running_loop()
+            deadline_at = loop.time() + budget
+            response = None
+            try:
+                response = await asyncio.wait_for(
+                    self.client.chat.completions.create(stream=True, **kwargs), budget
+                )
+                chunks = response.__aiter__()
+                while True:
+                    try:
+                        chunk = await asyncio.wait_for(chunks.__anext__(), max(0.0, deadline_at - loop.time()))
+                    except StopAsyncIteration:
+                        break
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+            except asyncio.TimeoutError:
+                self.breaker.record_failure()
+                calls.inc(call_site=call_site, outcome="timeout")
+                raise AIDeadlineExceeded(f"{call_site} stream exceeded its {budget:.1f}s deadline")
+            except Exception:
+                self.breaker.record_failure()
+                calls.inc(call_site=call_site, outcome="error")
+                raise
+            finally:
+                if response is not None:
+                    await response.response.aclose()
+
+        self.breaker.record_success()
+        calls.inc(call_site=call_site, outcome="ok")
+
+    async def _hedged(self, call_site: str, budget: float, kwargs: Dict[str, Any]) -> Any:
+        create = self.client.chat.completions.create
+        hedge_delay = self.hedge_delay(call_site)
+        if hedge_delay is None or hedge_delay >= budget:
+            return await create(**kwargs)
+
+        primary = asyncio.ensure_future(create(**kwargs))
+        tasks = [primary]
+        hedge_slot = False
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=hedge_delay)
+            if done:
+                return primary.result()
+
+            # Only hedge with spare capacity; never queue extra load behind real calls
+            if not self.scheduler.try_acquire():
+                return await primary
+            hedge_slot = True
+
+            tasks.append(asyncio.ensure_future(create(**kwargs)))
+            pending = set(tasks)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        hedges.inc(call_site=call_site, winner="primary" if task is primary else "hedge")
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            if hedge_slot:
+                self.scheduler.release()
+
+
+def _default_client() -> "AsyncOpenAI":
+    # Imported on first model call: the SDK is a large share of app import time
+    from openai import AsyncOpenAI
+
+    return AsyncOpenAI(
+        api_key=settings.OPENAI_API_KEY,
+        base_url=settings.OPENAI_BASE_URL or None,
+        max_retries=0
+    )
+
+
+ai_client = ResilientAIClient(
+    deadlines={
+        "generate_questions": settings.AI_DEADLINE_GENERATE_QUESTIONS,
+        "generate_question": settings.AI_DEADLINE_GENERATE_QUESTION,
+        "generate_round_summary": settings.AI_DEADLINE_ROUND_SUMMARY,
+    },
+    hedge_percentile=settings.AI_HEDGE_PERCENTILE,
+    hedge_min_samples=settings.AI_HEDGE_MIN_SAMPLES,
+    breaker=CircuitBreaker(settings.AI_CIRCUIT_FAILURE_THRESHOLD, settings.AI_CIRCUIT_RESET_SECONDS),
+    scheduler=OutboundScheduler(
+        settings.AI_MAX_CONCURRENCY, settings.AI_MAX_QUEUE, settings.AI_SHED_BACKGROUND_DEPTH
+    )
+)
@@ -0,0 +1,186 @@
+import asyncio
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+from app.config import settings
+from app.services.ai_service import AIService
+from app.services.ai_metrics import attribute_room
+from app.services.ai_client import Priority, current_priority, set_priority
+from app.utils.metrics import registry
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+QuestionGenerator = Callable[[int, Optional[str]], Awaitable[List[str]]]
+QuestionStreamer = Callable[[int, Optional[str]], AsyncIterator[str]]
+
+coalesced_requests = registry.counter(
+    "ai_coalesced_requests_total",
+    "Question requests that went through the coalescer"
+)
+coalesced_model_calls = registry.counter(
+    "ai_coalesced_model_calls_total",
+    "Generation calls issued by the coalescer"
+)
+model_calls_saved = registry.counter(
+    "ai_model_calls_saved_total",
+    "Generation calls avoided by merging concurrent requests"
+)
+coalesce_wait = registry.histogram(
+    "ai_coalesce_wait_seconds",
+    "Latency added to a request while its batch window was open",
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5)
+)
+
+
+class _Batch:
+    def __init__(self, streaming: bool = False):
+        self.streaming = streaming
+        self.total = 0
+        self.priority = Priority.BACKGROUND
+        # (questions wanted, future for request() or queue for stream(), enqueued at)
+        self.waiters: List[Tuple[int, Any, float]] = []
+        self.full = asyncio.Event()
+
+
+class QuestionRequestCoalescer:
+    """
+    Single-flight merging of concurrent question requests: requests arriving within
+    `window` seconds of each other share one generation call, and each gets its own
+    non-overlapping slice of the result. Streamed requests share one streamed call
+    and receive their questions as they are parsed.
+    """
+
+    def __init__(
+        self,
+        generator: Optional[QuestionGenerator] = None,
+        window: float = 0.05,
+        max_questions: int = 30,
+        streamer: Optional[QuestionStreamer] = None
+    ):
+        self._generator = generator
+        self._streamer = streamer
+        self.window = window
+        self.max_questions = max_questions
+        self._open: Dict[Tuple[Optional[str], bool], _Batch] = {}
+        # Flush tasks, kept referenced until they finish
+        self._flushes: Set[asyncio.Task] = set()
+
+    async def _generate(self, num_questions: int, category: Optional[str]) -> List[str]:
+        if self._generator is not None:
+            return await self._generator(num_questions, category)
+        return await AIService.generate_questions(num_questions, category)
+
+    def _stream(self, num_questions: int, category: Optional[str]) -> AsyncIterator[str]:
+        if self._streamer is not None:
+            return self._streamer(num_questions, category)
+        return AIService.stream_questions(num_questions, category)
+
+    async def request(self, num_questions: int, category: Optional[str] = None) -> List[str]:
+        """Questions for one caller, generated together with concurrent callers"""
+        future = asyncio.get_running_loop().create_future()
+        self._join(category, False, num_questions, future)
+        return await future
+
+    async def stream(self, num_questions: int, category: Optional[str] = None) -> AsyncIterator[str]:
+        """Questions for one caller as they are parsed from a stream shared with concurrent callers"""
+        queue: asyncio.Queue = asyncio.Queue()
+        self._join(category, True, num_questions, queue)
+        for _ in range(num_questions):
+            question = await queue.get()
+            if question is None:
+                return
+            if isinstance(question, Exception):
+                raise question
+            yield question
+
+    def _join(self, category: Optional[str], streaming: bool, num_questions: int, waiter: Any):
+        coalesced_requests.inc()
+        key = (category, streaming)
+
+        batch = self._open.get(key)
+        if batch is not None and batch.total + num_questions > self.max_questions:
+            # Send the current batch now and start a new one for this request
+            del self._open[key]
+            batch.full.set()
+            batch = None
+
+        if batch is None:
+            batch = self._open[key] = _Batch(streaming)
+            flush = asyncio.get_running_loop().create_task(self._flush(key, batch))
+            self._flushes.add(flush)
+            flush.add_done_callback(self._flushes.discard)
+
+        batch.waiters.append((num_questions, waiter, time.perf_counter()))
+        batch.priority = min(batch.priority, current_priority.get())
+        batch.total += num_questions
+        if batch.total >= self.max_questions and self._open.get(key) is batch:
+            del self._open[key]
+            batch.full.set()
+
+    async def _flush(self, key: Tuple[Optional[str], bool], batch: _Batch):
+        # A merged call can serve several rooms, so it is not attributed to any one
+        attribute_room(None)
+        try:
+            await asyncio.wait_for(batch.full.wait(), self.window)
+        except asyncio.TimeoutError:
+            pass
+
+        if self._open.get(key) is batch:
+            del self._open[key]
+
+        # The merged call runs at the most urgent waiter's priority
+        set_priority(batch.priority)
+
+        flushed_at = time.perf_counter()
+        for _, _, enqueued_at in batch.waiters:
+            coalesce_wait.observe(flushed_at - enqueued_at)
+
+        coalesced_model_calls.inc()
+        model_calls_saved.inc(len(batch.waiters) - 1)
+        if len(batch.waiters) > 1:
+            logger.info("Coalesced %s question requests into one call for %s", len(batch.waiters), batch.total)
+
+        category, _ = key
+        if batch.streaming:
+            await self._deliver_stream(category, batch)
+            return
+
+        try:
+            questions = await self._generate(batch.total, category)
+        except Exception as e:
+            for _, future, _ in batch.waiters:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        offset = 0
+        for num_questions, future, _ in batch.waiters:
+            if not future.done():
+                future.set_result(questions[offset:offset + num_questions])
+            offset += num_questions
+
+    async def _deliver_stream(self, category: Optional[str], batch: _Batch):
+        received = [0] * len(batch.waiters)
+        try:
+            async for question in self._stream(batch.total, category):
+                # Each question goes to the caller with the fewest so far, so every
+                # room gets its first question from the head of the stream
+                wanting = [i for i, (wanted, _, _) in enumerate(batch.waiters) if received[i] < wanted]
+                if not wanting:
+                    continue
+                i = min(wanting, key=received.__getitem__)
+                received[i] += 1
+                batch.waiters[i][1].put_nowait(question)
+        except Exception as e:
+            for _, queue, _ in batch.waiters:
+                queue.put_nowait(e)
+            return
+
+        for _, queue, _ in batch.waiters:
+            queue.put_nowait(None)
+
+
+question_coalescer = QuestionRequestCoalescer(
+    window=settings.AI_COALESCE_WINDOW_MS / 1000,
+    max_questions=settings.AI_COALESCE_MAX_QUESTIONS
+)
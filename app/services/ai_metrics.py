@@ -0,0 +1,189 @@
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+from app.config import settings
+from app.utils.metrics import registry
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+METHODS = ("generate_questions", "stream_questions", "generate_question", "generate_round_summary")
+
+call_latency = registry.histogram(
+    "ai_call_seconds",
+    "AIService model call latency by method and outcome",
+    ["method", "outcome"],
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 8.0, 12.0, 20.0)
+)
+call_count = registry.counter(
+    "ai_calls_total",
+    "AIService calls by method and outcome (ok, fallback or template)",
+    ["method", "outcome"]
+)
+tokens = registry.counter(
+    "ai_tokens_total",
+    "Tokens reported in response.usage by method and kind (prompt or completion)",
+    ["method", "kind"]
+)
+questions_requested = registry.counter(
+    "ai_questions_requested_total",
+    "Questions asked of the model",
+    ["method"]
+)
+questions_parsed = registry.counter(
+    "ai_questions_parsed_total",
+    "Questions parsed from model output",
+    ["method"]
+)
+fallback_questions = registry.counter(
+    "ai_fallback_questions_total",
+    "Local questions served in place of model output",
+    ["method"]
+)
+
+# Room code the current AI call should be attributed to; set by socket handlers and
+# inherited by the tasks they spawn. Shared background work resets it to None.
+current_room: ContextVar[Optional[str]] = ContextVar("ai_current_room", default=None)
+
+
+def attribute_room(room_code: Optional[str]):
+    current_room.set(room_code)
+
+
+class _RoomUsage:
+    __slots__ = ("calls", "fallbacks", "prompt_tokens", "completion_tokens", "seconds")
+
+    def __init__(self):
+        self.calls = 0
+        self.fallbacks = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.seconds = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "fallbacks": self.fallbacks,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "seconds": round(self.seconds, 3),
+            "cost_usd": round(estimate_cost(self.prompt_tokens, self.completion_tokens), 6),
+        }
+
+
+def estimate_cost(prompt_tokens: int, completion_tokens: int) -> float:
+    return (
+        prompt_tokens * settings.AI_PROMPT_PRICE_PER_1K
+        + completion_tokens * settings.AI_COMPLETION_PRICE_PER_1K
+    ) / 1000
+
+
+class AICallStats:
+    """Records each AIService call into the metrics registry, per-room totals and a structured log line"""
+
+    def __init__(self, max_rooms: int = 1000):
+        self.max_rooms = max_rooms
+        self._rooms: "OrderedDict[str, _RoomUsage]" = OrderedDict()
+
+    def record(
+        self,
+        method: str,
+        seconds: float,
+        outcome: str = "ok",
+        usage: Any = None,
+        requested: Optional[int] = None,
+        parsed: Optional[int] = None,
+        fallbacks: int = 0,
+        error: Optional[BaseException] = None,
+        room_code: Optional[str] = None
+    ):
+        room_code = room_code or current_room.get()
+        prompt = getattr(usage, "prompt_tokens", 0) or 0
+        completion = getattr(usage, "completion_tokens", 0) or 0
+
+        call_count.inc(method=method, outcome=outcome)
+        if outcome != "template":
+            call_latency.observe(seconds, method=method, outcome=outcome)
+        if prompt:
+            tokens.inc(prompt, method=method, kind="prompt")
+        if completion:
+            tokens.inc(completion, method=method, kind="completion")
+        if requested:
+            questions_requested.inc(requested, method=method)
+        if parsed:
+            questions_parsed.inc(parsed, method=method)
+        if fallbacks:
+            fallback_questions.inc(fallbacks, method=method)
+
+        if room_code is not None:
+            room = self._rooms.pop(room_code, None) or _RoomUsage()
+            self._rooms[room_code] = room
+            if len(self._rooms) > self.max_rooms:
+                self._rooms.popitem(last=False)
+            room.calls += 1
+            room.fallbacks += outcome == "fallback"
+            room.prompt_tokens += prompt
+            room.completion_tokens += completion
+            room.seconds += seconds
+
+        fields = {
+            "method": method,
+            "outcome": outcome,
+            "room": room_code,
+            "latency_ms": round(seconds * 1000, 1),
+            "prompt_tokens": prompt,
+            "completion_tokens": completion,
+        }
+        if requested is not None:
+            fields["requested"] = requested
+            fields["parsed"] = parsed or 0
+        if fallbacks:
+            fields["fallbacks"] = fallbacks
+        if error is not None:
+            fields["error"] = type(error).__name__
+        logger.info("ai_call", extra={"fields": fields})
+
+    def room(self, room_code: str) -> Optional[Dict[str, Any]]:
+        usage = self._rooms.get(room_code)
+        return usage.to_dict() if usage is not None else None
+
+    def summary(self, top_rooms: int = 20) -> Dict[str, Any]:
+        """Per-method latency, token, fallback and parse-yield figures plus the costliest rooms"""
+        methods = {}
+        for method in METHODS:
+            ok = call_count.value(method=method, outcome="ok")
+            failed = call_count.value(method=method, outcome="fallback")
+            calls = ok + failed
+            if not calls and not call_count.value(method=method, outcome="template"):
+                continue
+
+            prompt = tokens.value(method=method, kind="prompt")
+            completion = tokens.value(method=method, kind="completion")
+            requested = questions_requested.value(method=method)
+            entry = {
+                "calls": calls,
+                "template_calls": call_count.value(method=method, outcome="template"),
+                "fallback_rate": round(failed / calls, 4) if calls else 0.0,
+                "latency_p50": call_latency.quantile(0.5, method=method, outcome="ok"),
+                "latency_p95": call_latency.quantile(0.95, method=method, outcome="ok"),
+                "latency_avg": round(
+                    call_latency.sum(method=method, outcome="ok") / ok, 4
+                ) if ok else None,
+                "prompt_tokens": prompt,
+                "completion_tokens": completion,
+                "cost_usd": round(estimate_cost(prompt, completion), 6),
+            }
+            if requested:
+                entry["parse_yield"] = round(questions_parsed.value(method=method) / requested, 4)
+                entry["fallback_questions"] = fallback_questions.value(method=method)
+            methods[method] = entry
+
+        rooms = sorted(
+            ((code, usage.to_dict()) for code, usage in self._rooms.items()),
+            key=lambda item: item[1]["cost_usd"],
+            reverse=True
+        )[:top_rooms]
+        return {"methods": methods, "rooms": dict(rooms)}
+
+
+ai_stats = AICallStats()
@@ -1,20 +1,137 @@
-from openai import AsyncOpenAI
-from typing import Optional, List
+import random
+import time
+from typing import AsyncIterator, Optional, List, Sequence
 from app.config import settings
+from app.services.ai_client import ai_client
+from app.services.question_dedup import question_deduplicator
+from app.services.question_corpus import question_corpus
+from app.services.question_templates import template_generator
+from app.services.ai_metrics import ai_stats
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
-# Configure OpenAI client
-client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+
+FALLBACK_QUESTIONS = [
+    "What would you name a restaurant that only serves breakfast foods?",
+    "Invent a new ice cream flavor using exactly 3 ingredients",
+    "If you opened a store, what would be your store's return policy?",
+    "What superpower would you want that only works on Tuesdays?",
+    "Design a holiday - what would people celebrate and how?",
+    "What would your autobiography's first sentence be?",
+    "Create a new planet - what's special about it?",
+    "Invent a job that doesn't exist yet - what do they do?",
+    "What ridiculous warning label would you put on a banana?",
+    "If you could rename any animal, which one and to what?",
+    "What's your signature dance move called and how do you do it?",
+    "Invent a new sport - what are the rules?",
+    "What would your villain origin story be?",
+    "Create a new sandwich and name it after yourself",
+    "What's the worst possible name for a luxury yacht?",
+    "Invent a new word and define it",
+    "What would be your theme song and why?",
+    "Design a useless but entertaining app - what does it do?",
+    "What conspiracy theory would you start about vegetables?",
+    "If you had to wear one costume forever, what would it be?"
+]
+
+
+def pick_fallback_questions(
+    num_questions: int,
+    room_code: Optional[str] = None,
+    exclude: Sequence[str] = ()
+) -> List[str]:
+    """
+    Random fallback questions that avoid near-duplicates where possible.
+    The static list is topped up from the template generator, then repeats are
+    allowed, so callers always get num_questions back.
+    """
+    candidates = random.sample(FALLBACK_QUESTIONS, len(FALLBACK_QUESTIONS))
+    picked = question_deduplicator.unique(
+        candidates, num_questions, room_code, exclude, source="fallback"
+    )
+
+    if len(picked) < num_questions:
+        picked += template_question_batch(num_questions - len(picked), None, room_code, list(exclude) + picked)
+
+    if len(picked) < num_questions:
+        remaining = [q for q in candidates if q not in picked]
+        picked += question_deduplicator.unique(
+            remaining, num_questions - len(picked), room_code, list(exclude) + picked,
+            check_recent=False, source="fallback"
+        )
+
+    while len(picked) < num_questions:
+        picked.append(random.choice(FALLBACK_QUESTIONS))
+
+    return picked
+
+
+def template_question_batch(
+    num_questions: int,
+    category: Optional[str] = None,
+    room_code: Optional[str] = None,
+    exclude: Sequence[str] = ()
+) -> List[str]:
+    """Offline template questions that are not near-duplicates of history or exclude"""
+    candidates = template_generator.generate(num_questions * 2, category, exclude)
+    return question_deduplicator.unique(
+        candidates, num_questions, room_code, exclude, source="template"
+    )
+
+
+def template_questions(num_questions: int, category: Optional[str] = None, room_code: Optional[str] = None) -> List[str]:
+    """Exactly num_questions questions without any model call"""
+    questions = template_question_batch(num_questions, category, room_code)
+    if len(questions) < num_questions:
+        questions += pick_fallback_questions(num_questions - len(questions), room_code, questions)
+    return questions
+
+
+def parse_question_line(line: str) -> Optional[str]:
+    """Question text from a numbered line such as '1. Foo?' or '2) "Bar"', else None"""
+    line = line.strip()
+    # Remove numbering (e.g., "1. ", "1) ", etc.)
+    if not line or not line[0].isdigit():
+        return None
+
+    idx = 0
+    while idx < len(line) and (line[idx].isdigit() or line[idx] in '.):'):
+        idx += 1
+    question = line[idx:].strip().strip('"')
+    return question or None
+
+
+def parse_numbered_questions(content: str) -> List[str]:
+    """Parse a complete numbered list"""
+    parser = NumberedListParser()
+    return parser.feed(content) + parser.close()
+
+
+class NumberedListParser:
+    """Incremental numbered-list parser for streamed completions"""
+
+    def __init__(self):
+        self._buffer = ""
+
+    def feed(self, text: str) -> List[str]:
+        """Add streamed text and return questions whose lines are now complete"""
+        self._buffer += text
+        *lines, self._buffer = self._buffer.split('\n')
+        return [q for q in (parse_question_line(line) for line in lines) if q]
+
+    def close(self) -> List[str]:
+        """Flush the final line once the stream has ended"""
+        question = parse_question_line(self._buffer)
+        self._buffer = ""
+        return [question] if question else []
 
 
 class AIService:
     @staticmethod
-    async def generate_questions(num_questions: int, category: Optional[str] = None) -> List[str]:
-        """Generate multiple unique questions at once for a game"""
-        try:
-            prompt = f"""Generate {num_questions} unique, quirky, creative, and fun questions for a multiplayer voting game.
+    def _questions_messages(num_questions: int, category: Optional[str] = None) -> List[dict]:
+        """Chat messages asking for a numbered list of questions"""
+        prompt = f"""Generate {num_questions} unique, quirky, creative, and fun questions for a multiplayer voting game.
 
             CRITICAL: Each question MUST encourage highly personalized, unique answers. Questions should be designed so that it's nearly impossible for two people to give the exact same answer.
 
@@ -40,93 +157,136 @@ class AIService:
 
             Return the questions as a numbered list, one per line."""
 
-            if category:
-                prompt += f"\n\nCategory focus: {category}"
+        if category:
+            prompt += f"\n\nCategory focus: {category}"
+
+        return [
+            {"role": "system", "content": "You are a creative game host who generates fun questions."},
+            {"role": "user", "content": prompt}
+        ]
 
-            response = await client.chat.completions.create(
+    @staticmethod
+    async def generate_questions(num_questions: int, category: Optional[str] = None, pad: bool = True) -> List[str]:
+        """
+        Generate multiple unique questions at once for a game. With pad=False, errors
+        propagate and a short batch is returned as-is instead of topped up with fallbacks.
+        """
+        if settings.use_template_questions:
+            ai_stats.record("generate_questions", 0.0, "template", requested=num_questions)
+            return template_questions(num_questions, category)
+
+        started = time.perf_counter()
+        try:
+            response = await ai_client.chat(
+                "generate_questions",
                 model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are a creative game host who generates fun questions."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=500,
+                messages=AIService._questions_messages(num_questions, category),
+                max_tokens=max(500, 40 * num_questions),
                 temperature=0.9
             )
 
             content = response.choices[0].message.content.strip()
-            # Parse the numbered list
-            questions = []
-            for line in content.split('\n'):
-                line = line.strip()
-                # Remove numbering (e.g., "1. ", "1) ", etc.)
-                if line and line[0].isdigit():
-                    # Find the first space or period after the number
-                    idx = 0
-                    while idx < len(line) and (line[idx].isdigit() or line[idx] in '.):'):
-                        idx += 1
-                    question = line[idx:].strip().strip('"')
-                    if question:
-                        questions.append(question)
-
-            logger.info(f"Generated {len(questions)} questions: {questions}")
+            questions = parse_numbered_questions(content)
+            parsed = len(questions)
+
+            logger.info("Generated %s questions", len(questions))
+            logger.debug("Generated questions: %s", tuple(questions))
+            await question_corpus.add_async(questions, category)
+
+            # Drop near-duplicates within the batch and of recently used questions
+            questions = question_deduplicator.unique(questions, num_questions)
 
             # If we didn't get enough questions, add fallbacks
-            if len(questions) < num_questions:
-                fallback_questions = [
-                    "What would you name a restaurant that only serves breakfast foods?",
-                    "Invent a new ice cream flavor using exactly 3 ingredients",
-                    "If you opened a store, what would be your store's return policy?",
-                    "What superpower would you want that only works on Tuesdays?",
-                    "Design a holiday - what would people celebrate and how?",
-                    "What would your autobiography's first sentence be?",
-                    "Create a new planet - what's special about it?",
-                    "Invent a job that doesn't exist yet - what do they do?",
-                    "What ridiculous warning label would you put on a banana?",
-                    "If you could rename any animal, which one and to what?",
-                    "What's your signature dance move called and how do you do it?",
-                    "Invent a new sport - what are the rules?",
-                    "What would your villain origin story be?",
-                    "Create a new sandwich and name it after yourself",
-                    "What's the worst possible name for a luxury yacht?"
-                ]
-                import random
-                while len(questions) < num_questions:
-                    questions.append(random.choice(fallback_questions))
+            missing = max(0, num_questions - len(questions)) if pad else 0
+            if missing:
+                questions += pick_fallback_questions(missing, exclude=questions)
 
+            ai_stats.record(
+                "generate_questions", time.perf_counter() - started, usage=response.usage,
+                requested=num_questions, parsed=parsed, fallbacks=missing
+            )
             return questions[:num_questions]
 
         except Exception as e:
-            logger.error(f"Error generating questions: {str(e)}")
-            # Return fallback questions
-            fallback_questions = [
-                "What would you name a restaurant that only serves breakfast foods?",
-                "Invent a new ice cream flavor using exactly 3 ingredients",
-                "If you opened a store, what would be your store's return policy?",
-                "What superpower would you want that only works on Tuesdays?",
-                "Design a holiday - what would people celebrate and how?",
-                "What would your autobiography's first sentence be?",
-                "Create a new planet - what's special about it?",
-                "Invent a job that doesn't exist yet - what do they do?",
-                "What ridiculous warning label would you put on a banana?",
-                "If you could rename any animal, which one and to what?",
-                "What's your signature dance move called and how do you do it?",
-                "Invent a new sport - what are the rules?",
-                "What would your villain origin story be?",
-                "Create a new sandwich and name it after yourself",
-                "What's the worst possible name for a luxury yacht?",
-                "Invent a new word and define it",
-                "What would be your theme song and why?",
-                "Design a useless but entertaining app - what does it do?",
-                "What conspiracy theory would you start about vegetables?",
-                "If you had to wear one costume forever, what would it be?"
-            ]
-            import random
-            random.shuffle(fallback_questions)
-            return fallback_questions[:num_questions]
+            logger.error("Error generating questions: %s", e)
+            ai_stats.record(
+                "generate_questions", time.perf_counter() - started, "fallback",
+                requested=num_questions, fallbacks=num_questions if pad else 0, error=e
+            )
+            if not pad:
+                raise
+            return pick_fallback_questions(num_questions)
+
+    @staticmethod
+    async def stream_questions(
+        num_questions: int,
+        category: Optional[str] = None,
+        room_code: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Yield questions as soon as each numbered line is complete in the streamed
+        completion. Always yields exactly num_questions, padding with fallbacks.
+        """
+        if settings.use_template_questions:
+            ai_stats.record("stream_questions", 0.0, "template", requested=num_questions, room_code=room_code)
+            for question in template_questions(num_questions, category, room_code):
+                yield question
+            return
+
+        started = time.perf_counter()
+        parsed = 0
+        error: Optional[Exception] = None
+        yielded: List[str] = []
+        try:
+            parser = NumberedListParser()
+            stream = ai_client.stream(
+                "generate_questions",
+                model="gpt-3.5-turbo",
+                messages=AIService._questions_messages(num_questions, category),
+                max_tokens=max(500, 40 * num_questions),
+                temperature=0.9
+            )
+            async for text in stream:
+                for question in parser.feed(text):
+                    parsed += 1
+                    if len(yielded) < num_questions and not question_deduplicator.is_duplicate(
+                        question, room_code, yielded
+                    ):
+                        yielded.append(question)
+                        yield question
+            for question in parser.close():
+                parsed += 1
+                if len(yielded) < num_questions and not question_deduplicator.is_duplicate(
+                    question, room_code, yielded
+                ):
+                    yielded.append(question)
+                    yield question
+
+            logger.info("Streamed %s questions", len(yielded))
+            await question_corpus.add_async(yielded, category)
+
+        except Exception as e:
+            logger.error("Error streaming questions: %s", e)
+            error = e
+
+        missing = num_questions - len(yielded)
+        # Streamed responses carry no usage block, so tokens are not recorded here
+        ai_stats.record(
+            "stream_questions", time.perf_counter() - started, "fallback" if error else "ok",
+            requested=num_questions, parsed=parsed, fallbacks=missing, error=error, room_code=room_code
+        )
+        if missing > 0:
+            for question in pick_fallback_questions(missing, room_code, yielded):
+                yield question
 
     @staticmethod
     async def generate_question(category: Optional[str] = None) -> str:
         """Generate a quirky, creative question using AI"""
+        if settings.use_template_questions:
+            ai_stats.record("generate_question", 0.0, "template", requested=1)
+            return template_questions(1, category)[0]
+
+        started = time.perf_counter()
         try:
             prompt = """Generate a single quirky, creative, and fun question for a multiplayer voting game.
 
@@ -147,7 +307,8 @@ class AIService:
             if category:
                 prompt += f"\n\nCategory: {category}"
 
-            response = await client.chat.completions.create(
+            response = await ai_client.chat(
+                "generate_question",
                 model="gpt-3.5-turbo",
                 messages=[
                     {"role": "system", "content": "You are a creative game host who generates fun questions."},
@@ -158,30 +319,26 @@ class AIService:
             )
 
             question = response.choices[0].message.content.strip().strip('"')
-            logger.info(f"Generated question: {question}")
+            logger.info("Generated question: %s", question)
+            ai_stats.record(
+                "generate_question", time.perf_counter() - started, usage=response.usage,
+                requested=1, parsed=1 if question else 0
+            )
             return question
 
         except Exception as e:
-            logger.error(f"Error generating question: {str(e)}")
+            logger.error("Error generating question: %s", e)
+            ai_stats.record(
+                "generate_question", time.perf_counter() - started, "fallback",
+                requested=1, fallbacks=1, error=e
+            )
             # Fallback questions if AI fails
-            fallback_questions = [
-                "What would you name a restaurant that only serves breakfast foods?",
-                "Invent a new ice cream flavor using exactly 3 ingredients",
-                "If you opened a store, what would be your store's return policy?",
-                "What superpower would you want that only works on Tuesdays?",
-                "What would your autobiography's first sentence be?",
-                "Create a new planet - what's special about it?",
-                "What ridiculous warning label would you put on a banana?",
-                "If you could rename any animal, which one and to what?",
-                "What's your signature dance move called and how do you do it?",
-                "What would your villain origin story be?"
-            ]
-            import random
-            return random.choice(fallback_questions)
+            return pick_fallback_questions(1)[0]
 
     @staticmethod
     async def generate_round_summary(answers: List[str]) -> str:
         """Generate a fun summary of the round (optional feature)"""
+        started = time.perf_counter()
         try:
             answers_text = "\n".join([f"- {answer}" for answer in answers[:5]])
 
@@ -191,7 +348,8 @@ class AIService:
 
 Make it fun and light-hearted!"""
 
-            response = await client.chat.completions.create(
+            response = await ai_client.chat(
+                "generate_round_summary",
                 model="gpt-3.5-turbo",
                 messages=[
                     {"role": "system", "content": "You are a witty game commentator."},
@@ -202,9 +360,11 @@ Make it fun and light-hearted!"""
             )
 
             summary = response.choices[0].message.content.strip()
-            logger.info(f"Generated summary: {summary}")
+            logger.info("Generated summary: %s", summary)
+            ai_stats.record("generate_round_summary", time.perf_counter() - started, usage=response.usage)
             return summary
 
         except Exception as e:
-            logger.error(f"Error generating summary: {str(e)}")
+            logger.error("Error generating summary: %s", e)
+            ai_stats.record("generate_round_summary", time.perf_counter() - started, "fallback", error=e)
             return "What a round! The creativity is off the charts!"
\ No newline at end of file
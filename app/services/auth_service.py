@@ -1,7 +1,8 @@
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from app.models.user import User
 from app.schemas.user import UserCreate, UserLogin
-from app.utils.security import hash_password, verify_password
+from app.utils.security import hash_password, verify_password, hash_password_async, verify_password_async
 from app.utils.exceptions import AuthenticationException, ConflictException
 from app.utils.logger import get_logger
 
@@ -12,14 +13,60 @@ class AuthService:
     @staticmethod
     def register(user_data: UserCreate, db: Session) -> User:
         """Register a new user"""
-        # Check if email already exists
-        existing_user = db.query(User).filter(User.email == user_data.email).first()
+        AuthService._ensure_email_available(user_data.email, db)
+        hashed_password = hash_password(user_data.password)
+        return AuthService._create_user(user_data, hashed_password, db)
+
+    @staticmethod
+    async def register_async(user_data: UserCreate, db: Session) -> User:
+        """Register a new user, hashing the password in the worker pool"""
+        AuthService._ensure_email_available(user_data.email, db)
+        hashed_password = await hash_password_async(user_data.password)
+        return AuthService._create_user(user_data, hashed_password, db)
+
+    @staticmethod
+    def authenticate(email: str, password: str, db: Session) -> User:
+        """Authenticate a user"""
+        user = AuthService._get_login_user(email, db)
+
+        if not verify_password(password, user.password_hash):
+            logger.warning("Failed login attempt for user: %s", email)
+            raise AuthenticationException("Invalid email or password")
+
+        logger.info("User authenticated: %s", user.email)
+        return user
+
+    @staticmethod
+    async def authenticate_async(email: str, password: str, db: Session) -> User:
+        """Authenticate a user, verifying the password in the worker pool"""
+        user = AuthService._get_login_user(email, db)
+
+        if not await verify_password_async(password, user.password_hash):
+            logger.warning("Failed login attempt for user: %s", email)
+            raise AuthenticationException("Invalid email or password")
+
+        logger.info("User authenticated: %s", user.email)
+        return user
+
+    @staticmethod
+    def get_user_by_id(user_id: str, db: Session) -> User:
+        """Get user by ID"""
+        user = db.query(User).filter(User.id == user_id).first()
+        if not user:
+            raise AuthenticationException("User not found")
+        return user
+
+    @staticmethod
+    def _ensure_email_available(email: str, db: Session):
+        """Raise if the email is already registered"""
+        existing_user = db.query(User).filter(User.email == email).first()
         if existing_user:
-            logger.warning(f"Registration attempt with existing email: {user_data.email}")
+            logger.warning("Registration attempt with existing email: %s", email)
             raise ConflictException("Email already registered")
 
-        # Create new user
-        hashed_password = hash_password(user_data.password)
+    @staticmethod
+    def _create_user(user_data: UserCreate, hashed_password: str, db: Session) -> User:
+        """Persist a new user with an already hashed password"""
         new_user = User(
             email=user_data.email,
             username=user_data.username,
@@ -27,32 +74,25 @@ class AuthService:
         )
 
         db.add(new_user)
-        db.commit()
+        try:
+            db.commit()
+        except IntegrityError:
+            # A concurrent registration took the email while the password was hashing
+            db.rollback()
+            logger.warning("Registration attempt with existing email: %s", user_data.email)
+            raise ConflictException("Email already registered")
         db.refresh(new_user)
 
-        logger.info(f"New user registered: {new_user.email}")
+        logger.info("New user registered: %s", new_user.email)
         return new_user
 
     @staticmethod
-    def authenticate(email: str, password: str, db: Session) -> User:
-        """Authenticate a user"""
+    def _get_login_user(email: str, db: Session) -> User:
+        """Look up the user for a login attempt"""
         user = db.query(User).filter(User.email == email).first()
 
         if not user:
-            logger.warning(f"Login attempt with non-existent email: {email}")
+            logger.warning("Login attempt with non-existent email: %s", email)
             raise AuthenticationException("Invalid email or password")
 
-        if not verify_password(password, user.password_hash):
-            logger.warning(f"Failed login attempt for user: {email}")
-            raise AuthenticationException("Invalid email or password")
-
-        logger.info(f"User authenticated: {user.email}")
         return user
-
-    @staticmethod
-    def get_user_by_id(user_id: str, db: Session) -> User:
-        """Get user by ID"""
-        user = db.query(User).filter(User.id == user_id).first()
-        if not user:
-            raise AuthenticationException("User not found")
-        return user
\ No newline at end of file
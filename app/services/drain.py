@@ -0,0 +1,86 @@
+import asyncio
+import time
+from typing import Any, Dict, Optional
+from app.config import settings
+from app.services.question_feed import question_feeds
+from app.services.round_summary import round_summaries
+from app.utils.instrumentation import connected_sids, socket_events_in_flight
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class DrainCoordinator:
+    """
+    Takes this worker out of rotation for a rolling deploy. Game phases, deadlines
+    and answers/votes already live in the database, so draining only has to
+    hand off what is held in memory and move clients to another worker:
+
+    1. refuse new rooms, games and socket connections (and fail /health)
+    2. let in-flight socket handlers finish
+    3. persist streamed questions and wait for pending round summaries
+    4. tell clients to reconnect, spread over a window, then disconnect stragglers
+
+    On the new worker, join_room replies with a game_state snapshot built from the
+    database, so clients resume the current phase with the time left.
+    """
+
+    def __init__(self, feeds=question_feeds, summaries=round_summaries):
+        self._feeds = feeds
+        self._summaries = summaries
+        self.draining = False
+        self.phase = "serving"
+        self.started_at: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self, sio, grace: Optional[float] = None, spread: Optional[float] = None) -> bool:
+        """Begin draining in the background; False if already draining"""
+        if self.draining:
+            return False
+        self.draining = True
+        self.started_at = time.time()
+        self._task = asyncio.create_task(self._run(
+            sio,
+            settings.DRAIN_GRACE_SECONDS if grace is None else grace,
+            settings.DRAIN_RECONNECT_SPREAD_SECONDS if spread is None else spread
+        ))
+        return True
+
+    async def wait(self):
+        if self._task is not None:
+            await self._task
+
+    async def _run(self, sio, grace: float, spread: float):
+        deadline = time.monotonic() + grace
+        logger.warning("Draining worker: %s clients connected", int(connected_sids.value()))
+        try:
+            self.phase = "finishing_handlers"
+            while socket_events_in_flight.value() > 0 and time.monotonic() < deadline:
+                await asyncio.sleep(0.05)
+
+            self.phase = "handing_off"
+            remaining = max(0.0, deadline - time.monotonic())
+            await asyncio.gather(self._feeds.handoff(remaining), self._summaries.handoff(remaining))
+
+            self.phase = "moving_clients"
+            await sio.emit('server_draining', {'reconnect_within_ms': int(spread * 1000)})
+            await asyncio.sleep(spread + 1)
+            for sid, _ in list(sio.manager.get_participants('/', None)):
+                await sio.disconnect(sid)
+        except Exception as e:
+            logger.error("Error while draining: %s", e)
+        finally:
+            self.phase = "drained"
+            logger.warning("Worker drained after %.1fs", time.time() - self.started_at)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "draining": self.draining,
+            "phase": self.phase,
+            "started_at": self.started_at,
+            "in_flight": int(socket_events_in_flight.value()),
+            "connected": int(connected_sids.value()),
+        }
+
+
+drain = DrainCoordinator()
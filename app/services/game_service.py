@@ -1,6 +1,6 @@
 from sqlalchemy.orm import Session
 from sqlalchemy import func
-from typing import List, Dict, Any
+from typing import Any, Dict, List, Optional
 from uuid import UUID
 from datetime import datetime, timedelta
 from app.models.room import Room, RoomStatus
@@ -8,8 +8,11 @@ from app.models.round import Round, RoundStatus
 from app.models.answer import Answer
 from app.models.vote import Vote
 from app.models.score import Score
+from app.models.user import User
+from app.schemas.records import AnswerRecord, LeaderboardRecord
 from app.utils.exceptions import BadRequestException, ForbiddenException, NotFoundException
 from app.utils.logger import get_logger
+from app.utils.db_routing import replica_read
 from app.config import settings
 
 logger = get_logger(__name__)
@@ -37,7 +40,7 @@ class GameService:
         room.status = RoomStatus.ACTIVE
         db.commit()
 
-        logger.info(f"Game started in room {room_code}")
+        logger.info("Game started in room %s", room_code)
         return room
 
     @staticmethod
@@ -61,7 +64,7 @@ class GameService:
         db.commit()
         db.refresh(new_round)
 
-        logger.info(f"Round {round_number} started in room {room.code}")
+        logger.info("Round %s started in room %s", round_number, room.code)
         return new_round
 
     @staticmethod
@@ -94,7 +97,7 @@ class GameService:
         db.commit()
         db.refresh(answer)
 
-        logger.info(f"Answer submitted by user {user_id} for round {round_id}")
+        logger.info("Answer submitted by user %s for round %s", user_id, round_id)
         return answer
 
     @staticmethod
@@ -109,7 +112,7 @@ class GameService:
         round_obj.ends_at = datetime.utcnow() + timedelta(seconds=settings.VOTE_TIME_LIMIT)
         db.commit()
 
-        logger.info(f"Voting started for round {round_id}")
+        logger.info("Voting started for round %s", round_id)
         return round_obj
 
     @staticmethod
@@ -155,7 +158,7 @@ class GameService:
         # Update score
         GameService._update_score(round_obj.room_id, answer.user_id, round_id, db)
 
-        logger.info(f"Vote submitted by user {voter_id} for answer {answer_id}")
+        logger.info("Vote submitted by user %s for answer %s", voter_id, answer_id)
         return vote
 
     @staticmethod
@@ -191,20 +194,37 @@ class GameService:
         round_obj.status = RoundStatus.COMPLETED
         db.commit()
 
-        logger.info(f"Round {round_id} completed")
+        logger.info("Round %s completed", round_id)
         return round_obj
 
     @staticmethod
-    def get_round_answers(round_id: UUID, db: Session) -> List[Answer]:
+    def save_round_summary(round_id: UUID, summary: str, db: Session) -> bool:
+        """Store the generated summary for a round"""
+        updated = db.query(Round).filter(Round.id == round_id).update(
+            {Round.summary: summary}, synchronize_session=False
+        )
+        db.commit()
+        return updated > 0
+
+    @staticmethod
+    @replica_read
+    def get_round_answers(round_id: UUID, db: Session) -> List[AnswerRecord]:
         """Get all answers for a round"""
-        answers = db.query(Answer).filter(Answer.round_id == round_id).all()
-        return answers
+        rows = db.query(Answer.id, Answer.user_id, Answer.content).filter(
+            Answer.round_id == round_id
+        ).all()
+        return [AnswerRecord(row.id, row.user_id, row.content) for row in rows]
 
     @staticmethod
-    def get_leaderboard(room_id: UUID, db: Session) -> List[Dict[str, Any]]:
-        """Get leaderboard for a room"""
-        from app.models.user import User
+    @replica_read
+    def count_round_answers(round_id: UUID, db: Session) -> int:
+        """Number of answers submitted for a round"""
+        return db.query(func.count(Answer.id)).filter(Answer.round_id == round_id).scalar()
 
+    @staticmethod
+    @replica_read
+    def get_leaderboard(room_id: UUID, db: Session) -> List[LeaderboardRecord]:
+        """Get leaderboard for a room"""
         results = db.query(
             Score.user_id,
             User.username,
@@ -220,15 +240,10 @@ class GameService:
             func.sum(Score.points).desc()
         ).all()
 
-        leaderboard = []
-        for result in results:
-            leaderboard.append({
-                'user_id': str(result.user_id),
-                'username': result.username,
-                'score': result.total_points or 0
-            })
-
-        return leaderboard
+        return [
+            LeaderboardRecord(result.user_id, result.username, result.total_points or 0)
+            for result in results
+        ]
 
     @staticmethod
     def end_game(room_id: UUID, db: Session):
@@ -238,9 +253,62 @@ class GameService:
         if room:
             room.status = RoomStatus.FINISHED
             db.commit()
-            logger.info(f"Game ended in room {room.code}")
+            logger.info("Game ended in room %s", room.code)
+
+    @staticmethod
+    @replica_read
+    def get_game_state(room: Room, db: Session) -> Dict[str, Any]:
+        """
+        Snapshot of a room's game as stored in the database, sent to clients joining
+        (or rejoining after a worker drained) so they resume in the current phase
+        """
+        state: Dict[str, Any] = {
+            'room_code': room.code,
+            'status': room.status.value,
+            'current_round': room.current_round,
+            'total_rounds': room.total_rounds,
+            'round': None,
+        }
+        if room.status == RoomStatus.WAITING:
+            return state
+
+        state['leaderboard'] = [entry.to_dict() for entry in GameService.get_leaderboard(room.id, db)]
+        round_obj: Optional[Round] = db.query(Round).filter(
+            Round.room_id == room.id,
+            Round.round_number == room.current_round
+        ).order_by(Round.started_at.desc()).first()
+        if round_obj is None:
+            return state
+
+        time_left = None
+        if round_obj.ends_at is not None:
+            time_left = max(0, int((round_obj.ends_at - datetime.utcnow()).total_seconds()))
+        state['round'] = {
+            'round_id': str(round_obj.id),
+            'round_number': round_obj.round_number,
+            'question': round_obj.question,
+            'status': round_obj.status.value,
+            'time_left': time_left,
+            'summary': round_obj.summary,
+        }
+        if round_obj.status == RoundStatus.ANSWERING:
+            state['round']['submitted_count'] = GameService.count_round_answers(round_obj.id, db)
+        else:
+            answers = GameService.get_round_answers(round_obj.id, db)
+            state['round']['answers'] = [ans.to_dict() for ans in answers]
+        return state
+
+    @staticmethod
+    @replica_read
+    def get_round_vote_counts(round_id: UUID, db: Session) -> Dict[UUID, int]:
+        """Vote count per answer for a round in one grouped query (answers without votes are absent)"""
+        rows = db.query(Vote.answer_id, func.count(Vote.id)).filter(
+            Vote.round_id == round_id
+        ).group_by(Vote.answer_id).all()
+        return {answer_id: count for answer_id, count in rows}
 
     @staticmethod
+    @replica_read
     def get_answer_vote_count(answer_id: UUID, db: Session) -> int:
         """Get vote count for an answer"""
         count = db.query(Vote).filter(Vote.answer_id == answer_id).count()
@@ -0,0 +1,292 @@
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from app.config import settings
+from app.services.question_dedup import question_deduplicator
+from app.utils.similarity import normalize_text
+from app.utils.metrics import registry
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+corpus_picks = registry.counter(
+    "question_corpus_picks_total",
+    "Corpus draws by outcome (hit, partial or miss)",
+    ["category", "outcome"]
+)
+corpus_pick_latency = registry.histogram(
+    "question_corpus_pick_seconds",
+    "Latency of a least-recently-used corpus pick",
+    buckets=(0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.01, 0.05)
+)
+corpus_added = registry.counter(
+    "question_corpus_added_total",
+    "New questions stored in the corpus",
+    ["source"]
+)
+
+# Bump with a matching step in _migrate when the table changes
+SCHEMA_VERSION = 1
+
+TABLE = """
+CREATE TABLE {name} (
+    id INTEGER PRIMARY KEY,
+    text TEXT NOT NULL,
+    normalized TEXT NOT NULL,
+    category TEXT NOT NULL DEFAULT '',
+    source TEXT NOT NULL DEFAULT 'ai',
+    uses INTEGER NOT NULL DEFAULT 0,
+    last_used REAL NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    UNIQUE (category, normalized)
+)
+"""
+INDEX = "CREATE INDEX IF NOT EXISTS ix_questions_category_lru ON questions (category, last_used, uses)"
+COLUMNS = "id, text, normalized, category, source, uses, last_used, created_at"
+
+
+def _category_key(category: Optional[str]) -> str:
+    return category or ""
+
+
+class QuestionCorpus:
+    """
+    Local SQLite store of every generated question with its category, usage count
+    and last-used time. Picks are least-recently-used within a category, served
+    from an index without a model call.
+
+    The sync methods suit scripts; the app uses the *_async ones, which run the
+    SQLite work on a single corpus thread so the event loop never waits on disk
+    or on the lock.
+    """
+
+    def __init__(self, path: str = "", clock=time.time):
+        self.path = path
+        self.clock = clock
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path)
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self.path != ":memory:":
+                directory = os.path.dirname(os.path.abspath(self.path))
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._migrate(conn)
+            self._conn = conn
+        return self._conn
+
+    def _migrate(self, conn: sqlite3.Connection):
+        """Create the table, or bring a file written by an older version up to date"""
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version >= SCHEMA_VERSION:
+            return
+
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'questions'"
+        ).fetchone()
+        conn.execute("BEGIN")
+        if exists is None:
+            conn.execute(TABLE.format(name="questions"))
+        else:
+            # Version 0 keyed rows on normalized text alone, so a question generated for a
+            # second category was dropped; rebuild keyed on (category, normalized)
+            conn.execute(TABLE.format(name="questions_migrating"))
+            conn.execute(f"INSERT INTO questions_migrating ({COLUMNS}) SELECT {COLUMNS} FROM questions")
+            conn.execute("DROP TABLE questions")
+            conn.execute("ALTER TABLE questions_migrating RENAME TO questions")
+            logger.info("Migrated question corpus %s to schema version %s", self.path, SCHEMA_VERSION)
+        conn.execute(INDEX)
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.execute("COMMIT")
+
+    async def _run(self, fn: Callable[..., Any], *args) -> Any:
+        """Run fn(*args) on the corpus thread; one worker keeps writes in order"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="question-corpus")
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    def add(self, questions: Iterable[str], category: Optional[str] = None, source: str = "ai") -> int:
+        """Store questions not already in the corpus; returns how many were new"""
+        if not self.enabled:
+            return 0
+
+        now = self.clock()
+        rows = [
+            (question, normalize_text(question), _category_key(category), source, now)
+            for question in questions if question and question.strip()
+        ]
+        if not rows:
+            return 0
+
+        with self._lock:
+            conn = self._connection()
+            before = conn.total_changes
+            conn.execute("BEGIN")
+            conn.executemany(
+                "INSERT OR IGNORE INTO questions (text, normalized, category, source, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+            conn.execute("COMMIT")
+            added = conn.total_changes - before
+
+        if added:
+            corpus_added.inc(added, source=source)
+        return added
+
+    async def add_async(self, questions: Iterable[str], category: Optional[str] = None, source: str = "ai") -> int:
+        if not self.enabled:
+            return 0
+        return await self._run(self.add, list(questions), category, source)
+
+    def _candidates(self, num_questions: int, category: Optional[str]) -> List[Tuple[int, str]]:
+        with self._lock:
+            return self._connection().execute(
+                "SELECT id, text FROM questions WHERE category = ? ORDER BY last_used, uses LIMIT ?",
+                (_category_key(category), num_questions * 3 + 5)
+            ).fetchall()
+
+    def _mark_used(self, ids: List[int]):
+        with self._lock:
+            self._connection().executemany(
+                "UPDATE questions SET uses = uses + 1, last_used = ? WHERE id = ?",
+                [(self.clock(), row_id) for row_id in ids]
+            )
+
+    def _choose(
+        self,
+        rows: List[Tuple[int, str]],
+        num_questions: int,
+        room_code: Optional[str],
+        exclude: Sequence[str]
+    ) -> Tuple[List[str], List[int]]:
+        ids_by_text: Dict[str, int] = {text: row_id for row_id, text in rows}
+        picked = question_deduplicator.unique(
+            (text for _, text in rows), num_questions, room_code, exclude, source="corpus"
+        )
+        return picked, [ids_by_text[text] for text in picked]
+
+    def _record_pick(self, picked: List[str], num_questions: int, category: Optional[str], started: float):
+        corpus_pick_latency.observe(time.perf_counter() - started)
+        outcome = "hit" if len(picked) == num_questions else ("partial" if picked else "miss")
+        corpus_picks.inc(category=_category_key(category) or "default", outcome=outcome)
+
+    def pick(
+        self,
+        num_questions: int,
+        category: Optional[str] = None,
+        room_code: Optional[str] = None,
+        exclude: Sequence[str] = ()
+    ) -> List[str]:
+        """
+        Up to num_questions least-recently-used questions for the category that are
+        not near-duplicates of the room's history or exclude. Picks are marked used.
+        """
+        if not self.enabled or num_questions <= 0:
+            return []
+
+        started = time.perf_counter()
+        picked, ids = self._choose(self._candidates(num_questions, category), num_questions, room_code, exclude)
+        if ids:
+            self._mark_used(ids)
+        self._record_pick(picked, num_questions, category, started)
+        return picked
+
+    async def pick_async(
+        self,
+        num_questions: int,
+        category: Optional[str] = None,
+        room_code: Optional[str] = None,
+        exclude: Sequence[str] = ()
+    ) -> List[str]:
+        """
+        pick with the SQLite reads and writes on the corpus thread; near-duplicate
+        checks stay on the event loop, which owns the deduplicator.
+        """
+        if not self.enabled or num_questions <= 0:
+            return []
+
+        started = time.perf_counter()
+        rows = await self._run(self._candidates, num_questions, category)
+        picked, ids = self._choose(rows, num_questions, room_code, exclude)
+        if ids:
+            await self._run(self._mark_used, ids)
+        self._record_pick(picked, num_questions, category, started)
+        return picked
+
+    def count(self, category: Optional[str] = None) -> int:
+        if not self.enabled:
+            return 0
+        with self._lock:
+            conn = self._connection()
+            if category is None:
+                return conn.execute("SELECT COUNT(*) FROM questions").fetchone()[0]
+            return conn.execute(
+                "SELECT COUNT(*) FROM questions WHERE category = ?", (_category_key(category),)
+            ).fetchone()[0]
+
+    async def count_async(self, category: Optional[str] = None) -> int:
+        if not self.enabled:
+            return 0
+        return await self._run(self.count, category)
+
+    def stats(self) -> List[dict]:
+        """Per-category totals: questions, never-used questions and total uses"""
+        if not self.enabled:
+            return []
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT category, COUNT(*), SUM(uses = 0), SUM(uses) FROM questions "
+                "GROUP BY category ORDER BY category"
+            ).fetchall()
+        return [
+            {"category": category or "default", "questions": total, "unused": unused, "uses": uses}
+            for category, total, unused, uses in rows
+        ]
+
+    def export(self, category: Optional[str] = None) -> List[dict]:
+        """All stored questions (optionally one category) as plain dicts"""
+        if not self.enabled:
+            return []
+        query = "SELECT text, category, source, uses, last_used, created_at FROM questions"
+        params: tuple = ()
+        if category is not None:
+            query += " WHERE category = ?"
+            params = (_category_key(category),)
+        with self._lock:
+            rows = self._connection().execute(query + " ORDER BY id", params).fetchall()
+        return [
+            {
+                "text": text,
+                "category": category or None,
+                "source": source,
+                "uses": uses,
+                "last_used": last_used,
+                "created_at": created_at,
+            }
+            for text, category, source, uses, last_used, created_at in rows
+        ]
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+question_corpus = QuestionCorpus(settings.QUESTION_CORPUS_PATH)
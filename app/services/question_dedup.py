@@ -0,0 +1,106 @@
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Sequence
+from app.config import settings
+from app.utils.similarity import MinHasher, SimilarityIndex, jaccard, normalize_text, shingles
+from app.utils.metrics import registry
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+duplicates_rejected = registry.counter(
+    "question_duplicates_rejected_total",
+    "Questions skipped because they nearly match a recent or same-room question",
+    ["source"]
+)
+
+
+class QuestionDeduplicator:
+    """
+    Tracks questions already used per room plus a global window of recently used
+    questions, and rejects near-duplicates of either.
+    """
+
+    def __init__(self, threshold: float = 0.6, window: int = 500, max_rooms: int = 1000):
+        self.threshold = threshold
+        self.max_rooms = max_rooms
+        self._hasher = MinHasher()
+        self._recent = SimilarityIndex(threshold, max_items=window, hasher=self._hasher)
+        self._rooms: "OrderedDict[str, SimilarityIndex]" = OrderedDict()
+
+    def _room_index(self, room_code: str) -> SimilarityIndex:
+        index = self._rooms.pop(room_code, None)
+        if index is None:
+            index = SimilarityIndex(self.threshold, hasher=self._hasher)
+        self._rooms[room_code] = index
+        if len(self._rooms) > self.max_rooms:
+            self._rooms.popitem(last=False)
+        return index
+
+    def is_duplicate(
+        self,
+        question: str,
+        room_code: Optional[str] = None,
+        others: Sequence[str] = (),
+        check_recent: bool = True
+    ) -> bool:
+        """Whether question nearly matches the room's history, the recent window or others"""
+        shingle_set = shingles(question)
+        bands = self._recent.bands_for(shingle_set)
+
+        if check_recent and self._recent.find(question, shingle_set, bands) is not None:
+            return True
+
+        if room_code is not None:
+            index = self._rooms.get(room_code)
+            if index is not None and index.find(question, shingle_set, bands) is not None:
+                return True
+
+        return any(jaccard(shingle_set, shingles(other)) >= self.threshold for other in others)
+
+    def unique(
+        self,
+        candidates: Iterable[str],
+        limit: Optional[int] = None,
+        room_code: Optional[str] = None,
+        exclude: Sequence[str] = (),
+        check_recent: bool = True,
+        source: str = "generated"
+    ) -> List[str]:
+        """Candidates in order, dropping near-duplicates of history, exclude and each other"""
+        selected: List[str] = []
+        for question in candidates:
+            if limit is not None and len(selected) >= limit:
+                break
+            if self.is_duplicate(question, room_code, list(exclude) + selected, check_recent):
+                duplicates_rejected.inc(source=source)
+                continue
+            selected.append(question)
+        return selected
+
+    def remember(self, questions: Iterable[str], room_code: Optional[str] = None):
+        """Record questions as used (globally and, if given, for the room)"""
+        room_index = self._room_index(room_code) if room_code is not None else None
+        for question in questions:
+            key = normalize_text(question)
+            shingle_set = shingles(question)
+            bands = self._recent.bands_for(shingle_set)
+            self._recent.add(key, question, shingle_set, bands)
+            if room_index is not None:
+                room_index.add(key, question, shingle_set, bands)
+
+    def seed_room(self, room_code: str, questions: Iterable[str]):
+        """Load a room's earlier questions (e.g. from the database) if not already tracked"""
+        if room_code in self._rooms:
+            return
+        index = self._room_index(room_code)
+        for question in questions:
+            index.add(normalize_text(question), question)
+
+    def forget_room(self, room_code: str):
+        self._rooms.pop(room_code, None)
+
+
+question_deduplicator = QuestionDeduplicator(
+    threshold=settings.QUESTION_DEDUP_THRESHOLD,
+    window=settings.QUESTION_DEDUP_WINDOW
+)
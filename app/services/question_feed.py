@@ -0,0 +1,181 @@
+import asyncio
+import time
+from typing import Dict, List, Optional
+from app.config import settings
+from app.database import SessionLocal
+from app.models.room import Room
+from app.services.ai_coalescer import question_coalescer
+from app.services.ai_service import pick_fallback_questions
+from app.services.question_dedup import question_deduplicator
+from app.services.question_corpus import question_corpus
+from app.services.question_pool import question_pool, pool_requests
+from app.utils.metrics import registry
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+first_question_latency = registry.histogram(
+    "question_feed_first_question_seconds",
+    "Time from start_game until the first question is available",
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+)
+complete_latency = registry.histogram(
+    "question_feed_complete_seconds",
+    "Time from start_game until every question for the game is available"
+)
+
+
+class QuestionFeed:
+    """Questions for one game, growing while the rest of the list is still streaming"""
+
+    def __init__(self, room_code: str, num_questions: int):
+        self.room_code = room_code
+        self.num_questions = num_questions
+        self.questions: List[str] = []
+        self.done = False
+        self._changed = asyncio.Condition()
+
+    async def add(self, question: str):
+        async with self._changed:
+            self.questions.append(question)
+            self._changed.notify_all()
+
+    async def finish(self):
+        async with self._changed:
+            self.done = True
+            self._changed.notify_all()
+
+    async def wait_for(self, count: int, timeout: Optional[float] = None) -> List[str]:
+        """Questions once at least `count` are available (or the feed ends or times out)"""
+        async with self._changed:
+            try:
+                await asyncio.wait_for(
+                    self._changed.wait_for(lambda: self.done or len(self.questions) >= count),
+                    timeout
+                )
+            except asyncio.TimeoutError:
+                pass
+            return list(self.questions)
+
+
+class QuestionFeeds:
+    """
+    Starts each game on its first available question: pooled questions are used
+    directly and any shortfall is streamed from the model in the background, then
+    persisted to rooms.questions once complete. Shortfalls of games starting
+    together share one streamed call through the coalescer.
+    """
+
+    def __init__(self, session_factory=SessionLocal):
+        self._session_factory = session_factory
+        self._feeds: Dict[str, QuestionFeed] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def get(self, room_code: str) -> Optional[QuestionFeed]:
+        return self._feeds.get(room_code)
+
+    async def start(self, room_code: str, num_questions: int, category: Optional[str] = None) -> QuestionFeed:
+        started = time.perf_counter()
+        feed = QuestionFeed(room_code, num_questions)
+        self._feeds[room_code] = feed
+
+        pooled = question_pool.take(num_questions, category, room_code)
+        pooled += await question_corpus.pick_async(num_questions - len(pooled), category, room_code, pooled)
+        for question in pooled:
+            await feed.add(question)
+
+        if len(pooled) == num_questions:
+            pool_requests.inc(category=category or "default", outcome="hit")
+            question_deduplicator.remember(pooled, room_code)
+            await feed.finish()
+        else:
+            pool_requests.inc(category=category or "default", outcome="partial" if pooled else "miss")
+            self._tasks[room_code] = asyncio.create_task(
+                self._stream_rest(feed, num_questions - len(pooled), category, started)
+            )
+
+        await feed.wait_for(1)
+        first_question_latency.observe(time.perf_counter() - started)
+        return feed
+
+    async def _stream_rest(self, feed: QuestionFeed, shortfall: int, category: Optional[str], started: float):
+        try:
+            async for question in question_coalescer.stream(shortfall, category):
+                if question_deduplicator.is_duplicate(question, feed.room_code, feed.questions, check_recent=False):
+                    continue
+                await feed.add(question)
+
+            missing = feed.num_questions - len(feed.questions)
+            if missing > 0:
+                for question in pick_fallback_questions(missing, feed.room_code, feed.questions):
+                    await feed.add(question)
+
+            question_deduplicator.remember(feed.questions, feed.room_code)
+            complete_latency.observe(time.perf_counter() - started)
+            await self._store(feed)
+        except Exception as e:
+            logger.error("Error streaming questions for room %s: %s", feed.room_code, e)
+        finally:
+            await feed.finish()
+            self._tasks.pop(feed.room_code, None)
+
+    async def _store(self, feed: QuestionFeed):
+        """Write the feed's questions to the room from a worker thread, off the event loop"""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._persist, feed.room_code, list(feed.questions))
+
+    def _persist(self, room_code: str, questions: List[str]):
+        db = self._session_factory()
+        try:
+            room = db.query(Room).filter(Room.code == room_code).first()
+            if room is not None:
+                room.questions = questions
+                db.commit()
+                logger.info("Stored %s streamed questions for room %s", len(questions), room_code)
+        finally:
+            db.close()
+
+    async def wait_for_question(self, room_code: str, round_number: int) -> Optional[str]:
+        """Question for round_number if this worker is still streaming it, else None"""
+        feed = self._feeds.get(room_code)
+        if feed is None:
+            return None
+
+        questions = await feed.wait_for(round_number, timeout=settings.AI_DEADLINE_GENERATE_QUESTIONS)
+        if len(questions) >= round_number:
+            return questions[round_number - 1]
+        return None
+
+    def discard(self, room_code: str):
+        self._feeds.pop(room_code, None)
+        task = self._tasks.pop(room_code, None)
+        if task is not None and not task.done():
+            task.cancel()
+
+    async def handoff(self, timeout: float):
+        """
+        Before this worker drains: give streams up to timeout to finish, then top up
+        unfinished feeds with fallback questions and store them so another worker
+        can run the rest of the game from the database
+        """
+        tasks = [task for task in self._tasks.values() if not task.done()]
+        if tasks:
+            await asyncio.wait(tasks, timeout=timeout)
+        for room_code, task in list(self._tasks.items()):
+            task.cancel()
+            feed = self._feeds[room_code]
+            missing = feed.num_questions - len(feed.questions)
+            if missing > 0:
+                for question in pick_fallback_questions(missing, room_code, feed.questions):
+                    await feed.add(question)
+            await self._store(feed)
+
+    async def close(self):
+        tasks = [task for task in self._tasks.values() if not task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+
+
+question_feeds = QuestionFeeds()
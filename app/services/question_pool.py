@@ -0,0 +1,189 @@
+import asyncio
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, Iterable, List, Optional
+from app.config import settings
+from app.services.ai_service import AIService, pick_fallback_questions
+from app.services.ai_coalescer import question_coalescer
+from app.services.question_dedup import question_deduplicator, duplicates_rejected
+from app.services.question_corpus import question_corpus
+from app.services.ai_metrics import attribute_room
+from app.services.ai_client import Priority, set_priority
+from app.utils.metrics import registry
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+QuestionGenerator = Callable[[int, Optional[str]], Awaitable[List[str]]]
+
+pool_depth = registry.gauge(
+    "question_pool_depth",
+    "Questions ready to be served without a model call",
+    ["category"]
+)
+pool_requests = registry.counter(
+    "question_pool_requests_total",
+    "Question draws by outcome (hit, partial or miss)",
+    ["category", "outcome"]
+)
+refill_latency = registry.histogram(
+    "question_pool_refill_seconds",
+    "Latency of a single background refill generation call",
+    ["category"]
+)
+
+
+def _label(category: Optional[str]) -> str:
+    return category or "default"
+
+
+class QuestionPool:
+    """Keeps pre-generated questions per category above a low-water mark"""
+
+    def __init__(
+        self,
+        generator: Optional[QuestionGenerator] = None,
+        inline_generator: Optional[QuestionGenerator] = None,
+        low_water: int = 10,
+        target: int = 30,
+        batch_size: int = 10,
+        retry_delay: float = 5.0
+    ):
+        self._generator = generator
+        self._inline_generator = inline_generator or generator
+        self.low_water = low_water
+        self.target = target
+        self.batch_size = batch_size
+        self.retry_delay = retry_delay
+        self._queues: Dict[Optional[str], Deque[str]] = {}
+        self._refills: Dict[Optional[str], asyncio.Task] = {}
+
+    async def _generate(self, num_questions: int, category: Optional[str]) -> List[str]:
+        """Background refill generation, drawn from the corpus once it is large enough"""
+        if self._generator is not None:
+            return await self._generator(num_questions, category)
+
+        questions: List[str] = []
+        if await question_corpus.count_async(category) >= settings.QUESTION_CORPUS_MIN_SIZE:
+            questions = await question_corpus.pick_async(num_questions, category)
+        if len(questions) < num_questions:
+            # Failed or shed refills retry later rather than stocking fallbacks
+            questions += await AIService.generate_questions(num_questions - len(questions), category, pad=False)
+        return questions
+
+    async def _generate_inline(self, num_questions: int, category: Optional[str]) -> List[str]:
+        """Generation a caller is waiting on, merged with concurrent callers"""
+        if self._inline_generator is not None:
+            return await self._inline_generator(num_questions, category)
+        return await question_coalescer.request(num_questions, category)
+
+    def depth(self, category: Optional[str] = None) -> int:
+        return len(self._queues.get(category, ()))
+
+    def take(
+        self,
+        num_questions: int,
+        category: Optional[str] = None,
+        room_code: Optional[str] = None
+    ) -> List[str]:
+        """Pop up to num_questions ready questions without waiting, discarding near-duplicates"""
+        queue = self._queues.setdefault(category, deque())
+        taken: List[str] = []
+        while queue and len(taken) < num_questions:
+            question = queue.popleft()
+            if question_deduplicator.is_duplicate(question, room_code, taken):
+                duplicates_rejected.inc(source="pool")
+                continue
+            taken.append(question)
+
+        pool_depth.set(len(queue), category=_label(category))
+        self.ensure_refill(category)
+        return taken
+
+    async def get_questions(
+        self,
+        num_questions: int,
+        category: Optional[str] = None,
+        room_code: Optional[str] = None
+    ) -> List[str]:
+        """
+        Draw questions for a room from the pool, generating inline only what the pool
+        cannot cover. The returned questions are recorded as used for near-duplicate checks.
+        """
+        questions = self.take(num_questions, category, room_code)
+
+        if len(questions) == num_questions:
+            pool_requests.inc(category=_label(category), outcome="hit")
+        else:
+            pool_requests.inc(category=_label(category), outcome="partial" if questions else "miss")
+            shortfall = num_questions - len(questions)
+            logger.info("Question pool short by %s for category %s", shortfall, _label(category))
+
+            questions += await question_corpus.pick_async(shortfall, category, room_code, questions)
+            shortfall = num_questions - len(questions)
+            if shortfall > 0:
+                generated = await self._generate_inline(shortfall, category)
+                questions += question_deduplicator.unique(generated, shortfall, room_code, questions)
+            if len(questions) < num_questions:
+                questions += pick_fallback_questions(num_questions - len(questions), room_code, questions)
+
+        question_deduplicator.remember(questions, room_code)
+        return questions
+
+    def ensure_refill(self, category: Optional[str] = None):
+        """Start a background refill if the pool is below its low-water mark"""
+        if self.depth(category) >= self.low_water:
+            return
+
+        task = self._refills.get(category)
+        if task is not None and not task.done():
+            return
+
+        try:
+            self._refills[category] = asyncio.get_running_loop().create_task(self._refill(category))
+        except RuntimeError:
+            # No running loop (e.g. sync callers); the next async draw will refill
+            pass
+
+    async def _refill(self, category: Optional[str]):
+        # Refills are shared by every room, whichever one triggered them
+        attribute_room(None)
+        set_priority(Priority.BACKGROUND)
+        queue = self._queues.setdefault(category, deque())
+        while len(queue) < self.target:
+            started = time.perf_counter()
+            try:
+                batch = await self._generate(self.batch_size, category)
+            except Exception as e:
+                logger.error("Question pool refill failed for %s: %s", _label(category), e)
+                await asyncio.sleep(self.retry_delay)
+                continue
+
+            refill_latency.observe(time.perf_counter() - started, category=_label(category))
+            queue.extend(batch)
+            pool_depth.set(len(queue), category=_label(category))
+
+            if not batch:
+                await asyncio.sleep(self.retry_delay)
+
+        logger.info("Question pool for %s refilled to %s", _label(category), len(queue))
+
+    def warm(self, categories: Iterable[Optional[str]] = (None,)):
+        """Kick off refills for the given categories"""
+        for category in categories:
+            self.ensure_refill(category)
+
+    async def close(self):
+        """Cancel background refills"""
+        tasks = [task for task in self._refills.values() if not task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._refills.clear()
+
+
+question_pool = QuestionPool(
+    low_water=settings.QUESTION_POOL_LOW_WATER,
+    target=settings.QUESTION_POOL_TARGET,
+    batch_size=settings.QUESTION_POOL_BATCH_SIZE
+)
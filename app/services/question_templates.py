@@ -0,0 +1,238 @@
+import random
+import re
+import string
+from typing import Dict, List, Optional, Sequence, Set
+from app.config import settings
+from app.utils.similarity import normalize_text
+from app.utils.metrics import registry
+
+template_questions = registry.counter(
+    "question_template_generated_total",
+    "Questions produced by the offline template generator",
+    ["category"]
+)
+
+MAX_QUESTION_LENGTH = 100
+
+# Slots are {name}; a slot may appear at most once per template
+TEMPLATES: Dict[str, List[str]] = {
+    "default": [
+        "Invent a {thing} that only works on {day}",
+        "What would a {animal} name its {business}?",
+        "Design a {thing} for a {person} who is always late",
+        "What's the worst possible name for a {business}?",
+        "Describe the rules of a sport played with a {thing}",
+        "Invent a holiday where everyone has to {verb}",
+        "What ridiculous warning label would you put on a {thing}?",
+        "What would a {person} put in their {place} survival kit?",
+        "Pitch a reality show set in a {place}",
+        "What would your {thing} say about you if it could talk?",
+        "Invent a superpower that only works in a {place}",
+        "What secret is the {animal} next door hiding?",
+        "Create a {business} that only opens on {day}",
+        "What would a {person} write in a one-star review of a {place}?",
+        "Name a {business} run entirely by a {animal}",
+        "What's the motto of a club for people who {verb}?",
+        "Invent a board game about a {person} lost in a {place}",
+        "What would you rename {day} and why?",
+        "Describe the theme song of a {animal} on its way to {verb}",
+        "What's inside the mystery box at a {place}?",
+    ],
+    "food": [
+        "Invent a {food} flavour nobody asked for",
+        "What would you serve at a {place} for {day} brunch?",
+        "Name a sandwich made with {food} and {ingredient}",
+        "What would a {animal} order at a {business}?",
+        "Describe a dessert that tastes like {day}",
+        "Pitch a cooking show where every dish must include {ingredient}",
+        "What's the secret ingredient in a {person}'s {food}?",
+    ],
+    "animals": [
+        "What job would a {animal} be terrible at?",
+        "What would a {animal} complain about on {day}?",
+        "Invent a new animal that is half {animal}, half {thing}",
+        "What would a {animal} bring to a {place}?",
+        "Name a band where every member is a {animal}",
+    ],
+    "tech": [
+        "Design a useless app for a {person}",
+        "What would a smart {thing} do that nobody needs?",
+        "Invent a gadget that helps you {verb}",
+        "What would a robot {person} say on its first day?",
+        "Name the worst possible feature for a smart {place}",
+    ],
+    "travel": [
+        "Plan a holiday for a {animal} visiting a {place}",
+        "What souvenir would you bring back from a {place}?",
+        "Write the slogan for a {place} tourism board",
+        "What's the strangest rule at a {place} hotel?",
+        "Pack one {thing} for a trip to the moon - what's your reason?",
+    ],
+    "topic": [
+        "Invent a {topic} tradition that involves a {thing}",
+        "What would a {animal} get wrong about {topic}?",
+        "Pitch a {topic} themed {business}",
+        "What's the most overrated thing about {topic}?",
+        "Describe {topic} to a {person} in one sentence",
+    ],
+}
+
+LEXICON: Dict[str, List[str]] = {
+    "thing": [
+        "umbrella", "toaster", "sock", "backpack", "lamp", "rubber duck", "kazoo",
+        "teapot", "alarm clock", "skateboard", "pillow", "stapler", "trampoline",
+        "garden gnome", "bicycle", "fridge magnet", "yoga mat", "snow globe",
+        "hairbrush", "traffic cone", "doorbell", "shopping cart", "fidget spinner",
+    ],
+    "animal": [
+        "penguin", "octopus", "raccoon", "llama", "hedgehog", "goldfish", "giraffe",
+        "sloth", "flamingo", "kangaroo", "pigeon", "otter", "owl", "hamster",
+        "walrus", "chameleon", "koala", "platypus", "beaver", "snail",
+    ],
+    "person": [
+        "pirate", "librarian", "astronaut", "wizard", "detective", "grandparent",
+        "lifeguard", "magician", "dentist", "ninja", "mime", "superhero",
+        "knight", "chef", "time traveller", "ghost", "substitute teacher",
+    ],
+    "place": [
+        "library", "submarine", "haunted house", "laundromat", "desert island",
+        "space station", "bowling alley", "treehouse", "castle", "elevator",
+        "museum", "campsite", "lighthouse", "waiting room", "water park",
+    ],
+    "business": [
+        "bakery", "gym", "bookshop", "hair salon", "car wash", "food truck",
+        "dating app", "taxi service", "pet hotel", "hardware store", "florist",
+        "karaoke bar", "travel agency", "ice rink", "dry cleaner",
+    ],
+    "day": [
+        "Mondays", "Tuesdays", "Wednesdays", "Thursdays", "Fridays", "Saturdays",
+        "Sundays", "leap days", "your birthday", "rainy days", "snow days",
+    ],
+    "verb": [
+        "whisper", "juggle", "hop on one foot", "speak in rhyme", "wear a cape",
+        "walk backwards", "hum constantly", "carry a spoon", "dance at noon",
+        "tell a joke", "nap in public", "sing their emails",
+    ],
+    "food": [
+        "ice cream", "pizza", "pancake", "soup", "taco", "donut", "smoothie",
+        "popcorn", "lasagna", "muffin", "burrito", "cheesecake",
+    ],
+    "ingredient": [
+        "pickles", "marshmallows", "hot sauce", "pineapple", "peanut butter",
+        "garlic", "cinnamon", "seaweed", "gummy bears", "lemon zest",
+    ],
+}
+
+# Category-specific lexicon overrides applied on top of LEXICON
+CATEGORY_LEXICON: Dict[str, Dict[str, List[str]]] = {
+    "food": {
+        "place": ["diner", "food court", "picnic", "bakery", "campsite", "school cafeteria"],
+        "person": ["chef", "food critic", "grandparent", "picky eater", "pastry chef"],
+        "business": ["bakery", "food truck", "ice cream stand", "diner", "juice bar"],
+    },
+    "tech": {
+        "thing": ["toaster", "fridge", "doorbell", "toothbrush", "umbrella", "lamp", "kettle"],
+        "place": ["kitchen", "car", "office", "bathroom", "garden", "classroom"],
+    },
+    "travel": {
+        "place": ["desert island", "ski resort", "cruise ship", "rainforest", "ghost town", "volcano"],
+    },
+}
+
+_ARTICLE = re.compile(r"\b([Aa]) (?!one\b|one-|use|uni)([aeiouAEIOU])")
+_FORMATTER = string.Formatter()
+
+
+def _slots(template: str) -> List[str]:
+    return [name for _, name, _, _ in _FORMATTER.parse(template) if name]
+
+
+class TemplateQuestionGenerator:
+    """
+    Offline question engine: fills category-aware templates from a word lexicon.
+    Output is deterministic for a given seed and needs no network access.
+    """
+
+    def __init__(
+        self,
+        seed: Optional[int] = None,
+        templates: Optional[Dict[str, List[str]]] = None,
+        lexicon: Optional[Dict[str, List[str]]] = None,
+        category_lexicon: Optional[Dict[str, Dict[str, List[str]]]] = None
+    ):
+        self.templates = templates or TEMPLATES
+        self.lexicon = lexicon or LEXICON
+        self.category_lexicon = category_lexicon if category_lexicon is not None else CATEGORY_LEXICON
+        self._random = random.Random(seed)
+
+    def seed(self, seed: Optional[int]):
+        self._random.seed(seed)
+
+    def _templates_for(self, category: Optional[str]) -> List[str]:
+        if not category:
+            return self.templates["default"]
+        key = category.strip().lower()
+        if key in self.templates:
+            # Mostly on-theme, with some general templates for variety
+            return self.templates[key] * 2 + self.templates["default"]
+        return self.templates.get("topic", []) + self.templates["default"]
+
+    def _words(self, slot: str, category: Optional[str]) -> List[str]:
+        overrides = self.category_lexicon.get((category or "").strip().lower(), {})
+        return overrides.get(slot) or self.lexicon.get(slot, [])
+
+    def fill(self, template: str, category: Optional[str] = None) -> Optional[str]:
+        """One question from template, or None if it fails the quality checks"""
+        values: Dict[str, str] = {}
+        for slot in _slots(template):
+            if slot == "topic":
+                values[slot] = (category or "").strip().lower()
+                continue
+            words = self._words(slot, category)
+            if not words:
+                return None
+            values[slot] = self._random.choice(words)
+
+        if len(set(values.values())) < len(values):
+            return None
+
+        question = _ARTICLE.sub(lambda m: f"{m.group(1)}n {m.group(2)}", template.format(**values))
+        question = question[0].upper() + question[1:]
+        if len(question) > MAX_QUESTION_LENGTH:
+            return None
+        return question
+
+    def generate(
+        self,
+        num_questions: int,
+        category: Optional[str] = None,
+        exclude: Sequence[str] = ()
+    ) -> List[str]:
+        """num_questions distinct questions (fewer only if the template space runs out)"""
+        templates = self._templates_for(category)
+        seen: Set[str] = {normalize_text(q) for q in exclude}
+        used_templates: Set[str] = set()
+        questions: List[str] = []
+
+        attempts = 0
+        while len(questions) < num_questions and attempts < num_questions * 20 + 50:
+            attempts += 1
+            template = self._random.choice(templates)
+            # Spread a small batch across different templates before repeating one
+            if template in used_templates and len(used_templates) < len(set(templates)):
+                continue
+            question = self.fill(template, category)
+            if question is None:
+                continue
+            key = normalize_text(question)
+            if key in seen:
+                continue
+            seen.add(key)
+            used_templates.add(template)
+            questions.append(question)
+
+        template_questions.inc(len(questions), category=category or "default")
+        return questions
+
+
+template_generator = TemplateQuestionGenerator(settings.QUESTION_TEMPLATE_SEED)
@@ -0,0 +1,125 @@
+import itertools
+import threading
+import time
+import uuid
+from typing import Dict, Optional, Set
+from uuid import UUID
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models.room import Room, RoomParticipant
+from app.utils.metrics import registry
+
+cache_requests = registry.counter(
+    "room_detail_cache_total",
+    "GET /api/rooms/{room_code} by outcome (hit, miss or not_modified)",
+    ["outcome"]
+)
+
+
+class CachedRoomDetail:
+    __slots__ = ("room_id", "version", "body", "etag", "built_at")
+
+    def __init__(self, room_id: UUID, version: int, body: bytes, etag: Optional[str]):
+        self.room_id = room_id
+        self.version = version
+        self.body = body
+        self.etag = etag
+        self.built_at = time.monotonic()
+
+
+class RoomDetailCache:
+    """
+    Serialized room detail bodies, keyed by room code and a per-room version.
+
+    The version is bumped after any commit that touches a Room (status, current
+    round) or its participants, so this worker's own writes invalidate at once.
+    Writes made by other workers are caught when an entry outlives `ttl`: it is
+    rebuilt, and a changed body gets a new version. ETags carry a per-process
+    epoch, so a tag from another worker or an earlier run never matches.
+    """
+
+    def __init__(self, ttl: Optional[float] = None, max_entries: int = 5000):
+        self.ttl = settings.ROOM_CACHE_TTL_SECONDS if ttl is None else ttl
+        self.max_entries = max_entries
+        self.epoch = uuid.uuid4().hex[:8]
+        self._counter = itertools.count(1)
+        self._last = 0
+        self._floor = 0  # versions at or below this may have been forgotten
+        self._versions: Dict[UUID, int] = {}
+        self._entries: Dict[str, CachedRoomDetail] = {}
+        self._lock = threading.Lock()
+
+    def get(self, room_code: str) -> Optional[CachedRoomDetail]:
+        """Entry for room_code if it is still current"""
+        entry = self._entries.get(room_code)
+        if entry is None:
+            return None
+        if entry.version != self._versions.get(entry.room_id) or time.monotonic() - entry.built_at > self.ttl:
+            return None
+        return entry
+
+    def begin(self) -> int:
+        """Mark taken before reading the room; store() refuses bodies a commit has overtaken"""
+        return self._last
+
+    def store(self, room_code: str, room_id: UUID, body: bytes, since: int) -> CachedRoomDetail:
+        with self._lock:
+            version = self._versions.get(room_id)
+            if (version is not None and version > since) or (version is None and since < self._floor):
+                # Committed to while this body was being built; serve it once, uncached
+                return CachedRoomDetail(room_id, version, body, None)
+            previous = self._entries.get(room_code)
+            if version is None or (previous is not None and previous.version == version and previous.body != body):
+                # Never seen, or changed by another worker since it was cached
+                version = self._versions[room_id] = self._next()
+            entry = CachedRoomDetail(room_id, version, body, f'"{self.epoch}-{version}"')
+            self._entries[room_code] = entry
+            if len(self._entries) > self.max_entries:
+                self._evict()
+            return entry
+
+    def bump(self, room_ids: Set[UUID]):
+        with self._lock:
+            for room_id in room_ids:
+                self._versions[room_id] = self._next()
+            if len(self._versions) > 2 * self.max_entries:
+                self._evict()
+
+    def _next(self) -> int:
+        self._last = next(self._counter)
+        return self._last
+
+    def _evict(self):
+        """Drop the older half of the entries and the versions of rooms no longer cached"""
+        by_age = sorted(self._entries.items(), key=lambda item: item[1].built_at)
+        for room_code, _ in by_age[:len(by_age) // 2]:
+            del self._entries[room_code]
+        cached = {entry.room_id for entry in self._entries.values()}
+        self._versions = {room_id: v for room_id, v in self._versions.items() if room_id in cached}
+        self._floor = self._last
+
+
+room_details = RoomDetailCache()
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_rooms(session: Session, flush_context):
+    changed = session.info.setdefault("changed_rooms", set())
+    for obj in itertools.chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, Room):
+            changed.add(obj.id)
+        elif isinstance(obj, RoomParticipant):
+            changed.add(obj.room_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_changed_rooms(session: Session):
+    changed = session.info.pop("changed_rooms", None)
+    if changed:
+        room_details.bump(changed)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _forget_changed_rooms(session: Session, previous_transaction):
+    session.info.pop("changed_rooms", None)
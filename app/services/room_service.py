@@ -5,9 +5,11 @@ from uuid import UUID
 from app.models.room import Room, RoomParticipant, RoomStatus
 from app.models.user import User
 from app.schemas.room import RoomCreate
+from app.schemas.records import ParticipantRecord
 from app.utils.room_code import generate_room_code
 from app.utils.exceptions import NotFoundException, BadRequestException, ForbiddenException
 from app.utils.logger import get_logger
+from app.utils.db_routing import replica_read
 
 logger = get_logger(__name__)
 
@@ -43,7 +45,7 @@ class RoomService:
         db.add(participant)
         db.commit()
 
-        logger.info(f"Room created: {new_room.code} by user {host_id}")
+        logger.info("Room created: %s by user %s", new_room.code, host_id)
         return new_room
 
     @staticmethod
@@ -82,7 +84,7 @@ class RoomService:
         db.add(participant)
         db.commit()
 
-        logger.info(f"User {user_id} joined room {room_code}")
+        logger.info("User %s joined room %s", user_id, room_code)
         return room
 
     @staticmethod
@@ -94,15 +96,16 @@ class RoomService:
         return room
 
     @staticmethod
-    def get_room_participants(room_id: UUID, db: Session) -> List[User]:
-        """Get all participants in a room"""
-        participants = db.query(User).join(
+    @replica_read
+    def get_room_participants(room_id: UUID, db: Session) -> List[ParticipantRecord]:
+        """Get all participants in a room (id and username only)"""
+        rows = db.query(User.id, User.username).join(
             RoomParticipant, RoomParticipant.user_id == User.id
         ).filter(
             RoomParticipant.room_id == room_id
         ).all()
 
-        return participants
+        return [ParticipantRecord(row.id, row.username) for row in rows]
 
     @staticmethod
     def leave_room(room_code: str, user_id: UUID, db: Session):
@@ -119,7 +122,7 @@ class RoomService:
         if participant:
             db.delete(participant)
             db.commit()
-            logger.info(f"User {user_id} left room {room_code}")
+            logger.info("User %s left room %s", user_id, room_code)
 
     @staticmethod
     def update_room_status(room_id: UUID, status: RoomStatus, db: Session):
@@ -128,4 +131,4 @@ class RoomService:
         if room:
             room.status = status
             db.commit()
-            logger.info(f"Room {room.code} status updated to {status}")
\ No newline at end of file
+            logger.info("Room %s status updated to %s", room.code, status)
\ No newline at end of file
@@ -0,0 +1,125 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, List, Optional
+from uuid import UUID
+from app.database import SessionLocal
+from app.services.ai_service import AIService
+from app.services.game_service import GameService
+from app.services.ai_client import Priority, set_priority
+from app.utils.metrics import registry
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+SummaryGenerator = Callable[[List[str]], Awaitable[str]]
+
+summary_requests = registry.counter(
+    "round_summary_requests_total",
+    "Round results by whether the summary was ready when the round ended",
+    ["outcome"]
+)
+summary_latency = registry.histogram(
+    "round_summary_seconds",
+    "Time from start_voting until the round summary is generated"
+)
+
+
+class RoundSummaries:
+    """
+    Generates each round's summary in the background once voting freezes the
+    answers, so it is usually ready by the time the host ends the round.
+    Finished summaries are cached per round and written to rounds.summary.
+    """
+
+    def __init__(
+        self,
+        generator: Optional[SummaryGenerator] = None,
+        session_factory=SessionLocal,
+        max_rounds: int = 1000
+    ):
+        self._generator = generator
+        self._session_factory = session_factory
+        self.max_rounds = max_rounds
+        self._summaries: "OrderedDict[str, str]" = OrderedDict()
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    async def _generate(self, answers: List[str]) -> str:
+        if self._generator is not None:
+            return await self._generator(answers)
+        return await AIService.generate_round_summary(answers)
+
+    def start(self, round_id: str, answers: List[str]):
+        """Begin generating the summary for round_id unless it is cached or in flight"""
+        round_id = str(round_id)
+        if not answers or round_id in self._summaries or round_id in self._tasks:
+            return
+        self._tasks[round_id] = asyncio.create_task(self._run(round_id, list(answers)))
+
+    async def _run(self, round_id: str, answers: List[str]):
+        set_priority(Priority.BACKGROUND)
+        started = time.perf_counter()
+        try:
+            summary = await self._generate(answers)
+            summary_latency.observe(time.perf_counter() - started)
+            self._store(round_id, summary)
+            self._persist(round_id, summary)
+        except Exception as e:
+            logger.error("Error generating summary for round %s: %s", round_id, e)
+        finally:
+            self._tasks.pop(round_id, None)
+
+    def _store(self, round_id: str, summary: str):
+        self._summaries[round_id] = summary
+        self._summaries.move_to_end(round_id)
+        while len(self._summaries) > self.max_rounds:
+            self._summaries.popitem(last=False)
+
+    def _persist(self, round_id: str, summary: str):
+        db = self._session_factory()
+        try:
+            GameService.save_round_summary(UUID(round_id), summary, db)
+        finally:
+            db.close()
+
+    def get(self, round_id: str, stored: Optional[str] = None) -> Optional[str]:
+        """Cached summary for round_id, falling back to the persisted one"""
+        round_id = str(round_id)
+        summary = self._summaries.get(round_id)
+        if summary is None and stored is not None:
+            self._store(round_id, stored)
+            summary = stored
+        summary_requests.inc(outcome="ready" if summary is not None else (
+            "pending" if round_id in self._tasks else "missing"
+        ))
+        return summary
+
+    def pending(self, round_id: str) -> bool:
+        return str(round_id) in self._tasks
+
+    async def wait(self, round_id: str, timeout: Optional[float] = None) -> Optional[str]:
+        """Summary for round_id once its generation finishes (None on failure or timeout)"""
+        round_id = str(round_id)
+        task = self._tasks.get(round_id)
+        if task is not None:
+            try:
+                await asyncio.wait_for(asyncio.shield(task), timeout)
+            except asyncio.TimeoutError:
+                return None
+        return self._summaries.get(round_id)
+
+    async def handoff(self, timeout: float):
+        """Before this worker drains: let pending summaries finish (they are stored with their round)"""
+        tasks = [task for task in self._tasks.values() if not task.done()]
+        if tasks:
+            await asyncio.wait(tasks, timeout=timeout)
+
+    async def close(self):
+        tasks = [task for task in self._tasks.values() if not task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+
+
+round_summaries = RoundSummaries()
@@ -0,0 +1,79 @@
+import time
+from typing import Any, Dict
+from sqlalchemy import exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import NullPool, QueuePool
+from app.config import settings
+from app.utils.metrics import registry
+
+pool_wait = registry.histogram(
+    "db_pool_wait_seconds",
+    "Time to get a connection from the pool, including opening a new one",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 30.0)
+)
+pool_waiting = registry.gauge(
+    "db_pool_waiting",
+    "Checkouts currently waiting for a pooled connection"
+)
+pool_timeouts = registry.counter(
+    "db_pool_timeouts_total",
+    "Checkouts that gave up after DB_POOL_TIMEOUT seconds"
+)
+
+
+class _TimedCheckout:
+    """Times every checkout; a growing wait with few queries means the pool is too small"""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        pool_waiting.inc()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            pool_timeouts.inc()
+            raise
+        finally:
+            pool_waiting.dec()
+            pool_wait.observe(time.perf_counter() - started)
+
+
+class InstrumentedQueuePool(_TimedCheckout, QueuePool):
+    pass
+
+
+class InstrumentedNullPool(_TimedCheckout, NullPool):
+    pass
+
+
+def engine_options(database_url: str) -> Dict[str, Any]:
+    """
+    create_engine keyword arguments from the DB_* settings.
+
+    With DB_POOLER=True (PgBouncer or another transaction pooler in front of
+    Postgres) the app keeps no connections of its own: NullPool opens one per
+    session and closes it on release, leaving pooling across workers to the
+    pooler. psycopg2 never uses server-side prepared statements; psycopg 3 is
+    told not to, since a prepared statement outlives the pooler's transaction.
+    """
+    url = make_url(database_url)
+    options: Dict[str, Any] = {}
+
+    if settings.DB_POOLER:
+        options["poolclass"] = InstrumentedNullPool
+        if url.get_driver_name() == "psycopg":
+            options["connect_args"] = {"prepare_threshold": None}
+        return options
+
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        # In-memory SQLite lives in one connection; keep SQLAlchemy's default pool
+        return options
+
+    options.update(
+        poolclass=InstrumentedQueuePool,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+    )
+    return options
@@ -0,0 +1,176 @@
+import functools
+import threading
+import time
+from contextvars import ContextVar
+from typing import Callable, Dict, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import UpdateBase
+from app.config import settings
+from app.utils.metrics import registry
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+routed = registry.counter(
+    "db_routed_total",
+    "Session statements and flushes by the engine they were sent to",
+    ["target"]
+)
+sticky_errors = registry.counter(
+    "db_sticky_backend_errors_total",
+    "Read-your-writes store failures (affected reads go to the primary)"
+)
+
+# Set while a service method marked @replica_read runs
+_replica_ok: ContextVar[bool] = ContextVar("replica_ok", default=False)
+# User the current request or socket event acts for
+_actor: ContextVar[Optional[str]] = ContextVar("db_actor", default=None)
+
+
+def replica_read(fn: Callable) -> Callable:
+    """
+    Mark a read-only service call as safe to answer from the replica. Only for
+    results that are displayed, never for ones a handler uses to decide a write:
+    the replica may lag, and what it returns stays in the session's identity map.
+    """
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        token = _replica_ok.set(True)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _replica_ok.reset(token)
+
+    return wrapper
+
+
+def set_actor(user_id) -> None:
+    """Record who the current request or socket event is for, for read-your-writes"""
+    _actor.set(str(user_id) if user_id is not None else None)
+
+
+def use_primary(session: Session) -> None:
+    """Send this session's remaining reads to the primary, e.g. when they fill a shared cache"""
+    session.info["primary"] = True
+
+
+class ReadYourWrites:
+    """
+    Users who committed a write in the last `window` seconds read from the primary,
+    so they never see the replica from before their own change. This one is kept
+    in process, which only covers a single worker; see RedisReadYourWrites.
+    """
+
+    def __init__(self, window: Optional[float] = None):
+        self.window = settings.DB_REPLICA_STICKY_SECONDS if window is None else window
+        self._until: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def wrote(self, user_id: str):
+        now = time.monotonic()
+        with self._lock:
+            self._until[user_id] = now + self.window
+            if len(self._until) > 10000:
+                self._until = {user: until for user, until in self._until.items() if until > now}
+
+    def sticky(self, user_id: Optional[str]) -> bool:
+        if user_id is None:
+            return False
+        return self._until.get(user_id, 0) > time.monotonic()
+
+
+class RedisReadYourWrites:
+    """
+    Last-write markers shared by every worker as Redis keys that expire after
+    `window`, so a write on one worker keeps the user's reads on the primary on
+    all of them. Fails towards the primary: a marker that cannot be read counts
+    as a recent write.
+    """
+
+    def __init__(self, url: str, window: Optional[float] = None, prefix: str = "ryw:", client=None):
+        import redis
+
+        self.window = settings.DB_REPLICA_STICKY_SECONDS if window is None else window
+        self.prefix = prefix
+        # Called from synchronous ORM code; keep the worst case short
+        self._client = client or redis.Redis.from_url(url, socket_timeout=0.1, socket_connect_timeout=0.1)
+
+    def wrote(self, user_id: str):
+        try:
+            self._client.set(self.prefix + user_id, 1, px=int(self.window * 1000))
+        except Exception as e:
+            sticky_errors.inc()
+            logger.error("Could not record write for %s: %s", user_id, e)
+
+    def sticky(self, user_id: Optional[str]) -> bool:
+        if user_id is None:
+            return False
+        try:
+            return bool(self._client.exists(self.prefix + user_id))
+        except Exception as e:
+            sticky_errors.inc()
+            logger.error("Could not check recent writes for %s: %s", user_id, e)
+            return True
+
+
+def _create_tracker():
+    if not settings.DATABASE_REPLICA_URL:
+        # Nothing is routed to a replica, so nothing needs to be shared
+        return ReadYourWrites()
+    if settings.DB_REPLICA_STICKY_BACKEND == "redis":
+        return RedisReadYourWrites(settings.REDIS_URL)
+    if settings.DB_REPLICA_STICKY_BACKEND != "memory":
+        raise ValueError(f"Unknown read-your-writes backend: {settings.DB_REPLICA_STICKY_BACKEND}")
+    return ReadYourWrites()
+
+
+read_your_writes = _create_tracker()
+
+
+class RoutingSession(Session):
+    """
+    Sends flushes and INSERT/UPDATE/DELETE to the primary, and reads from
+    @replica_read service calls to the replica. Reads go back to the primary once
+    this session has written, or while the acting user's recent write may not
+    have reached the replica yet. Without a replica everything uses the primary.
+    """
+
+    def __init__(self, *args, replica: Optional[Engine] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.replica = replica
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self.replica is None:
+            return super().get_bind(mapper, clause=clause, **kwargs)
+
+        if self._flushing or isinstance(clause, UpdateBase):
+            self.info["wrote"] = True
+        elif (
+            _replica_ok.get()
+            and not (self.info.get("wrote") or self.info.get("primary"))
+            and not self._actor_sticky()
+        ):
+            routed.inc(target="replica")
+            return self.replica
+
+        routed.inc(target="primary")
+        return super().get_bind(mapper, clause=clause, **kwargs)
+
+    def _actor_sticky(self) -> bool:
+        # Looked up once per session and actor, not once per statement
+        actor = _actor.get()
+        cached = self.info.get("sticky")
+        if cached is None or cached[0] != actor:
+            cached = self.info["sticky"] = (actor, read_your_writes.sticky(actor))
+        return cached[1]
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _remember_writer(session: Session):
+    if session.info.get("wrote"):
+        actor = _actor.get()
+        if actor is not None:
+            read_your_writes.wrote(actor)
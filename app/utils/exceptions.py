@@ -39,4 +39,22 @@ class ConflictException(HTTPException):
         super().__init__(
             status_code=status.HTTP_409_CONFLICT,
             detail=detail,
+        )
+
+
+class TooManyRequestsException(HTTPException):
+    def __init__(self, detail: str = "Too many requests", retry_after: float = 1):
+        super().__init__(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=detail,
+            headers={"Retry-After": str(max(1, int(retry_after + 0.999)))},
+        )
+
+
+class ServiceUnavailableException(HTTPException):
+    def __init__(self, detail: str = "Service unavailable", retry_after: float = 1):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=detail,
+            headers={"Retry-After": str(max(1, int(retry_after + 0.999)))},
         )
\ No newline at end of file
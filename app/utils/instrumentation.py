@@ -0,0 +1,161 @@
+import functools
+import time
+from typing import Any, Callable
+from sqlalchemy import func
+from sqlalchemy.engine import Engine
+from app.models.room import Room, RoomStatus
+from app.utils.metrics import registry
+from app.utils.profiler import handler_profiler
+from app.utils.query_stats import track_queries
+
+socket_event_latency = registry.histogram(
+    "socket_event_seconds",
+    "Socket.IO event handler latency",
+    ["event"]
+)
+socket_events = registry.counter(
+    "socket_events_total",
+    "Socket.IO events handled, by outcome (ok or error)",
+    ["event", "outcome"]
+)
+socket_events_in_flight = registry.gauge(
+    "socket_events_in_flight",
+    "Socket.IO event handlers currently running on this worker"
+)
+connected_sids = registry.gauge(
+    "socket_connected_sids",
+    "Socket.IO clients currently connected to this worker"
+)
+http_latency = registry.histogram(
+    "http_request_seconds",
+    "REST request latency by route template",
+    ["method", "route"]
+)
+http_requests = registry.counter(
+    "http_requests_total",
+    "REST requests by route template and status code",
+    ["method", "route", "status"]
+)
+active_rooms = registry.gauge(
+    "rooms",
+    "Rooms in the database by status",
+    ["status"]
+)
+pool_connections = registry.gauge(
+    "db_pool_connections",
+    "SQLAlchemy pool connections by state (checked_out, checked_in, overflow, size)",
+    ["state"]
+)
+
+
+def _failed(result: Any) -> bool:
+    """Handlers report failure by returning False (connect) or {'success': False}"""
+    if result is False:
+        return True
+    return isinstance(result, dict) and result.get("success") is False
+
+
+def instrument_event(handler: Callable) -> Callable:
+    """Wrap a Socket.IO handler with a latency histogram and outcome counter"""
+    event = handler.__name__
+
+    @functools.wraps(handler)
+    async def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        outcome = "error"
+        socket_events_in_flight.inc()
+        with track_queries(f"socket {event}", kind="socket") as queries:
+            try:
+                if handler_profiler.active:
+                    result = await handler_profiler.run(event, handler(*args, **kwargs), queries)
+                else:
+                    result = await handler(*args, **kwargs)
+                if not _failed(result):
+                    outcome = "ok"
+                return result
+            finally:
+                socket_events_in_flight.dec()
+                socket_event_latency.observe(time.perf_counter() - started, event=event)
+                socket_events.inc(event=event, outcome=outcome)
+
+    return wrapper
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording REST latency and SQL statement counts per
+    route template, so /api/rooms/{room_code} is one series however many rooms exist.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        with track_queries("http", kind="http") as queries:
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                route = scope.get("route")
+                path = getattr(route, "path", None) or "unmatched"
+                method = scope.get("method", "")
+                queries.label = f"{method} {path}"
+                http_latency.observe(time.perf_counter() - started, method=method, route=path)
+                http_requests.inc(method=method, route=path, status=str(status))
+
+
+def pool_stats_collector(engine: Engine) -> Callable[[], None]:
+    """Collector refreshing connection pool gauges at scrape time (QueuePool exposes these)"""
+    pool = engine.pool
+
+    def collect():
+        for state, reader in (
+            ("checked_out", "checkedout"),
+            ("checked_in", "checkedin"),
+            ("overflow", "overflow"),
+            ("size", "size"),
+        ):
+            method = getattr(pool, reader, None)
+            if method is not None:
+                pool_connections.set(method(), state=state)
+
+    return collect
+
+
+def room_status_collector(
+    session_factory, max_age: float = 15.0, clock: Callable[[], float] = time.monotonic
+) -> Callable[[], None]:
+    """
+    Collector refreshing the rooms-by-status gauge with one grouped count, at most
+    once per max_age seconds so scrapes (which need no auth) can't load the database
+    """
+    refreshed_at = None
+
+    def collect():
+        nonlocal refreshed_at
+        now = clock()
+        if refreshed_at is not None and now - refreshed_at < max_age:
+            return
+        refreshed_at = now
+
+        db = session_factory()
+        try:
+            counts = dict(db.query(Room.status, func.count(Room.id)).group_by(Room.status).all())
+        finally:
+            db.close()
+        for status in RoomStatus:
+            active_rooms.set(counts.get(status, 0), status=status.value)
+
+    return collect
@@ -1,17 +1,148 @@
+import json
 import logging
+import logging.handlers
+import queue
+import random
 import sys
+from datetime import datetime, timezone
+from typing import Dict, Optional
 from app.config import settings
+from app.utils.metrics import registry
 
-# Configure logging
-logging.basicConfig(
-    level=logging.DEBUG if settings.DEBUG else logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.StreamHandler(sys.stdout)
-    ]
+dropped_records = registry.counter(
+    "log_records_dropped_total",
+    "Log records discarded because the logging queue was full"
 )
 
 
+class JSONFormatter(logging.Formatter):
+    """One JSON object per record; fields passed as extra={"fields": {...}} become top-level keys"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        fields = getattr(record, "fields", None)
+        if fields:
+            entry.update(fields)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """The classic one-line format, with any structured fields appended as JSON"""
+
+    def __init__(self):
+        super().__init__("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        line = super().formatMessage(record)
+        fields = getattr(record, "fields", None)
+        return f"{line} {json.dumps(fields, default=str)}" if fields else line
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep a fraction of INFO and DEBUG records per logger name prefix, e.g.
+    {"app.websocket.events": 0.1}. Warnings and errors always pass.
+    """
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = sorted(rates.items(), key=lambda item: len(item[0]), reverse=True)
+        self._resolved: Dict[str, float] = {}
+
+    def rate(self, name: str) -> float:
+        rate = self._resolved.get(name)
+        if rate is None:
+            rate = 1.0
+            for prefix, value in self.rates:
+                if name == prefix or name.startswith(prefix + "."):
+                    rate = value
+                    break
+            self._resolved[name] = rate
+        return rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self.rate(record.name)
+        return rate >= 1.0 or (rate > 0 and random.random() < rate)
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    Hands records to the listener thread without formatting them, so %-style
+    arguments are only rendered off the event loop. Records are dropped rather
+    than blocking when the queue is full. Log plain values (ids, strings), not
+    ORM instances, since their repr runs later on another thread.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            dropped_records.inc()
+
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_handler: Optional[logging.Handler] = None
+
+
+def configure_logging(
+    level: Optional[str] = None,
+    log_format: Optional[str] = None,
+    sample_rates: Optional[Dict[str, float]] = None,
+    queue_size: Optional[int] = None,
+    stream=None
+) -> logging.handlers.QueueListener:
+    """
+    Route root logging through a bounded queue to a background thread that formats
+    and writes each record. Safe to call again; the previous pipeline is flushed first.
+    Called at app startup, so scripts, migrations and worker processes that import
+    app modules keep their own logging setup.
+    """
+    global _listener, _handler
+    shutdown_logging()
+
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(JSONFormatter() if (log_format or settings.LOG_FORMAT) == "json" else TextFormatter())
+
+    records = queue.Queue(maxsize=queue_size or settings.LOG_QUEUE_SIZE)
+    _handler = NonBlockingQueueHandler(records)
+    rates = settings.log_sample_rates if sample_rates is None else sample_rates
+    if rates:
+        _handler.addFilter(SamplingFilter(rates))
+
+    root = logging.getLogger()
+    root.addHandler(_handler)
+    root.setLevel((level or settings.LOG_LEVEL).upper())
+
+    _listener = logging.handlers.QueueListener(records, output)
+    _listener.start()
+    return _listener
+
+
+def shutdown_logging():
+    """Write out queued records and detach the pipeline"""
+    global _listener, _handler
+    if _handler is not None:
+        logging.getLogger().removeHandler(_handler)
+        _handler = None
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
 def get_logger(name: str) -> logging.Logger:
     """Get a logger instance"""
-    return logging.getLogger(name)
\ No newline at end of file
+    return logging.getLogger(name)
@@ -0,0 +1,93 @@
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+from app.config import settings
+from app.utils.metrics import registry
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+HASH_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+queue_time = registry.histogram(
+    "password_hash_queue_seconds",
+    "Time password hashing jobs wait for a free worker slot",
+    ["operation"],
+    buckets=HASH_BUCKETS
+)
+run_time = registry.histogram(
+    "password_hash_run_seconds",
+    "Time spent hashing or verifying a password in the worker pool",
+    ["operation"],
+    buckets=HASH_BUCKETS
+)
+in_flight = registry.gauge(
+    "password_hash_in_flight",
+    "Password hashing jobs currently queued or running"
+)
+
+
+class PasswordHasherPool:
+    """Runs bcrypt work off the event loop with a bounded number of concurrent jobs"""
+
+    def __init__(self, executor_type: str = "process", max_workers: int = 2, max_concurrency: int = 2):
+        if executor_type not in ("process", "thread", "inline"):
+            raise ValueError(f"Unknown password hash executor: {executor_type}")
+
+        self.executor_type = executor_type
+        self.max_workers = max_workers
+        self.max_concurrency = max_concurrency
+        self._executor: Optional[Executor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _get_executor(self) -> Optional[Executor]:
+        if self.executor_type == "inline":
+            return None
+        if self._executor is None:
+            if self.executor_type == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="password-hasher"
+                )
+            logger.info("Started %s password hasher pool with %s workers", self.executor_type, self.max_workers)
+        return self._executor
+
+    async def run(self, operation: str, fn: Callable[..., Any], *args) -> Any:
+        """Run fn(*args) in the pool, waiting for a slot if max_concurrency jobs are active"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        queued_at = time.perf_counter()
+        in_flight.inc()
+        try:
+            async with self._semaphore:
+                started_at = time.perf_counter()
+                queue_time.observe(started_at - queued_at, operation=operation)
+
+                executor = self._get_executor()
+                if executor is None:
+                    result = fn(*args)
+                else:
+                    loop = asyncio.get_running_loop()
+                    result = await loop.run_in_executor(executor, fn, *args)
+
+                run_time.observe(time.perf_counter() - started_at, operation=operation)
+                return result
+        finally:
+            in_flight.dec()
+
+    def shutdown(self):
+        """Stop worker processes or threads"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._semaphore = None
+
+
+password_hasher = PasswordHasherPool(
+    executor_type=settings.PASSWORD_HASH_EXECUTOR,
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_concurrency=settings.PASSWORD_HASH_MAX_CONCURRENCY
+)
@@ -0,0 +1,169 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+from collections import Counter as StackCounter
+from typing import Any, Awaitable, Dict, Optional
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class ProfilerBusyError(Exception):
+    """Only one profile may run per worker at a time"""
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+class SamplingProfiler:
+    """
+    Wall-clock sampling profiler. While running, a daemon thread snapshots every
+    other thread's stack each interval and counts identical stacks, producing
+    collapsed-stack output ("a;b;c count") for flamegraph.pl or speedscope.
+    Nothing runs while no profile is in progress.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.running = False
+
+    def _sample(self, stacks: StackCounter, interval: float, stop: threading.Event, max_depth: int):
+        own = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        while not stop.wait(interval):
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                parts = []
+                while frame is not None and len(parts) < max_depth:
+                    parts.append(_frame_label(frame))
+                    frame = frame.f_back
+                parts.append(names.get(ident) or f"thread-{ident}")
+                stacks[";".join(reversed(parts))] += 1
+
+    async def profile(self, seconds: float, interval: float = 0.005, max_depth: int = 64) -> str:
+        """Sample for `seconds` and return collapsed stacks, most frequent first"""
+        with self._lock:
+            if self.running:
+                raise ProfilerBusyError("A profile is already running on this worker")
+            self.running = True
+
+        stacks: StackCounter = StackCounter()
+        stop = threading.Event()
+        sampler = threading.Thread(
+            target=self._sample, args=(stacks, interval, stop, max_depth),
+            name="sampling-profiler", daemon=True
+        )
+        try:
+            sampler.start()
+            await asyncio.sleep(seconds)
+        finally:
+            stop.set()
+            await asyncio.get_running_loop().run_in_executor(None, sampler.join)
+            self.running = False
+
+        logger.info("Sampling profile finished: %s samples over %ss", sum(stacks.values()), seconds)
+        return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+
+class _HandlerTotals:
+    __slots__ = ("calls", "wall", "cpu", "db", "queries")
+
+    def __init__(self):
+        self.calls = 0
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.db = 0.0
+        self.queries = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "wall_ms": round(self.wall * 1000, 3),
+            "cpu_ms": round(self.cpu * 1000, 3),
+            "db_ms": round(self.db * 1000, 3),
+            "queries": self.queries,
+            "wall_ms_avg": round(self.wall * 1000 / self.calls, 3) if self.calls else 0.0,
+            "cpu_ms_avg": round(self.cpu * 1000 / self.calls, 3) if self.calls else 0.0,
+        }
+
+
+class _CpuTimed:
+    """
+    Awaitable that drives a coroutine step by step and adds up the thread CPU time
+    spent inside its own steps, so time other tasks use while it awaits is excluded.
+    """
+
+    def __init__(self, coro: Awaitable):
+        self._coro = coro
+        self.cpu = 0.0
+
+    def __await__(self):
+        steps = self._coro.__await__()
+        value: Any = None
+        error: Optional[BaseException] = None
+        while True:
+            started = time.thread_time()
+            try:
+                yielded = steps.throw(error) if error is not None else steps.send(value)
+            except StopIteration as stop:
+                self.cpu += time.thread_time() - started
+                return stop.value
+            except BaseException:
+                self.cpu += time.thread_time() - started
+                raise
+            self.cpu += time.thread_time() - started
+
+            try:
+                value = yield yielded
+                error = None
+            except GeneratorExit:
+                steps.close()
+                raise
+            except BaseException as e:
+                value, error = None, e
+
+
+class HandlerProfiler:
+    """Per-handler wall, CPU and DB time, collected only while a session is active"""
+
+    def __init__(self):
+        self.active = False
+        self._totals: Dict[str, _HandlerTotals] = {}
+
+    async def run(self, name: str, coro: Awaitable, queries=None) -> Any:
+        timed = _CpuTimed(coro)
+        started = time.perf_counter()
+        try:
+            return await timed
+        finally:
+            totals = self._totals.get(name)
+            if totals is None:
+                totals = self._totals[name] = _HandlerTotals()
+            totals.calls += 1
+            totals.wall += time.perf_counter() - started
+            totals.cpu += timed.cpu
+            if queries is not None:
+                totals.db += queries.seconds
+                totals.queries += queries.count
+
+    async def collect(self, seconds: float) -> Dict[str, Dict[str, Any]]:
+        """Record handler timings for `seconds` and return them, slowest total wall time first"""
+        if self.active:
+            raise ProfilerBusyError("Handler profiling is already active on this worker")
+        self._totals = {}
+        self.active = True
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            self.active = False
+        ranked = sorted(self._totals.items(), key=lambda item: item[1].wall, reverse=True)
+        return {name: totals.to_dict() for name, totals in ranked}
+
+
+sampling_profiler = SamplingProfiler()
+handler_profiler = HandlerProfiler()
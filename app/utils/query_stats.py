@@ -0,0 +1,162 @@
+import functools
+import inspect
+import re
+import time
+from collections import Counter as StatementCounter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.config import settings
+from app.utils.metrics import registry
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+queries_per_unit = registry.histogram(
+    "db_queries_per_unit",
+    "SQL statements issued per HTTP request or socket event",
+    ["kind"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100)
+)
+query_time_per_unit = registry.histogram(
+    "db_query_seconds_per_unit",
+    "Total SQL time per HTTP request or socket event",
+    ["kind"]
+)
+offenders = registry.counter(
+    "db_query_offenders_total",
+    "Requests or events over the query threshold or repeating one statement",
+    ["unit", "reason"]
+)
+
+_NUMBERS = re.compile(r"\b\d+\b")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _shape(statement: str) -> str:
+    """Statement with literals folded so repeated lookups group together"""
+    return _WHITESPACE.sub(" ", _NUMBERS.sub("?", statement)).strip()
+
+
+class QueryStats:
+    """Statements and DB time for one unit of work (an HTTP request or socket event)"""
+
+    def __init__(self, label: str):
+        self.label = label
+        self.count = 0
+        self.seconds = 0.0
+        self.statements: StatementCounter = StatementCounter()
+
+    def add(self, statement: str, seconds: float):
+        self.count += 1
+        self.seconds += seconds
+        self.statements[_shape(statement)] += 1
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statement shapes issued at least threshold times, most frequent first"""
+        return [(sql, n) for sql, n in self.statements.most_common() if n >= threshold]
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def _before_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get("query_started")
+    elapsed = time.perf_counter() - started.pop() if started else 0.0
+    stats = _current.get()
+    if stats is not None:
+        stats.add(statement, elapsed)
+
+
+def install():
+    """Listen on every Engine; idempotent"""
+    if not event.contains(Engine, "before_cursor_execute", _before_execute):
+        event.listen(Engine, "before_cursor_execute", _before_execute)
+        event.listen(Engine, "after_cursor_execute", _after_execute)
+
+
+@contextmanager
+def track_queries(label: str, kind: str = "other") -> Iterator[QueryStats]:
+    """
+    Count statements issued in this context and log it as an offender when it
+    crosses SQL_QUERY_LOG_THRESHOLD or repeats one statement SQL_N_PLUS_ONE_THRESHOLD
+    times. Sync route handlers are counted because Starlette's threadpool copies the
+    context into its worker; a bare loop.run_in_executor does not, so work sent there
+    is only counted if submitted via contextvars.copy_context().run.
+    """
+    stats = QueryStats(label)
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+        queries_per_unit.observe(stats.count, kind=kind)
+        query_time_per_unit.observe(stats.seconds, kind=kind)
+        _report(stats)
+
+
+def _report(stats: QueryStats):
+    if stats.count >= settings.SQL_QUERY_LOG_THRESHOLD:
+        offenders.inc(unit=stats.label, reason="count")
+        logger.warning("%s issued %s queries in %.1fms", stats.label, stats.count, stats.seconds * 1000)
+    for sql, n in stats.repeated(settings.SQL_N_PLUS_ONE_THRESHOLD)[:1]:
+        offenders.inc(unit=stats.label, reason="repeated")
+        logger.warning("Possible N+1 in %s: %sx %s", stats.label, n, sql[:200])
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class QueryBudget:
+    """
+    Fail when the wrapped code issues more than max_queries statements.
+    Works as a context manager or as a decorator on sync and async functions:
+
+        with QueryBudget(2):
+            ...
+
+        @QueryBudget(3)
+        async def test_something(...):
+            ...
+    """
+
+    def __init__(self, max_queries: int, label: str = "query budget"):
+        self.max_queries = max_queries
+        self.label = label
+        self.stats: Optional[QueryStats] = None
+        self._token = None
+
+    def __enter__(self) -> QueryStats:
+        self.stats = QueryStats(self.label)
+        self._token = _current.set(self.stats)
+        return self.stats
+
+    def __exit__(self, exc_type, exc, tb):
+        _current.reset(self._token)
+        if exc_type is None and self.stats.count > self.max_queries:
+            listing = "\n".join(f"  {n}x {sql}" for sql, n in self.stats.statements.most_common())
+            raise QueryBudgetExceeded(
+                f"{self.label}: {self.stats.count} queries, budget {self.max_queries}\n{listing}"
+            )
+        return False
+
+    def __call__(self, func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with QueryBudget(self.max_queries, func.__name__):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with QueryBudget(self.max_queries, func.__name__):
+                return func(*args, **kwargs)
+        return wrapper
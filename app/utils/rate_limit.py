@@ -0,0 +1,158 @@
+import time
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+from fastapi import Request
+from app.config import settings
+from app.utils.exceptions import TooManyRequestsException
+from app.utils.metrics import registry
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+decisions = registry.counter(
+    "auth_rate_limit_decisions_total",
+    "Token bucket decisions for authentication endpoints",
+    ["limiter", "decision"]
+)
+backend_errors = registry.counter(
+    "auth_rate_limit_backend_errors_total",
+    "Rate limit backend failures (requests are allowed through)",
+    ["limiter"]
+)
+
+# Atomically refill and consume from a bucket stored as a Redis hash
+_REDIS_TOKEN_BUCKET = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local cost = tonumber(ARGV[4])
+local data = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(data[1]) or capacity
+local ts = tonumber(data[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+local retry_after = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+else
+    retry_after = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, tostring(retry_after)}
+"""
+
+
+class InMemoryBucketBackend:
+    """Per-process token buckets, evicting the least recently used keys beyond max_keys"""
+
+    def __init__(self, max_keys: int = 100_000, clock: Callable[[], float] = time.monotonic):
+        self.max_keys = max_keys
+        self.clock = clock
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    async def consume(self, key: str, capacity: float, refill_rate: float, cost: float = 1) -> Tuple[bool, float]:
+        now = self.clock()
+        tokens, updated = self._buckets.pop(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated) * refill_rate)
+
+        if tokens >= cost:
+            allowed, retry_after = True, 0.0
+            tokens -= cost
+        else:
+            allowed, retry_after = False, (cost - tokens) / refill_rate
+
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+
+        return allowed, retry_after
+
+
+class RedisBucketBackend:
+    """Token buckets shared between workers through Redis"""
+
+    def __init__(self, url: str, prefix: str = "ratelimit:"):
+        import redis.asyncio as redis
+
+        self.prefix = prefix
+        self._client = redis.from_url(url)
+        self._script = self._client.register_script(_REDIS_TOKEN_BUCKET)
+
+    async def consume(self, key: str, capacity: float, refill_rate: float, cost: float = 1) -> Tuple[bool, float]:
+        allowed, retry_after = await self._script(
+            keys=[self.prefix + key],
+            args=[capacity, refill_rate, time.time(), cost]
+        )
+        return bool(int(allowed)), float(retry_after)
+
+
+class TokenBucketLimiter:
+    """Named token bucket policy: `capacity` burst, refilled at `per_minute` tokens a minute"""
+
+    def __init__(self, name: str, capacity: int, per_minute: float, backend):
+        self.name = name
+        self.capacity = capacity
+        self.refill_rate = per_minute / 60.0
+        self.backend = backend
+
+    async def check(self, key: str):
+        """Consume one token for key or raise TooManyRequestsException"""
+        try:
+            allowed, retry_after = await self.backend.consume(
+                f"{self.name}:{key}", self.capacity, self.refill_rate
+            )
+        except Exception as e:
+            # Fail open: a broken limiter backend must not lock everyone out
+            backend_errors.inc(limiter=self.name)
+            logger.error("Rate limit backend error for %s: %s", self.name, e)
+            return
+
+        if not allowed:
+            decisions.inc(limiter=self.name, decision="rejected")
+            raise TooManyRequestsException(retry_after=retry_after)
+
+        decisions.inc(limiter=self.name, decision="allowed")
+
+
+def _create_backend():
+    if settings.AUTH_RATE_LIMIT_BACKEND == "redis":
+        return RedisBucketBackend(settings.REDIS_URL)
+    if settings.AUTH_RATE_LIMIT_BACKEND != "memory":
+        raise ValueError(f"Unknown rate limit backend: {settings.AUTH_RATE_LIMIT_BACKEND}")
+    return InMemoryBucketBackend()
+
+
+_backend = None
+_ip_limiter: Optional[TokenBucketLimiter] = None
+_email_limiter: Optional[TokenBucketLimiter] = None
+
+
+def get_client_ip(request: Request) -> str:
+    """Client address, honouring X-Forwarded-For only when configured to trust it"""
+    if settings.AUTH_RATE_LIMIT_TRUST_FORWARDED:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
+async def enforce_auth_rate_limit(request: Request, email: str):
+    """Admission control for login/registration, run before any database or bcrypt work"""
+    global _backend, _ip_limiter, _email_limiter
+
+    if not settings.AUTH_RATE_LIMIT_ENABLED:
+        return
+
+    if _backend is None:
+        _backend = _create_backend()
+        _ip_limiter = TokenBucketLimiter(
+            "auth_ip", settings.AUTH_RATE_LIMIT_IP_BURST, settings.AUTH_RATE_LIMIT_IP_PER_MINUTE, _backend
+        )
+        _email_limiter = TokenBucketLimiter(
+            "auth_email", settings.AUTH_RATE_LIMIT_EMAIL_BURST, settings.AUTH_RATE_LIMIT_EMAIL_PER_MINUTE, _backend
+        )
+
+    await _ip_limiter.check(get_client_ip(request))
+    await _email_limiter.check(email.strip().lower())
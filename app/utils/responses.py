@@ -0,0 +1,55 @@
+from typing import Any, Dict, List, Optional, Type
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import BaseModel, TypeAdapter
+from app.config import settings
+
+_list_adapters: Dict[type, TypeAdapter] = {}
+
+
+def dump_model_json(content: Any) -> Optional[bytes]:
+    """
+    JSON bytes for a Pydantic model or a list of one model type, written by
+    pydantic-core's serializer without building dicts first; None for anything else
+    """
+    if isinstance(content, BaseModel):
+        return content.__pydantic_serializer__.to_json(content)
+    if isinstance(content, list) and content and isinstance(content[0], BaseModel):
+        model = type(content[0])
+        adapter = _list_adapters.get(model)
+        if adapter is None:
+            adapter = _list_adapters[model] = TypeAdapter(List[model])
+        return adapter.dump_json(content)
+    return None
+
+
+class _ModelRendering:
+    def render(self, content: Any) -> bytes:
+        body = dump_model_json(content)
+        return body if body is not None else super().render(content)
+
+
+class FastJSONResponse(_ModelRendering, ORJSONResponse):
+    """Models through their compiled serializer, everything else through orjson"""
+
+
+class StandardJSONResponse(_ModelRendering, JSONResponse):
+    """Models through their compiled serializer, everything else through the json module"""
+
+
+def json_response_class(name: Optional[str] = None) -> Type[JSONResponse]:
+    """Response class for JSON_RESPONSE: "orjson" (needs the orjson package) or "standard" """
+    if (name or settings.JSON_RESPONSE) == "orjson":
+        import orjson  # noqa: F401 - fail at startup, not on the first request
+        return FastJSONResponse
+    return StandardJSONResponse
+
+
+DefaultJSONResponse = json_response_class()
+
+
+def model_response(content: Any, status_code: int = 200) -> JSONResponse:
+    """
+    Return from an endpoint with an already-built response model (or list of them)
+    to skip FastAPI's second validation pass and jsonable_encoder dict copy
+    """
+    return DefaultJSONResponse(content, status_code=status_code)
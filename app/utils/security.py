@@ -3,6 +3,7 @@ from typing import Optional, Dict, Any
 from jose import JWTError, jwt
 import bcrypt
 from app.config import settings
+from app.utils.password_hasher import password_hasher
 
 
 def hash_password(password: str) -> str:
@@ -27,6 +28,16 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(password_bytes, hashed_password.encode('utf-8'))
 
 
+async def hash_password_async(password: str) -> str:
+    """Hash a plain password in the password hasher pool"""
+    return await password_hasher.run("hash", hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password in the password hasher pool"""
+    return await password_hasher.run("verify", verify_password, plain_password, hashed_password)
+
+
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token"""
     to_encode = data.copy()
@@ -47,6 +58,11 @@ def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta]
     return encoded_jwt
 
 
+def create_user_access_token(user) -> str:
+    """Create an access token carrying the identity claims routers need"""
+    return create_access_token(data={"sub": str(user.id), "username": user.username})
+
+
 def verify_token(token: str) -> Dict[str, Any]:
     """Verify and decode a JWT token"""
     try:
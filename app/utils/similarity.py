@@ -0,0 +1,131 @@
+import random
+import re
+import zlib
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Hashable, List, Optional, Set, Tuple
+
+_MASK_64 = (1 << 64) - 1
+_NON_WORD = re.compile(r"[^a-z0-9 ]+")
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace"""
+    text = _NON_WORD.sub(" ", text.lower())
+    return _SPACES.sub(" ", text).strip()
+
+
+def shingles(text: str, size: int = 4) -> FrozenSet[str]:
+    """Character shingles of the normalized text"""
+    normalized = normalize_text(text)
+    if len(normalized) <= size:
+        return frozenset([normalized])
+    return frozenset(normalized[i:i + size] for i in range(len(normalized) - size + 1))
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class MinHasher:
+    """MinHash signatures over shingle sets using multiply-shift hashing"""
+
+    def __init__(self, num_perm: int = 32, seed: int = 1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self._perms = [(rng.getrandbits(64) | 1, rng.getrandbits(64)) for _ in range(num_perm)]
+
+    def signature(self, shingle_set: FrozenSet[str]) -> Tuple[int, ...]:
+        hashes = [zlib.crc32(s.encode("utf-8")) for s in shingle_set]
+        return tuple(
+            min([(a * h + b) & _MASK_64 for h in hashes]) >> 32
+            for a, b in self._perms
+        )
+
+
+class SimilarityIndex:
+    """
+    LSH index answering "is there a stored text with Jaccard similarity >= threshold?".
+    Banding finds candidates; candidates are confirmed with exact Jaccard on shingles.
+    Holds at most max_items entries, evicting the oldest.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.6,
+        num_perm: int = 32,
+        bands: int = 16,
+        max_items: Optional[int] = None,
+        hasher: Optional[MinHasher] = None
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.max_items = max_items
+        self.hasher = hasher or MinHasher(num_perm)
+        self._items: "OrderedDict[Hashable, Tuple[FrozenSet[str], List[Tuple[int, ...]]]]" = OrderedDict()
+        self._buckets: List[Dict[Tuple[int, ...], Set[Hashable]]] = [{} for _ in range(bands)]
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._items
+
+    def bands_for(self, shingle_set: FrozenSet[str]) -> List[Tuple[int, ...]]:
+        """LSH band keys; reusable across indexes sharing the same hasher and band layout"""
+        signature = self.hasher.signature(shingle_set)
+        return [signature[i * self.rows:(i + 1) * self.rows] for i in range(self.bands)]
+
+    def find(
+        self,
+        text: str,
+        shingle_set: Optional[FrozenSet[str]] = None,
+        bands: Optional[List[Tuple[int, ...]]] = None
+    ) -> Optional[Hashable]:
+        """Key of a stored near-duplicate of text, or None"""
+        shingle_set = shingle_set if shingle_set is not None else shingles(text)
+        bands = bands if bands is not None else self.bands_for(shingle_set)
+        candidates: Set[Hashable] = set()
+        for bucket, band in zip(self._buckets, bands):
+            candidates.update(bucket.get(band, ()))
+
+        for key in candidates:
+            if jaccard(shingle_set, self._items[key][0]) >= self.threshold:
+                return key
+        return None
+
+    def add(
+        self,
+        key: Hashable,
+        text: str,
+        shingle_set: Optional[FrozenSet[str]] = None,
+        bands: Optional[List[Tuple[int, ...]]] = None
+    ):
+        if key in self._items:
+            self.remove(key)
+
+        shingle_set = shingle_set if shingle_set is not None else shingles(text)
+        bands = bands if bands is not None else self.bands_for(shingle_set)
+        self._items[key] = (shingle_set, bands)
+        for bucket, band in zip(self._buckets, bands):
+            bucket.setdefault(band, set()).add(key)
+
+        if self.max_items is not None and len(self._items) > self.max_items:
+            self.remove(next(iter(self._items)))
+
+    def remove(self, key: Hashable):
+        entry = self._items.pop(key, None)
+        if entry is None:
+            return
+        for bucket, band in zip(self._buckets, entry[1]):
+            keys = bucket.get(band)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del bucket[band]
@@ -1,36 +1,46 @@
+import asyncio
 import socketio
 from sqlalchemy.orm import Session
-from app.database import SessionLocal
+from app.config import settings
+from app.database import session_scope
 from app.utils.security import verify_token
 from app.services.room_service import RoomService
 from app.services.game_service import GameService
-from app.services.ai_service import AIService
+from app.services.question_pool import question_pool
+from app.services.question_feed import question_feeds
+from app.services.question_dedup import question_deduplicator
+from app.services.round_summary import round_summaries
+from app.services.drain import drain
+from app.services.ai_metrics import attribute_room
+from app.services.ai_client import Priority, set_priority
 from app.utils.logger import get_logger
+from app.utils.db_routing import set_actor
+from app.utils.instrumentation import connected_sids, instrument_event
 from app.models.round import RoundStatus
 
 logger = get_logger(__name__)
 
+# Follow-up emits scheduled by handlers, kept referenced until they finish
+_background_tasks = set()
+
 # Create Socket.IO server
 sio = socketio.AsyncServer(
     async_mode='asgi',
     cors_allowed_origins='*',
-    logger=True,
+    logger=settings.SOCKETIO_LOGGER,
     engineio_logger=False
 )
 
 
-def get_db():
-    """Get database session"""
-    db = SessionLocal()
-    try:
-        return db
-    finally:
-        db.close()
-
-
 @sio.event
-async def connect(sid, environ, auth):
+@instrument_event
+async def connect(sid, environ, auth=None):
     """Handle client connection with JWT authentication"""
+    if drain.draining:
+        # socket.io clients don't retry a refused connect on their own; the
+        # frontend recognises this reason and reconnects with backoff
+        raise socketio.exceptions.ConnectionRefusedError('server_draining')
+
     try:
         token = None
 
@@ -49,48 +59,52 @@ async def connect(sid, environ, auth):
                 token = cookies.get('access_token')
 
         if not token:
-            logger.warning(f"Connection attempt without token: {sid}")
+            logger.warning("Connection attempt without token: %s", sid)
             return False
 
         payload = verify_token(token)
         user_id = payload.get('sub')
 
         if not user_id:
-            logger.warning(f"Invalid token payload: {sid}")
+            logger.warning("Invalid token payload: %s", sid)
             return False
 
         # Save user session
-        await sio.save_session(sid, {'user_id': user_id})
-        logger.info(f"User {user_id} connected: {sid}")
+        await sio.save_session(sid, {'user_id': user_id, 'username': payload.get('username')})
+        connected_sids.inc()
+        logger.info("User %s connected: %s", user_id, sid)
 
         return True
 
     except Exception as e:
-        logger.error(f"Connection error: {str(e)}")
+        logger.error("Connection error: %s", e)
         return False
 
 
 @sio.event
+@instrument_event
 async def disconnect(sid):
     """Handle client disconnection"""
+    connected_sids.dec()
     try:
         session = await sio.get_session(sid)
         user_id = session.get('user_id')
-        logger.info(f"User {user_id} disconnected: {sid}")
+        logger.info("User %s disconnected: %s", user_id, sid)
     except:
-        logger.info(f"Client disconnected: {sid}")
+        logger.info("Client disconnected: %s", sid)
 
 
 @sio.event
+@instrument_event
 async def join_room(sid, data):
     """Join a game room"""
     try:
         session = await sio.get_session(sid)
         user_id = session['user_id']
+        set_actor(user_id)
         room_code = data['room_code']
 
-        db = SessionLocal()
-        try:
+        with session_scope() as db:
             room = RoomService.get_room(room_code, db)
             participants = RoomService.get_room_participants(room.id, db)
 
@@ -103,24 +117,27 @@ async def join_room(sid, data):
                 'participant_count': len(participants)
             }, room=room_code)
 
-            logger.info(f"User {user_id} joined room {room_code}")
+            # Current phase from the database, so a client moved here by a drain
+            # (or a reload) picks the game up where it was
+            await sio.emit('game_state', GameService.get_game_state(room, db), to=sid)
 
-            return {'success': True, 'room': room_code}
+            logger.info("User %s joined room %s", user_id, room_code)
 
-        finally:
-            db.close()
+            return {'success': True, 'room': room_code}
 
     except Exception as e:
-        logger.error(f"Error joining room: {str(e)}")
+        logger.error("Error joining room: %s", e)
         return {'success': False, 'error': str(e)}
 
 
 @sio.event
+@instrument_event
 async def leave_room(sid, data):
     """Leave a game room"""
     try:
         session = await sio.get_session(sid)
         user_id = session['user_id']
+        set_actor(user_id)
         room_code = data['room_code']
 
         # Leave Socket.IO room
@@ -131,33 +148,44 @@ async def leave_room(sid, data):
             'user_id': user_id
         }, room=room_code)
 
-        logger.info(f"User {user_id} left room {room_code}")
+        logger.info("User %s left room %s", user_id, room_code)
 
         return {'success': True}
 
     except Exception as e:
-        logger.error(f"Error leaving room: {str(e)}")
+        logger.error("Error leaving room: %s", e)
         return {'success': False, 'error': str(e)}
 
 
 @sio.event
+@instrument_event
 async def start_game(sid, data):
     """Start the game (host only)"""
     try:
         session = await sio.get_session(sid)
         user_id = session['user_id']
+        set_actor(user_id)
         room_code = data['room_code']
+        attribute_room(room_code)
+
+        if drain.draining:
+            return {'success': False, 'error': 'Server is restarting, try again in a moment'}
 
-        db = SessionLocal()
-        try:
+        with session_scope() as db:
             room = GameService.start_game(room_code, user_id, db)
 
-            # Generate all questions for the game upfront
-            questions = await AIService.generate_questions(room.total_rounds)
+            if settings.AI_STREAM_QUESTIONS:
+                # Start on the first available question; the rest keep streaming in
+                feed = await question_feeds.start(room_code, room.total_rounds)
+                questions = list(feed.questions)
+            else:
+                # Draw all questions for the game from the pre-generated pool
+                questions = await question_pool.get_questions(room.total_rounds, room_code=room_code)
             room.questions = questions
             db.commit()
 
-            logger.info(f"Generated {len(questions)} questions for room {room_code}: {questions}")
+            logger.info("Have %s of %s questions for room %s", len(questions), room.total_rounds, room_code)
+            logger.debug("Questions for room %s: %s", room_code, tuple(questions))
 
             # Start first round with first question
             round_obj = GameService.start_round(room.id, 1, questions[0], db)
@@ -171,63 +199,60 @@ async def start_game(sid, data):
                 'status': 'answering'
             }, room=room_code)
 
-            logger.info(f"Game started in room {room_code}")
+            logger.info("Game started in room %s", room_code)
 
             return {'success': True, 'round_id': str(round_obj.id)}
 
-        finally:
-            db.close()
-
     except Exception as e:
-        logger.error(f"Error starting game: {str(e)}")
+        logger.error("Error starting game: %s", e)
         return {'success': False, 'error': str(e)}
 
 
 @sio.event
+@instrument_event
 async def submit_answer(sid, data):
     """Submit answer for current round"""
     try:
         session = await sio.get_session(sid)
         user_id = session['user_id']
+        set_actor(user_id)
         round_id = data['round_id']
         answer_content = data['answer']
         room_code = data['room_code']
 
-        db = SessionLocal()
-        try:
+        with session_scope() as db:
             answer = GameService.submit_answer(round_id, user_id, answer_content, db)
 
             # Get submission count
-            answers = GameService.get_round_answers(round_id, db)
+            submitted_count = GameService.count_round_answers(round_id, db)
 
             # Notify room (without revealing answer content)
             await sio.emit('answer_submitted', {
-                'submitted_count': len(answers)
+                'submitted_count': submitted_count
             }, room=room_code)
 
-            logger.info(f"Answer submitted by user {user_id}")
+            logger.info("Answer submitted by user %s", user_id)
 
             return {'success': True, 'answer_id': str(answer.id)}
 
-        finally:
-            db.close()
-
     except Exception as e:
-        logger.error(f"Error submitting answer: {str(e)}")
+        logger.error("Error submitting answer: %s", e)
         return {'success': False, 'error': str(e)}
 
 
 @sio.event
+@instrument_event
 async def start_voting(sid, data):
     """Transition to voting phase"""
     try:
         session = await sio.get_session(sid)
         user_id = session['user_id']
+        set_actor(user_id)
         round_id = data['round_id']
         room_code = data['room_code']
+        attribute_room(room_code)
 
-        db = SessionLocal()
-        try:
+        with session_scope() as db:
             # Verify user is host
             room = RoomService.get_room(room_code, db)
             if str(room.host_id) != user_id:
@@ -237,13 +262,10 @@ async def start_voting(sid, data):
             answers = GameService.get_round_answers(round_id, db)
 
             # Prepare anonymized answers
-            answer_list = [
-                {
-                    'id': str(ans.id),
-                    'content': ans.content
-                }
-                for ans in answers
-            ]
+            answer_list = [ans.to_dict() for ans in answers]
+
+            # Answers are frozen now, so the summary can be written during voting
+            round_summaries.start(round_id, [ans.content for ans in answers])
 
             # Broadcast to room
             await sio.emit('voting_started', {
@@ -252,30 +274,28 @@ async def start_voting(sid, data):
                 'time_limit': 45
             }, room=room_code)
 
-            logger.info(f"Voting started for round {round_id}")
+            logger.info("Voting started for round %s", round_id)
 
             return {'success': True}
 
-        finally:
-            db.close()
-
     except Exception as e:
-        logger.error(f"Error starting voting: {str(e)}")
+        logger.error("Error starting voting: %s", e)
         return {'success': False, 'error': str(e)}
 
 
 @sio.event
+@instrument_event
 async def submit_vote(sid, data):
     """Submit vote for an answer"""
     try:
         session = await sio.get_session(sid)
         user_id = session['user_id']
+        set_actor(user_id)
         round_id = data['round_id']
         answer_id = data['answer_id']
         room_code = data['room_code']
 
-        db = SessionLocal()
-        try:
+        with session_scope() as db:
             vote = GameService.submit_vote(round_id, user_id, answer_id, db)
 
             # Get updated vote count
@@ -287,29 +307,27 @@ async def submit_vote(sid, data):
                 'vote_count': vote_count
             }, room=room_code)
 
-            logger.info(f"Vote submitted by user {user_id}")
+            logger.info("Vote submitted by user %s", user_id)
 
             return {'success': True, 'vote_id': str(vote.id)}
 
-        finally:
-            db.close()
-
     except Exception as e:
-        logger.error(f"Error submitting vote: {str(e)}")
+        logger.error("Error submitting vote: %s", e)
         return {'success': False, 'error': str(e)}
 
 
 @sio.event
+@instrument_event
 async def end_round(sid, data):
     """End current round and show results"""
     try:
         session = await sio.get_session(sid)
         user_id = session['user_id']
+        set_actor(user_id)
         round_id = data['round_id']
         room_code = data['room_code']
 
-        db = SessionLocal()
-        try:
+        with session_scope() as db:
             room = RoomService.get_room(room_code, db)
 
             # Verify user is host
@@ -317,43 +335,66 @@ async def end_round(sid, data):
                 return {'success': False, 'error': 'Only host can end round'}
 
             round_obj = GameService.end_round(round_id, db)
-            leaderboard = GameService.get_leaderboard(room.id, db)
+            leaderboard = [entry.to_dict() for entry in GameService.get_leaderboard(room.id, db)]
 
-            # Broadcast results
+            summary = round_summaries.get(round_id, round_obj.summary)
+
+            # Broadcast results (the summary follows separately if it isn't ready yet)
             await sio.emit('round_ended', {
                 'round_number': round_obj.round_number,
-                'leaderboard': leaderboard
+                'leaderboard': leaderboard,
+                'summary': summary
             }, room=room_code)
 
+            if summary is None and round_summaries.pending(round_id):
+                task = asyncio.create_task(emit_round_summary(room_code, round_id, round_obj.round_number))
+                _background_tasks.add(task)
+                task.add_done_callback(_background_tasks.discard)
+
             # Check if game should end
             if room.current_round >= room.total_rounds:
                 GameService.end_game(room.id, db)
+                question_deduplicator.forget_room(room_code)
+                question_feeds.discard(room_code)
                 await sio.emit('game_ended', {
                     'final_leaderboard': leaderboard
                 }, room=room_code)
 
-            logger.info(f"Round {round_id} ended")
+            logger.info("Round %s ended", round_id)
 
             return {'success': True}
 
-        finally:
-            db.close()
-
     except Exception as e:
-        logger.error(f"Error ending round: {str(e)}")
+        logger.error("Error ending round: %s", e)
         return {'success': False, 'error': str(e)}
 
 
+async def emit_round_summary(room_code: str, round_id: str, round_number: int):
+    """Push a round's summary to the room once its background generation completes"""
+    summary = await round_summaries.wait(round_id, timeout=settings.AI_DEADLINE_ROUND_SUMMARY)
+    if summary is None:
+        return
+
+    await sio.emit('round_summary', {
+        'round_id': round_id,
+        'round_number': round_number,
+        'summary': summary
+    }, room=room_code)
+
+
 @sio.event
+@instrument_event
 async def next_round(sid, data):
     """Start next round"""
     try:
         session = await sio.get_session(sid)
         user_id = session['user_id']
+        set_actor(user_id)
         room_code = data['room_code']
+        attribute_room(room_code)
+        set_priority(Priority.FALLBACK)
 
-        db = SessionLocal()
-        try:
+        with session_scope() as db:
             room = RoomService.get_room(room_code, db)
 
             # Verify user is host
@@ -362,12 +403,18 @@ async def next_round(sid, data):
 
             # Get next question from pre-generated questions
             next_round_num = room.current_round + 1
+            question = None
             if room.questions and len(room.questions) >= next_round_num:
                 question = room.questions[next_round_num - 1]  # 0-indexed
             else:
+                # Questions may still be streaming in on this worker
+                question = await question_feeds.wait_for_question(room_code, next_round_num)
+
+            if question is None:
                 # Fallback if questions weren't generated properly
-                logger.warning(f"No pre-generated question for round {next_round_num}, generating new one")
-                question = await AIService.generate_question()
+                logger.warning("No pre-generated question for round %s, drawing a new one", next_round_num)
+                question_deduplicator.seed_room(room_code, room.questions or [])
+                question = (await question_pool.get_questions(1, room_code=room_code))[0]
 
             round_obj = GameService.start_round(room.id, next_round_num, question, db)
 
@@ -379,13 +426,10 @@ async def next_round(sid, data):
                 'time_limit': 60
             }, room=room_code)
 
-            logger.info(f"Round {round_obj.round_number} started in room {room_code}")
+            logger.info("Round %s started in room %s", round_obj.round_number, room_code)
 
             return {'success': True, 'round_id': str(round_obj.id)}
 
-        finally:
-            db.close()
-
     except Exception as e:
-        logger.error(f"Error starting next round: {str(e)}")
+        logger.error("Error starting next round: %s", e)
         return {'success': False, 'error': str(e)}
\ No newline at end of file
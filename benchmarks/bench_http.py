@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Benchmark requests/sec for the heaviest REST endpoints
+
+Seeds a room with --players players, each with an answer and a score, then calls
+the leaderboard, answer list and room detail endpoints in-process (httpx ASGI
+transport, so no sockets or uvicorn) for --seconds each. Every endpoint is timed
+twice: as the routers ship it, and through a copy that returns the same response
+models the previous way (FastAPI validates them again, runs jsonable_encoder and
+encodes with the json module). The room detail copy also skips the body cache.
+
+Usage: python benchmarks/bench_http.py [--players 8,100,1000] [--seconds 3] [--output results.json]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+import uuid
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import APIRouter, Depends, FastAPI
+from fastapi.responses import JSONResponse
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import insert
+from benchmarks.common import make_session_factory
+from app.api import game, rooms
+from app.database import get_db
+from app.dependencies import get_current_principal
+from app.models.answer import Answer
+from app.models.room import Room, RoomParticipant, RoomStatus
+from app.models.round import Round, RoundStatus
+from app.models.score import Score
+from app.models.user import User
+from app.schemas.game import AnswerResponse, LeaderboardResponse, ScoreResponse
+from app.schemas.records import Principal
+from app.schemas.room import RoomDetailResponse, RoomResponse
+from app.schemas.user import UserInRoom
+from app.services.game_service import GameService
+from app.services.room_service import RoomService
+from app.utils.responses import DefaultJSONResponse
+
+FAKE_HASH = "$2b$12$" + "x" * 53
+
+
+def seed(session_factory, players: int):
+    """One active room with an answered round and a score per player"""
+    db = session_factory()
+    try:
+        users = [
+            {"id": uuid.uuid4(), "email": f"p{i}@bench.test", "username": f"player{i}", "password_hash": FAKE_HASH}
+            for i in range(players)
+        ]
+        db.execute(insert(User), users)
+        room_id, round_id = uuid.uuid4(), uuid.uuid4()
+        db.execute(insert(Room), [{
+            "id": room_id, "code": "BENCH1", "host_id": users[0]["id"], "status": RoomStatus.ACTIVE,
+            "max_players": players, "total_rounds": 5, "current_round": 1,
+        }])
+        db.execute(insert(RoomParticipant), [{"room_id": room_id, "user_id": u["id"]} for u in users])
+        db.execute(insert(Round), [{
+            "id": round_id, "room_id": room_id, "round_number": 1,
+            "question": "Name a bad superhero", "status": RoundStatus.VOTING,
+        }])
+        db.execute(insert(Answer), [
+            {"id": uuid.uuid4(), "round_id": round_id, "user_id": u["id"], "content": f"Captain {u['username']}"}
+            for u in users
+        ])
+        db.execute(insert(Score), [
+            {"room_id": room_id, "user_id": u["id"], "round_id": round_id, "points": i % 7}
+            for i, u in enumerate(users)
+        ])
+        db.commit()
+        return users[0], round_id
+    finally:
+        db.close()
+
+
+def previous_router() -> APIRouter:
+    """The same endpoints returning models for FastAPI to validate and encode, as before"""
+    router = APIRouter(prefix="/previous")
+
+    @router.get("/leaderboard/{room_code}", response_model=LeaderboardResponse)
+    async def leaderboard(room_code: str, current_user: Principal = Depends(get_current_principal), db=Depends(get_db)):
+        room = RoomService.get_room(room_code, db)
+        return LeaderboardResponse(scores=[
+            ScoreResponse(user_id=e.user_id, username=e.username, total_points=e.score, round_points=0)
+            for e in GameService.get_leaderboard(room.id, db)
+        ])
+
+    @router.get("/answers/{round_id}", response_model=List[AnswerResponse])
+    async def answers(round_id: uuid.UUID, current_user: Principal = Depends(get_current_principal), db=Depends(get_db)):
+        vote_counts = GameService.get_round_vote_counts(round_id, db)
+        return [
+            AnswerResponse(id=a.id, content=a.content, vote_count=vote_counts.get(a.id, 0),
+                           is_own_answer=(a.user_id == current_user.id))
+            for a in GameService.get_round_answers(round_id, db)
+        ]
+
+    @router.get("/rooms/{room_code}", response_model=RoomDetailResponse)
+    async def room_detail(room_code: str, current_user: Principal = Depends(get_current_principal), db=Depends(get_db)):
+        room = RoomService.get_room(room_code, db)
+        participants = RoomService.get_room_participants(room.id, db)
+        return RoomDetailResponse(
+            **RoomResponse.model_validate(room).model_dump(),
+            participants=[UserInRoom.model_validate(p) for p in participants],
+            participant_count=len(participants)
+        )
+
+    return router
+
+
+def build_app(session_factory, principal: Principal) -> FastAPI:
+    def session():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI(default_response_class=DefaultJSONResponse)
+    app.include_router(game.router)
+    app.include_router(rooms.router)
+    app.include_router(previous_router(), default_response_class=JSONResponse)
+    app.dependency_overrides[get_db] = session
+    app.dependency_overrides[get_current_principal] = lambda: principal
+    return app
+
+
+async def requests_per_second(client: AsyncClient, path: str, seconds: float) -> float:
+    assert (await client.get(path)).status_code == 200
+    count = 0
+    started = time.perf_counter()
+    while time.perf_counter() - started < seconds:
+        await client.get(path)
+        count += 1
+    return count / (time.perf_counter() - started)
+
+
+async def run(players: int, seconds: float):
+    session_factory = make_session_factory("sqlite:///file:bench_http?mode=memory&cache=shared&uri=true")
+    host, round_id = seed(session_factory, players)
+    app = build_app(session_factory, Principal(host["id"], host["username"]))
+
+    cases = [
+        ("leaderboard", "/api/game/BENCH1/leaderboard", "/previous/leaderboard/BENCH1"),
+        ("answers", f"/api/game/rounds/{round_id}/answers", f"/previous/answers/{round_id}"),
+        ("room_detail", "/api/rooms/BENCH1", "/previous/rooms/BENCH1"),
+    ]
+    results = {}
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        for name, current, previous in cases:
+            results[name] = {
+                "previous_rps": round(await requests_per_second(client, previous, seconds), 1),
+                "current_rps": round(await requests_per_second(client, current, seconds), 1),
+            }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--players", default="8,100,1000", help="comma-separated room sizes")
+    parser.add_argument("--seconds", type=float, default=3.0, help="time per endpoint and variant")
+    parser.add_argument("--output", help="write results as JSON")
+    parser.add_argument("--log-level", default="WARNING", help="app log level while benchmarking")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(args.log_level)
+
+    all_results = {}
+    print(f"{'endpoint':>12} {'players':>8} {'previous req/s':>15} {'current req/s':>14} {'speedup':>8}")
+    for players in [int(p) for p in args.players.split(",")]:
+        results = asyncio.run(run(players, args.seconds))
+        all_results[str(players)] = results
+        for name, r in results.items():
+            print(f"{name:>12} {players:>8} {r['previous_rps']:>15.1f} {r['current_rps']:>14.1f} "
+                  f"{r['current_rps'] / r['previous_rps']:>7.2f}x")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(all_results, f, indent=2)
+            f.write("\n")
+
+
+if __name__ == "__main__":
+    main()
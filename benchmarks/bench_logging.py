@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark the cost a log call adds to the calling thread (the event loop in production)
+
+Compares the previous setup (DEBUG-level StreamHandler writing synchronously, eager
+f-strings) with the queue pipeline in app.utils.logger: lazy %-style arguments,
+formatting and I/O on the listener thread, optional sampling, and calls below the
+level threshold. Output goes to --output (default /dev/null) so terminal speed does
+not dominate.
+
+Usage: python benchmarks/bench_logging.py [--calls 100000] [--output /dev/null]
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.logger import TextFormatter, configure_logging, shutdown_logging
+
+logger = logging.getLogger("app.services.game_service")
+
+
+def eager(voter_id, answer_id):
+    logger.info(f"Vote submitted by user {voter_id} for answer {answer_id}")
+
+
+def lazy(voter_id, answer_id):
+    logger.info("Vote submitted by user %s for answer %s", voter_id, answer_id)
+
+
+def below_level(voter_id, answer_id):
+    logger.debug("Vote submitted by user %s for answer %s", voter_id, answer_id)
+
+
+def time_calls(fn, calls: int) -> float:
+    """Mean seconds per call on this thread"""
+    voter_id, answer_id = uuid.uuid4(), uuid.uuid4()
+    started = time.perf_counter()
+    for _ in range(calls):
+        fn(voter_id, answer_id)
+    return (time.perf_counter() - started) / calls
+
+
+def synchronous(stream):
+    """The previous configuration: formatting and writes on the caller's thread"""
+    shutdown_logging()
+    root = logging.getLogger()
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(TextFormatter())
+    root.addHandler(handler)
+    root.setLevel(logging.DEBUG)
+    return lambda: root.removeHandler(handler)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=100000)
+    parser.add_argument("--output", default=os.devnull)
+    args = parser.parse_args()
+
+    with open(args.output, "w") as stream:
+        variants = [
+            ("sync text, f-string", lambda: synchronous(stream), eager),
+            ("sync text, lazy", lambda: synchronous(stream), lazy),
+            ("queue json, f-string", lambda: configure_logging("INFO", "json", {}, args.calls + 1, stream), eager),
+            ("queue json, lazy", lambda: configure_logging("INFO", "json", {}, args.calls + 1, stream), lazy),
+            ("queue json, 10% sampled", lambda: configure_logging(
+                "INFO", "json", {"app.services": 0.1}, args.calls + 1, stream), lazy),
+            ("queue json, below level", lambda: configure_logging("INFO", "json", {}, args.calls + 1, stream), below_level),
+        ]
+
+        print(f"{'variant':>26} {'caller us/call':>15} {'drain ms':>10}")
+        for name, setup, fn in variants:
+            teardown = setup()
+            per_call = time_calls(fn, args.calls)
+            started = time.perf_counter()
+            if callable(teardown):
+                teardown()
+            else:
+                shutdown_logging()
+            drain = time.perf_counter() - started
+            print(f"{name:>26} {per_call * 1e6:>15.2f} {drain * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark event-loop latency for socket-style work during a login flood
+
+A ticker task stands in for Socket.IO handlers: it wakes every --tick-ms and
+records how late it ran. Meanwhile --logins concurrent password checks run
+either inline on the loop (the old behaviour) or through the hasher pool.
+
+Usage: python benchmarks/bench_login_flood.py [--logins 16] [--executor process]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.password_hasher import PasswordHasherPool
+from app.utils.security import hash_password, verify_password
+
+
+async def ticker(interval: float, lags: list, stop: asyncio.Event):
+    expected = time.perf_counter() + interval
+    while not stop.is_set():
+        await asyncio.sleep(interval)
+        now = time.perf_counter()
+        lags.append(max(0.0, now - expected))
+        expected = now + interval
+
+
+async def login_inline(password: str, hashed: str) -> bool:
+    return verify_password(password, hashed)
+
+
+def make_pooled_login(pool: PasswordHasherPool):
+    async def login(password: str, hashed: str) -> bool:
+        return await pool.run("verify", verify_password, password, hashed)
+    return login
+
+
+async def flood(login, logins: int, tick: float, hashed: str):
+    lags = []
+    stop = asyncio.Event()
+    tick_task = asyncio.create_task(ticker(tick, lags, stop))
+    await asyncio.sleep(tick * 5)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(login("password123", hashed) for _ in range(logins)))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await tick_task
+    return elapsed, lags
+
+
+def summarize(name: str, elapsed: float, lags: list):
+    lags_ms = sorted(lag * 1000 for lag in lags) or [0.0]
+    p99 = lags_ms[min(len(lags_ms) - 1, int(len(lags_ms) * 0.99))]
+    print(
+        f"{name:>8}: flood {elapsed * 1000:8.1f} ms | loop lag p50 {statistics.median(lags_ms):7.2f} ms"
+        f" p99 {p99:7.2f} ms max {lags_ms[-1]:7.2f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=16)
+    parser.add_argument("--tick-ms", type=float, default=10.0)
+    parser.add_argument("--executor", default="process", choices=["process", "thread"])
+    parser.add_argument("--workers", type=int, default=2)
+    args = parser.parse_args()
+
+    hashed = hash_password("password123")
+    tick = args.tick_ms / 1000
+
+    elapsed, lags = asyncio.run(flood(login_inline, args.logins, tick, hashed))
+    summarize("inline", elapsed, lags)
+
+    pool = PasswordHasherPool(args.executor, max_workers=args.workers, max_concurrency=args.workers)
+    try:
+        elapsed, lags = asyncio.run(flood(make_pooled_login(pool), args.logins, tick, hashed))
+    finally:
+        pool.shutdown()
+    summarize("pooled", elapsed, lags)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark participant list reads: full ORM User rows vs projected records
+
+Usage: python benchmarks/bench_participants.py [--sizes 8,100,1000] [--repeat 50]
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import make_session_factory, measure
+from app.models.user import User
+from app.models.room import Room, RoomParticipant, RoomStatus
+from app.services.room_service import RoomService
+
+FAKE_HASH = "$2b$12$" + "x" * 53
+
+
+def seed_room(session_factory, size: int):
+    """Create a room with `size` participants and return its id"""
+    db = session_factory()
+    try:
+        users = [
+            User(email=f"user{i}@example.com", username=f"user{i}", password_hash=FAKE_HASH)
+            for i in range(size)
+        ]
+        db.add_all(users)
+        db.flush()
+
+        room = Room(code=f"B{size:05d}", host_id=users[0].id, max_players=size, status=RoomStatus.WAITING)
+        db.add(room)
+        db.flush()
+
+        db.add_all([RoomParticipant(room_id=room.id, user_id=user.id) for user in users])
+        db.commit()
+        return room.id
+    finally:
+        db.close()
+
+
+def legacy_participants(room_id, db):
+    """Previous implementation: hydrate full User entities"""
+    users = db.query(User).join(
+        RoomParticipant, RoomParticipant.user_id == User.id
+    ).filter(
+        RoomParticipant.room_id == room_id
+    ).all()
+    return [{'id': str(p.id), 'username': p.username} for p in users]
+
+
+def projected_participants(room_id, db):
+    return [p.to_dict() for p in RoomService.get_room_participants(room_id, db)]
+
+
+def run(session_factory, room_id, fn, repeat: int):
+    with measure() as result:
+        for _ in range(repeat):
+            db = session_factory()
+            try:
+                fn(room_id, db)
+            finally:
+                db.close()
+    return result["seconds"] / repeat, result["peak_bytes"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="8,100,1000")
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--database-url", default="sqlite://")
+    args = parser.parse_args()
+
+    print(f"{'size':>6} {'variant':>10} {'ms/call':>10} {'peak KiB':>10}")
+    for size in [int(s) for s in args.sizes.split(",")]:
+        session_factory = make_session_factory(args.database_url)
+        room_id = seed_room(session_factory, size)
+        for name, fn in (("orm", legacy_participants), ("projected", projected_participants)):
+            per_call, peak = run(session_factory, room_id, fn, args.repeat)
+            print(f"{size:>6} {name:>10} {per_call * 1000:>10.3f} {peak / 1024:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Benchmark cold start: app import time and time from process spawn to the first
+successful request
+
+Each run is a fresh interpreter. Import time comes from -X importtime (the
+cumulative figure for app.main). Time to first request spawns uvicorn and polls
+/health until it answers. Importing app.main must not load the modules named by
+--forbid (the model SDK is only loaded once the server is up).
+
+Usage: python benchmarks/bench_startup.py [--runs 5] [--max-import-ms 2500] [--max-first-request-ms 5000]
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def bench_env(tmpdir: str) -> dict:
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tmpdir, 'startup.db')}")
+    env["LOG_LEVEL"] = "WARNING"
+    return env
+
+
+def import_profile(env: dict):
+    """Cumulative app.main import time in ms and the slowest modules by self time"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        fields = [part.strip() for part in line[len("import time:"):].split("|")]
+        if fields[0].isdigit():
+            modules.append((fields[2].strip(), int(fields[0]), int(fields[1])))
+    total = next(cumulative for name, _, cumulative in modules if name == "app.main")
+    slowest = sorted(modules, key=lambda m: m[1], reverse=True)[:10]
+    return total / 1000, [(name, own / 1000) for name, own, _ in slowest]
+
+
+def loaded_modules(env: dict, names):
+    """Which of `names` are in sys.modules after importing app.main"""
+    script = f"import sys, app.main; print(','.join(n for n in {list(names)!r} if n in sys.modules))"
+    output = subprocess.run(
+        [sys.executable, "-c", script], cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    ).stdout.strip()
+    return [name for name in output.split(",") if name]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def first_request(env: dict, timeout: float = 60.0) -> float:
+    """Seconds from spawning uvicorn until /health returns 200"""
+    port = _free_port()
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:socket_app", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            if server.poll() is not None:
+                raise RuntimeError(f"server exited with {server.returncode}")
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - started
+            except OSError:
+                time.sleep(0.01)
+        raise TimeoutError(f"no response within {timeout}s")
+    finally:
+        server.terminate()
+        server.wait(10)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--forbid", default="openai", help="modules app.main must not import")
+    parser.add_argument("--max-import-ms", type=float, default=0, help="fail above this median; 0 disables")
+    parser.add_argument("--max-first-request-ms", type=float, default=0, help="fail above this median; 0 disables")
+    parser.add_argument("--output", help="write results as JSON")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        env = bench_env(tmpdir)
+        imports, slowest = [], []
+        for _ in range(args.runs):
+            total, slowest = import_profile(env)
+            imports.append(total)
+        first = [first_request(env) * 1000 for _ in range(args.runs)]
+        forbidden = loaded_modules(env, [m for m in args.forbid.split(",") if m])
+
+    results = {
+        "import_ms_median": round(statistics.median(imports), 1),
+        "import_ms_min": round(min(imports), 1),
+        "first_request_ms_median": round(statistics.median(first), 1),
+        "first_request_ms_min": round(min(first), 1),
+        "slowest_modules_ms": {name: round(ms, 1) for name, ms in slowest},
+        "forbidden_modules_loaded": forbidden,
+    }
+
+    print(f"import app.main      median {results['import_ms_median']:8.1f} ms  min {results['import_ms_min']:8.1f} ms")
+    print(f"first /health 200    median {results['first_request_ms_median']:8.1f} ms  min {results['first_request_ms_min']:8.1f} ms")
+    print("slowest modules (self time, last run):")
+    for name, ms in slowest:
+        print(f"  {ms:8.1f} ms  {name}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+
+    failures = []
+    if forbidden:
+        failures.append(f"app.main imports {', '.join(forbidden)}")
+    if args.max_import_ms and results["import_ms_median"] > args.max_import_ms:
+        failures.append(f"import {results['import_ms_median']}ms > {args.max_import_ms}ms")
+    if args.max_first_request_ms and results["first_request_ms_median"] > args.max_first_request_ms:
+        failures.append(f"first request {results['first_request_ms_median']}ms > {args.max_first_request_ms}ms")
+    for failure in failures:
+        print(f"REGRESSION {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
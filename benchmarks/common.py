@@ -0,0 +1,48 @@
+"""
+Shared helpers for the benchmark scripts
+"""
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import sessionmaker
+
+
+@compiles(UUID, "sqlite")
+def _compile_uuid_sqlite(type_, compiler, **kw):
+    """Store UUID columns as CHAR(32) when benchmarking against SQLite"""
+    return "CHAR(32)"
+
+
+def make_session_factory(url: str = "sqlite://"):
+    """Create a fresh schema at url and return a session factory bound to it"""
+    from app.database import Base
+    from app import models  # noqa: F401 - register models with Base
+
+    connect_args = {"check_same_thread": False} if url.startswith("sqlite") else {}
+    engine = create_engine(url, connect_args=connect_args)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@contextmanager
+def measure():
+    """Measure wall time (seconds) and peak traced memory (bytes) of a block"""
+    result = {}
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        yield result
+    finally:
+        result["seconds"] = time.perf_counter() - start
+        result["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
@@ -10,6 +10,7 @@ interface GamePlayProps {
   totalRounds: number;
   question: string;
   phase: 'answering' | 'voting' | 'results';
+  snapshot?: any;
   isHost: boolean;
   onLeave: () => void;
 }
@@ -33,6 +34,7 @@ const GamePlay: React.FC<GamePlayProps> = ({
   totalRounds,
   question,
   phase: initialPhase,
+  snapshot,
   isHost,
   onLeave,
 }) => {
@@ -42,6 +44,7 @@ const GamePlay: React.FC<GamePlayProps> = ({
   const [selectedAnswerId, setSelectedAnswerId] = useState<string | null>(null);
   const [hasSubmitted, setHasSubmitted] = useState(false);
   const [leaderboard, setLeaderboard] = useState<LeaderboardEntry[]>([]);
+  const [summary, setSummary] = useState<string | null>(null);
   const [timeLeft, setTimeLeft] = useState<number | null>(null);
   const [error, setError] = useState('');
   const [isProcessing, setIsProcessing] = useState(false);
@@ -62,9 +65,20 @@ const GamePlay: React.FC<GamePlayProps> = ({
     if (initialPhase === 'answering') {
       setHasSubmitted(false);
       setIsProcessing(false);
+      setSummary(null);
     }
   }, [roundId, initialPhase]);
 
+  // Resume mid-round from a game_state snapshot (after a reload or a reconnect to another server)
+  useEffect(() => {
+    const round = snapshot?.round;
+    if (!round) return;
+    setAnswers(round.answers || []);
+    setLeaderboard(snapshot.leaderboard || []);
+    setSummary(round.summary || null);
+    setTimeLeft(round.status === 'answering' || round.status === 'voting' ? round.time_left : null);
+  }, [snapshot]);
+
   useEffect(() => {
     const socket = socketService.getSocket();
     if (!socket) return;
@@ -98,14 +112,21 @@ const GamePlay: React.FC<GamePlayProps> = ({
       console.log('Round ended:', data);
       setPhase('results');
       setLeaderboard(data.leaderboard || []);
+      setSummary(data.summary || null);
       setIsProcessing(false); // Reset processing state
     });
 
+    socket.on('round_summary', (data: any) => {
+      console.log('Round summary:', data);
+      setSummary(data.summary);
+    });
+
     return () => {
       socket.off('answer_submitted');
       socket.off('voting_started');
       socket.off('vote_update');
       socket.off('round_ended');
+      socket.off('round_summary');
     };
   }, []);
 
@@ -329,6 +350,7 @@ const GamePlay: React.FC<GamePlayProps> = ({
             </>
           ) : (
             <>
+              {summary && <p className="round-summary">{summary}</p>}
               <h3>Leaderboard:</h3>
               <div className="leaderboard">
                 {leaderboard.map((entry, index) => (
@@ -13,6 +13,7 @@ interface GameState {
   question?: string;
   timeLimit?: number;
   phase?: 'answering' | 'voting' | 'results';
+  snapshot?: any;
 }
 
 const Room: React.FC = () => {
@@ -32,7 +33,8 @@ const Room: React.FC = () => {
       try {
         const response = await roomAPI.get(code);
         setRoom(response.data);
-        setGameState({ status: response.data.status });
+        // Keep a round already restored from game_state if it arrived first
+        setGameState((prev) => (prev.roundId ? prev : { status: response.data.status }));
       } catch (err: any) {
         setError(err.response?.data?.detail || 'Failed to load room');
       } finally {
@@ -118,6 +120,23 @@ const Room: React.FC = () => {
       }));
     });
 
+    // Sent on every join_room; restores the current round after a reload or a
+    // reconnect to another server
+    socket.on('game_state', (data: any) => {
+      console.log('Game state:', data);
+      const round = data.round;
+      if (!round || data.status === 'waiting') return;
+      setGameState({
+        status: 'playing',
+        roundId: round.round_id,
+        roundNumber: round.round_number,
+        question: round.question,
+        timeLimit: round.time_left ?? undefined,
+        phase: round.status === 'answering' || round.status === 'voting' ? round.status : 'results',
+        snapshot: data,
+      });
+    });
+
     socket.on('game_ended', (data: any) => {
       console.log('Game ended:', data);
       // Don't change status - keep showing GamePlay with final scoreboard
@@ -137,6 +156,7 @@ const Room: React.FC = () => {
       socket.off('round_started');
       socket.off('voting_started');
       socket.off('round_ended');
+      socket.off('game_state');
       socket.off('game_ended');
       socket.off('error');
     };
@@ -192,6 +212,7 @@ const Room: React.FC = () => {
         totalRounds={room?.total_rounds || 3}
         question={gameState.question || ''}
         phase={gameState.phase || 'answering'}
+        snapshot={gameState.snapshot}
         isHost={isHost}
         onLeave={handleLeaveRoom}
       />
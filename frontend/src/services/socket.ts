@@ -4,6 +4,10 @@ const SOCKET_URL = process.env.REACT_APP_API_URL || 'http://localhost:8000';
 
 class SocketService {
   private socket: Socket | null = null;
+  // Rooms to rejoin after a reconnect (e.g. when a server worker drains for a deploy)
+  private rooms = new Set<string>();
+  private retryAttempts = 0;
+  private retryTimer: ReturnType<typeof setTimeout> | null = null;
 
   connect(token?: string) {
     if (this.socket?.connected) {
@@ -18,24 +22,55 @@ class SocketService {
 
     this.socket.on('connect', () => {
       console.log('Socket connected:', this.socket?.id);
+      this.retryAttempts = 0;
+      this.rooms.forEach((roomCode) => {
+        this.socket?.emit('join_room', { room_code: roomCode });
+      });
     });
 
-    this.socket.on('disconnect', () => {
-      console.log('Socket disconnected');
+    this.socket.on('disconnect', (reason) => {
+      console.log('Socket disconnected:', reason);
+      // The server closed the connection (draining); the client won't retry on its own
+      if (reason === 'io server disconnect') {
+        this.socket?.connect();
+      }
+    });
+
+    // Server is draining: reconnect at a random point in the window so players
+    // don't all hit the remaining workers at once
+    this.socket.on('server_draining', (data: { reconnect_within_ms: number }) => {
+      const delay = Math.random() * (data?.reconnect_within_ms || 0);
+      setTimeout(() => {
+        this.socket?.disconnect().connect();
+      }, delay);
     });
 
     this.socket.on('connect_error', (error) => {
       console.error('Socket connection error:', error);
+      // A draining worker refuses the connect and the client won't retry by
+      // itself; back off (with jitter) until a worker that is staying up accepts
+      if (error.message === 'server_draining' && this.rooms.size > 0) {
+        const backoff = Math.min(30000, 500 * 2 ** this.retryAttempts++);
+        this.retryTimer = setTimeout(() => {
+          this.retryTimer = null;
+          this.socket?.connect();
+        }, backoff / 2 + Math.random() * backoff / 2);
+      }
     });
 
     return this.socket;
   }
 
   disconnect() {
+    if (this.retryTimer) {
+      clearTimeout(this.retryTimer);
+      this.retryTimer = null;
+    }
     if (this.socket) {
       this.socket.disconnect();
       this.socket = null;
     }
+    this.rooms.clear();
   }
 
   getSocket(): Socket | null {
@@ -44,10 +79,12 @@ class SocketService {
 
   // Room events
   joinRoom(roomCode: string) {
+    this.rooms.add(roomCode);
     this.socket?.emit('join_room', { room_code: roomCode });
   }
 
   leaveRoom(roomCode: string) {
+    this.rooms.delete(roomCode);
     this.socket?.emit('leave_room', { room_code: roomCode });
   }
 
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Import, export and inspect the local question corpus
+
+    python scripts/question_corpus.py stats
+    python scripts/question_corpus.py import questions.txt --category food
+    python scripts/question_corpus.py import --fallbacks
+    python scripts/question_corpus.py export corpus.jsonl
+    python scripts/question_corpus.py pick 5 --category food
+"""
+import sys
+import os
+import argparse
+import json
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import settings
+from app.services.ai_service import FALLBACK_QUESTIONS
+from app.services.question_corpus import QuestionCorpus
+
+
+def read_questions(path: str):
+    """(text, category) pairs from a .txt (one per line), .json list or .jsonl export"""
+    with open(path, encoding="utf-8") as f:
+        if path.endswith(".jsonl"):
+            for line in f:
+                if line.strip():
+                    row = json.loads(line)
+                    yield row["text"], row.get("category")
+        elif path.endswith(".json"):
+            for row in json.load(f):
+                if isinstance(row, str):
+                    yield row, None
+                else:
+                    yield row["text"], row.get("category")
+        else:
+            for line in f:
+                if line.strip():
+                    yield line.strip(), None
+
+
+def import_questions(corpus: QuestionCorpus, args) -> int:
+    if args.fallbacks:
+        return corpus.add(FALLBACK_QUESTIONS, args.category, source="fallback")
+
+    by_category = {}
+    for text, category in read_questions(args.file):
+        by_category.setdefault(args.category or category, []).append(text)
+    return sum(
+        corpus.add(questions, category, source=args.source)
+        for category, questions in by_category.items()
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the local question corpus")
+    parser.add_argument("--path", default=settings.QUESTION_CORPUS_PATH, help="corpus SQLite file")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("stats", help="questions and uses per category")
+
+    import_parser = commands.add_parser("import", help="add questions from a file")
+    import_parser.add_argument("file", nargs="?", help=".txt, .json or .jsonl file")
+    import_parser.add_argument("--category", help="category for every imported question")
+    import_parser.add_argument("--source", default="import")
+    import_parser.add_argument("--fallbacks", action="store_true", help="import the built-in fallback questions")
+
+    export_parser = commands.add_parser("export", help="write questions as JSON lines")
+    export_parser.add_argument("file", nargs="?", help="output file (default stdout)")
+    export_parser.add_argument("--category")
+
+    pick_parser = commands.add_parser("pick", help="draw least-recently-used questions (marks them used)")
+    pick_parser.add_argument("count", type=int)
+    pick_parser.add_argument("--category")
+
+    args = parser.parse_args()
+    if not args.path:
+        parser.error("set QUESTION_CORPUS_PATH or pass --path")
+
+    corpus = QuestionCorpus(args.path)
+    try:
+        if args.command == "stats":
+            rows = corpus.stats()
+            print(f"{'category':<20} {'questions':>10} {'unused':>8} {'uses':>8}")
+            for row in rows:
+                print(f"{row['category']:<20} {row['questions']:>10} {row['unused']:>8} {row['uses']:>8}")
+            print(f"{'total':<20} {sum(r['questions'] for r in rows):>10}")
+
+        elif args.command == "import":
+            if not args.fallbacks and not args.file:
+                parser.error("import needs a file or --fallbacks")
+            added = import_questions(corpus, args)
+            print(f"Added {added} new questions to {args.path}")
+
+        elif args.command == "export":
+            out = open(args.file, "w", encoding="utf-8") if args.file else sys.stdout
+            try:
+                for row in corpus.export(args.category):
+                    out.write(json.dumps(row) + "\n")
+            finally:
+                if args.file:
+                    out.close()
+
+        elif args.command == "pick":
+            for question in corpus.pick(args.count, args.category):
+                print(question)
+    finally:
+        corpus.close()
+
+
+if __name__ == "__main__":
+    main()
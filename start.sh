@@ -1,8 +1,15 @@
 #!/bin/bash
 # Startup script for Render deployment
 
-echo "Running database migrations..."
-alembic upgrade head
+# Stop here if migrations fail rather than serving an incomplete schema
+set -e
+
+# Migrations run here unless a separate release/pre-deploy step already applies
+# them (set MIGRATE_ON_START=false there to keep them off the cold-start path)
+if [ "${MIGRATE_ON_START:-true}" = "true" ]; then
+    echo "Running database migrations..."
+    alembic upgrade head
+fi
 
 echo "Starting application..."
-uvicorn app.main:socket_app --host 0.0.0.0 --port $PORT
+exec uvicorn app.main:socket_app --host 0.0.0.0 --port $PORT
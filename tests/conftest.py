@@ -4,8 +4,6 @@ from sqlalchemy.orm import sessionmaker
 from sqlalchemy.types import TypeDecorator, CHAR
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
-from app.database import Base
-from app.models import *
 
 
 # Custom UUID type for SQLite compatibility
@@ -46,6 +44,10 @@ import sqlalchemy.dialects.postgresql as postgresql
 _original_uuid = postgresql.UUID
 postgresql.UUID = lambda *args, **kwargs: GUID()
 
+# Models must be imported after the patch so their columns pick up GUID
+from app.database import Base
+from app.models import *
+
 # Create in-memory SQLite database for testing
 SQLALCHEMY_TEST_DATABASE_URL = "sqlite:///./test.db"
 
@@ -66,4 +68,10 @@ def db():
         yield db
     finally:
         db.close()
-        Base.metadata.drop_all(bind=engine)
\ No newline at end of file
+        Base.metadata.drop_all(bind=engine)
+
+@pytest.fixture
+def query_budget():
+    """Fail a block that issues more SQL statements than allowed: `with query_budget(2): ...`"""
+    from app.utils.query_stats import QueryBudget
+    return QueryBudget
@@ -0,0 +1,131 @@
+import asyncio
+import json
+import time
+from typing import List, Optional
+
+
+class FakeOpenAIServer:
+    """
+    Minimal OpenAI-compatible HTTP server for tests.
+
+    Each request to /v1/chat/completions takes the next entry of `latencies`
+    (seconds, last value repeats) and `statuses` (HTTP status, last value repeats)
+    and answers with `content` as the assistant message.
+    """
+
+    def __init__(self, content: str = "1. Fake question one?\n2. Fake question two?"):
+        self.content = content
+        self.latencies: List[float] = [0.0]
+        self.statuses: List[int] = [200]
+        self.stream_chunk_size = 8
+        self.stream_delay = 0.0
+        self.requests = 0
+        self.bodies: List[dict] = []
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._handlers: set = set()
+        self.port = 0
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/v1"
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+        for task in list(self._handlers):
+            task.cancel()
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+        if self._server is not None:
+            await self._server.wait_closed()
+
+    def _next(self, values: list, index: int):
+        return values[min(index, len(values) - 1)]
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        task = asyncio.current_task()
+        self._handlers.add(task)
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                headers = {}
+                for line in head.decode().split("\r\n")[1:]:
+                    if ":" in line:
+                        key, value = line.split(":", 1)
+                        headers[key.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+                index = self.requests
+                self.requests += 1
+                self.bodies.append(json.loads(body or b"{}"))
+
+                await asyncio.sleep(self._next(self.latencies, index))
+                status = self._next(self.statuses, index)
+                if status == 200 and self.bodies[-1].get("stream"):
+                    await self._write_stream(writer)
+                    continue
+                if status == 200:
+                    payload = self._completion()
+                else:
+                    payload = {"error": {"message": "injected failure", "type": "server_error"}}
+
+                data = json.dumps(payload).encode()
+                writer.write(
+                    f"HTTP/1.1 {status} X\r\nContent-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n\r\n".encode() + data
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionResetError, asyncio.CancelledError):
+            pass
+        finally:
+            self._handlers.discard(task)
+            writer.close()
+
+    async def _write_stream(self, writer: asyncio.StreamWriter):
+        """Send content as server-sent chat.completion.chunk events in chunked encoding"""
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nTransfer-Encoding: chunked\r\n\r\n"
+        )
+        pieces = [
+            self.content[i:i + self.stream_chunk_size]
+            for i in range(0, len(self.content), self.stream_chunk_size)
+        ]
+        events = [self._chunk({"content": piece}) for piece in pieces]
+        events.append(self._chunk({}, finish_reason="stop"))
+        for event in events:
+            self._write_chunk(writer, f"data: {json.dumps(event)}\n\n".encode())
+            await writer.drain()
+            await asyncio.sleep(self.stream_delay)
+        self._write_chunk(writer, b"data: [DONE]\n\n")
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    def _write_chunk(self, writer: asyncio.StreamWriter, data: bytes):
+        writer.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+
+    def _chunk(self, delta: dict, finish_reason: Optional[str] = None) -> dict:
+        return {
+            "id": f"chatcmpl-{self.requests}",
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": "gpt-3.5-turbo",
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+        }
+
+    def _completion(self) -> dict:
+        return {
+            "id": f"chatcmpl-{self.requests}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": "gpt-3.5-turbo",
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": self.content},
+                "finish_reason": "stop",
+            }],
+            "usage": {"prompt_tokens": 10, "completion_tokens": 20, "total_tokens": 30},
+        }
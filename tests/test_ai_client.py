@@ -0,0 +1,221 @@
+import asyncio
+import time
+import pytest
+from openai import AsyncOpenAI
+from app.config import settings
+from app.services import ai_service
+from app.services.ai_client import (
+    AIDeadlineExceeded, AIOverloadedError, CircuitBreaker, CircuitOpenError, OutboundScheduler,
+    Priority, ResilientAIClient, hedges
+)
+from app.services.ai_service import AIService, FALLBACK_QUESTIONS
+from tests.fake_openai import FakeOpenAIServer
+
+CHAT_ARGS = {"model": "gpt-3.5-turbo", "messages": [{"role": "user", "content": "hi"}]}
+
+
+@pytest.fixture
+async def server():
+    fake = await FakeOpenAIServer().start()
+    yield fake
+    await fake.stop()
+
+
+def make_client(server, **kwargs):
+    return ResilientAIClient(
+        client_factory=lambda: AsyncOpenAI(api_key="test", base_url=server.base_url, max_retries=0),
+        **kwargs
+    )
+
+
+async def deltas_joined(client) -> str:
+    return "".join([delta async for delta in client.stream("generate_question", **CHAT_ARGS)])
+
+
+async def test_chat_returns_completion(server):
+    """Test a healthy upstream passes straight through"""
+    client = make_client(server)
+
+    response = await client.chat("generate_questions", **CHAT_ARGS)
+
+    assert response.choices[0].message.content.startswith("1. Fake question one?")
+    assert server.requests == 1
+
+
+async def test_deadline_cuts_off_hung_upstream(server):
+    """Test a call site's deadline bounds how long a caller waits"""
+    server.latencies = [5.0]
+    client = make_client(server, deadlines={"generate_question": 0.2})
+
+    started = time.perf_counter()
+    with pytest.raises(AIDeadlineExceeded):
+        await client.chat("generate_question", **CHAT_ARGS)
+
+    assert time.perf_counter() - started < 1.0
+
+
+async def test_slow_request_is_hedged(server):
+    """Test a request slower than the latency percentile gets a faster second request"""
+    client = make_client(server, hedge_percentile=0.95, hedge_min_samples=5, default_deadline=5.0)
+    for _ in range(5):
+        client._tracker("generate_questions").add(0.05)
+    server.latencies = [2.0, 0.0]
+    hedged_before = hedges.value(call_site="generate_questions", winner="hedge")
+
+    started = time.perf_counter()
+    await client.chat("generate_questions", **CHAT_ARGS)
+
+    assert time.perf_counter() - started < 1.0
+    assert server.requests == 2
+    assert hedges.value(call_site="generate_questions", winner="hedge") == hedged_before + 1
+
+
+async def test_circuit_opens_and_recovers(server):
+    """Test repeated failures open the circuit until a trial call succeeds"""
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=lambda: now[0])
+    client = make_client(server, breaker=breaker)
+    server.statuses = [500, 500, 200]
+
+    for _ in range(2):
+        with pytest.raises(Exception):
+            await client.chat("generate_questions", **CHAT_ARGS)
+
+    with pytest.raises(CircuitOpenError):
+        await client.chat("generate_questions", **CHAT_ARGS)
+    assert server.requests == 2
+
+    now[0] = 11
+    await client.chat("generate_questions", **CHAT_ARGS)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+async def test_cancelled_trial_chat_lets_the_next_call_try(server):
+    """Test cancelling the half-open trial call frees the trial instead of wedging the breaker"""
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=lambda: now[0])
+    breaker.record_failure()
+    client = make_client(server, breaker=breaker)
+    server.latencies = [5.0, 0.0]
+    now[0] = 11
+
+    trial = asyncio.ensure_future(client.chat("generate_questions", **CHAT_ARGS))
+    await asyncio.sleep(0.1)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    trial.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await trial
+
+    await client.chat("generate_questions", **CHAT_ARGS)
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert client.scheduler.active == 0
+
+
+async def test_closed_trial_stream_lets_the_next_call_try(server):
+    """Test a half-open trial stream closed part way through frees the trial"""
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=lambda: now[0])
+    breaker.record_failure()
+    client = make_client(server, breaker=breaker)
+    server.stream_delay = 0.05
+    now[0] = 11
+
+    deltas = client.stream("generate_question", **CHAT_ARGS)
+    await deltas.__anext__()
+    await deltas.aclose()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+    cancelled = asyncio.ensure_future(deltas_joined(client))
+    await asyncio.sleep(0.02)
+    cancelled.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled
+
+    assert await deltas_joined(client) == server.content
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert client.scheduler.active == 0
+
+
+async def test_open_circuit_serves_local_questions(server, monkeypatch):
+    """Test AIService goes straight to local questions while upstream is unhealthy"""
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    breaker.record_failure()
+    monkeypatch.setattr(settings, "QUESTION_SOURCE", "ai")
+    monkeypatch.setattr(ai_service, "ai_client", make_client(server, breaker=breaker))
+
+    questions = await AIService.generate_questions(3)
+
+    assert len(questions) == 3
+    assert all(q in FALLBACK_QUESTIONS for q in questions)
+    assert server.requests == 0
+
+
+async def test_scheduler_serves_waiters_by_priority():
+    """Test queued calls are released interactive first, background last"""
+    scheduler = OutboundScheduler(max_concurrency=1, shed_background_depth=10)
+    await scheduler.acquire(Priority.BACKGROUND)
+    order = []
+
+    async def call(priority):
+        await scheduler.acquire(priority)
+        order.append(priority)
+        scheduler.release()
+
+    tasks = [asyncio.create_task(call(p)) for p in (Priority.BACKGROUND, Priority.FALLBACK, Priority.INTERACTIVE)]
+    await asyncio.sleep(0)
+    assert scheduler.queued() == 3
+
+    scheduler.release()
+    await asyncio.gather(*tasks)
+
+    assert order == [Priority.INTERACTIVE, Priority.FALLBACK, Priority.BACKGROUND]
+    assert scheduler.active == 0
+
+
+async def test_scheduler_sheds_background_under_pressure():
+    """Test background work is rejected once the queue is deep, interactive still queues"""
+    scheduler = OutboundScheduler(max_concurrency=1, max_queue=1, shed_background_depth=1)
+    await scheduler.acquire(Priority.INTERACTIVE)
+    waiting = asyncio.create_task(scheduler.acquire(Priority.FALLBACK))
+    await asyncio.sleep(0)
+
+    with pytest.raises(AIOverloadedError):
+        await scheduler.acquire(Priority.BACKGROUND)
+    with pytest.raises(AIOverloadedError):
+        await scheduler.acquire(Priority.FALLBACK)
+    interactive = asyncio.create_task(scheduler.acquire(Priority.INTERACTIVE))
+    await asyncio.sleep(0)
+    assert scheduler.queued() == 2
+
+    scheduler.release()
+    await interactive
+    scheduler.release()
+    await waiting
+    scheduler.release()
+    assert scheduler.active == 0
+
+
+async def test_scheduler_timeout_leaves_queue_clean():
+    """Test a caller that gives up waiting does not leak its place or a slot"""
+    scheduler = OutboundScheduler(max_concurrency=1)
+    await scheduler.acquire(Priority.INTERACTIVE)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await scheduler.acquire(Priority.FALLBACK, timeout=0.01)
+
+    assert scheduler.queued() == 0
+    scheduler.release()
+    assert scheduler.active == 0
+
+
+async def test_client_respects_concurrency_cap(server):
+    """Test calls beyond the cap wait for a slot instead of hitting upstream"""
+    server.latencies = [0.1]
+    client = make_client(server, scheduler=OutboundScheduler(max_concurrency=1))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client.chat("generate_questions", **CHAT_ARGS) for _ in range(3)))
+
+    assert time.perf_counter() - started >= 0.3
+    assert server.requests == 3
+    assert client.scheduler.active == 0
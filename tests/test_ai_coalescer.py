@@ -0,0 +1,93 @@
+import asyncio
+from app.services.ai_coalescer import QuestionRequestCoalescer, model_calls_saved
+
+
+class StubModel:
+    def __init__(self):
+        self.calls = []
+
+    async def __call__(self, num_questions, category=None):
+        self.calls.append((num_questions, category))
+        await asyncio.sleep(0.01)
+        return [f"Question {len(self.calls)}-{i}?" for i in range(num_questions)]
+
+
+async def test_concurrent_requests_share_one_call():
+    """Test requests inside the window are merged and split without overlap"""
+    model = StubModel()
+    coalescer = QuestionRequestCoalescer(generator=model, window=0.02, max_questions=30)
+    saved_before = model_calls_saved.value()
+
+    results = await asyncio.gather(
+        coalescer.request(5),
+        coalescer.request(3),
+        coalescer.request(2),
+    )
+
+    assert model.calls == [(10, None)]
+    assert [len(r) for r in results] == [5, 3, 2]
+    flattened = [q for r in results for q in r]
+    assert len(set(flattened)) == 10
+    assert model_calls_saved.value() == saved_before + 2
+
+
+async def test_flush_tasks_are_kept_until_done():
+    """Test a batch's flush task stays referenced while it runs and is dropped after"""
+    coalescer = QuestionRequestCoalescer(generator=StubModel(), window=0.02)
+
+    request = asyncio.ensure_future(coalescer.request(2))
+    await asyncio.sleep(0)
+    assert len(coalescer._flushes) == 1
+
+    assert len(await request) == 2
+    await asyncio.sleep(0)
+    assert not coalescer._flushes
+
+
+async def test_categories_and_size_cap_split_batches():
+    """Test different categories and oversized batches use separate calls"""
+    model = StubModel()
+    coalescer = QuestionRequestCoalescer(generator=model, window=0.02, max_questions=6)
+
+    results = await asyncio.gather(
+        coalescer.request(4),
+        coalescer.request(4),
+        coalescer.request(2, category="food"),
+    )
+
+    assert sorted(model.calls, key=str) == sorted([(4, None), (4, None), (2, "food")], key=str)
+    assert [len(r) for r in results] == [4, 4, 2]
+
+
+async def test_errors_propagate_to_all_waiters():
+    """Test a failed generation call fails every merged request"""
+    async def failing(num_questions, category=None):
+        raise RuntimeError("upstream down")
+
+    coalescer = QuestionRequestCoalescer(generator=failing, window=0.01)
+
+    results = await asyncio.gather(coalescer.request(1), coalescer.request(1), return_exceptions=True)
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+async def test_streamed_requests_share_one_stream():
+    """Test concurrent streams are merged and each room gets a question from the head of the stream"""
+    calls = []
+
+    async def streamer(num_questions, category=None):
+        calls.append((num_questions, category))
+        for i in range(num_questions):
+            await asyncio.sleep(0.01)
+            yield f"Streamed {i}?"
+
+    coalescer = QuestionRequestCoalescer(window=0.02, streamer=streamer)
+
+    async def collect(num_questions):
+        return [q async for q in coalescer.stream(num_questions)]
+
+    three, one = await asyncio.gather(collect(3), collect(1))
+
+    assert calls == [(4, None)]
+    assert three == ["Streamed 0?", "Streamed 2?", "Streamed 3?"]
+    assert one == ["Streamed 1?"]
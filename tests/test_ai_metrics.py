@@ -0,0 +1,95 @@
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from openai import AsyncOpenAI
+from app.api import metrics
+from app.config import settings
+from app.services import ai_service
+from app.services.ai_client import ResilientAIClient
+from app.services.ai_metrics import AICallStats, attribute_room, call_count, tokens, questions_parsed
+from app.services.ai_service import AIService
+from app.services.question_dedup import QuestionDeduplicator
+from app.utils.metrics import Histogram
+from tests.fake_openai import FakeOpenAIServer
+
+
+@pytest.fixture
+async def server():
+    fake = await FakeOpenAIServer(content="1. Name a sandwich for a ghost\n2. Invent a sport for snails").start()
+    yield fake
+    await fake.stop()
+
+
+@pytest.fixture
+def stats(server, monkeypatch):
+    client = ResilientAIClient(
+        client_factory=lambda: AsyncOpenAI(api_key="test", base_url=server.base_url, max_retries=0)
+    )
+    stats = AICallStats()
+    monkeypatch.setattr(settings, "QUESTION_SOURCE", "ai")
+    monkeypatch.setattr(ai_service, "ai_client", client)
+    monkeypatch.setattr(ai_service, "ai_stats", stats)
+    monkeypatch.setattr(ai_service, "question_deduplicator", QuestionDeduplicator())
+    return stats
+
+
+async def test_usage_and_parse_yield_are_recorded(stats):
+    """Test tokens from response.usage and parsed question counts reach the metrics"""
+    prompt_before = tokens.value(method="generate_questions", kind="prompt")
+    parsed_before = questions_parsed.value(method="generate_questions")
+
+    attribute_room("ROOM01")
+    questions = await AIService.generate_questions(3)
+
+    assert len(questions) == 3
+    assert tokens.value(method="generate_questions", kind="prompt") == prompt_before + 10
+    assert questions_parsed.value(method="generate_questions") == parsed_before + 2
+
+    room = stats.room("ROOM01")
+    assert room["calls"] == 1
+    assert room["prompt_tokens"] == 10
+    assert room["completion_tokens"] == 20
+    assert room["cost_usd"] > 0
+
+    summary = stats.summary()
+    assert summary["methods"]["generate_questions"]["parse_yield"] > 0
+    assert "ROOM01" in summary["rooms"]
+
+
+async def test_failures_count_as_fallbacks(stats, server):
+    """Test an upstream error is recorded as a fallback for the room"""
+    server.statuses = [500]
+    before = call_count.value(method="generate_round_summary", outcome="fallback")
+
+    attribute_room("ROOM02")
+    await AIService.generate_round_summary(["An answer"])
+
+    assert call_count.value(method="generate_round_summary", outcome="fallback") == before + 1
+    assert stats.room("ROOM02")["fallbacks"] == 1
+
+
+def test_histogram_quantile():
+    """Test quantiles resolve to bucket upper bounds"""
+    histogram = Histogram("test_quantile_seconds", "test", buckets=(1, 2, 4))
+    for value in (0.5, 0.5, 1.5, 3):
+        histogram.observe(value)
+
+    assert histogram.quantile(0.5) == 1
+    assert histogram.quantile(0.75) == 2
+    assert histogram.quantile(1.0) == 4
+    assert Histogram("empty_seconds", "test").quantile(0.5) is None
+
+
+async def test_metrics_snapshots_require_admin_key(monkeypatch):
+    """Test the JSON snapshots, which include per-room spend, need the admin key"""
+    app = FastAPI()
+    app.include_router(metrics.router)
+    monkeypatch.setattr(settings, "ADMIN_API_KEY", "secret")
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        assert (await client.get("/api/metrics/ai")).status_code == 403
+        assert (await client.get("/api/metrics", headers={"X-Admin-Key": "nope"})).status_code == 403
+
+        response = await client.get("/api/metrics/ai?top_rooms=1", headers={"X-Admin-Key": "secret"})
+        assert response.status_code == 200
+        assert (await client.get("/api/metrics", headers={"X-Admin-Key": "secret"})).status_code == 200
@@ -1,7 +1,13 @@
+import asyncio
+import threading
+import time
 import pytest
+from tests.conftest import TestingSessionLocal
+from app.models.user import User
 from app.services.auth_service import AuthService
 from app.schemas.user import UserCreate
 from app.utils.exceptions import ConflictException, AuthenticationException
+from app.utils.password_hasher import PasswordHasherPool
 
 
 def test_register_user(db):
@@ -66,4 +72,63 @@ def test_authenticate_wrong_password(db):
 def test_authenticate_nonexistent_user(db):
     """Test authentication with non-existent user"""
     with pytest.raises(AuthenticationException):
-        AuthService.authenticate("nonexistent@example.com", "password123", db)
\ No newline at end of file
+        AuthService.authenticate("nonexistent@example.com", "password123", db)
+
+async def test_register_and_authenticate_async(db):
+    """Test the pooled hashing path used by the REST routes"""
+    user_data = UserCreate(
+        email="test@example.com",
+        username="testuser",
+        password="password123"
+    )
+
+    user = await AuthService.register_async(user_data, db)
+    assert user.password_hash != "password123"
+
+    authenticated = await AuthService.authenticate_async("test@example.com", "password123", db)
+    assert authenticated.id == user.id
+
+    with pytest.raises(AuthenticationException):
+        await AuthService.authenticate_async("test@example.com", "wrongpassword", db)
+
+
+async def test_concurrent_registrations_conflict_cleanly(db):
+    """Test two registrations racing for one email give one user and one conflict, not a 500"""
+    user_data = UserCreate(email="race@example.com", username="racer", password="password123")
+    sessions = [TestingSessionLocal(), TestingSessionLocal()]
+    try:
+        results = await asyncio.gather(
+            *(AuthService.register_async(user_data, session) for session in sessions),
+            return_exceptions=True
+        )
+    finally:
+        for session in sessions:
+            session.close()
+
+    assert sum(isinstance(result, User) for result in results) == 1
+    assert sum(isinstance(result, ConflictException) for result in results) == 1
+
+
+async def test_password_hasher_pool_limits_concurrency():
+    """Test the pool never runs more than max_concurrency jobs at once"""
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def work(value):
+        with lock:
+            active.append(value)
+            peak.append(len(active))
+        time.sleep(0.02)
+        with lock:
+            active.remove(value)
+        return value * 2
+
+    pool = PasswordHasherPool(executor_type="thread", max_workers=4, max_concurrency=2)
+    try:
+        results = await asyncio.gather(*(pool.run("test", work, i) for i in range(6)))
+    finally:
+        pool.shutdown()
+
+    assert results == [0, 2, 4, 6, 8, 10]
+    assert max(peak) <= 2
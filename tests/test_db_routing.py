@@ -0,0 +1,167 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.database import Base
+from app.schemas.room import RoomCreate
+from app.schemas.user import UserCreate
+from app.services.auth_service import AuthService
+from app.services.game_service import GameService
+from app.services.room_service import RoomService
+from app.utils import db_routing
+from app.utils.db_routing import ReadYourWrites, RedisReadYourWrites, RoutingSession, set_actor
+
+
+@pytest.fixture
+def databases(tmp_path, monkeypatch):
+    """A primary and a replica that never catches up, so every routed read is visible"""
+    primary = create_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    for engine in (primary, replica):
+        Base.metadata.create_all(bind=engine)
+    monkeypatch.setattr(db_routing, "read_your_writes", ReadYourWrites(window=60))
+    set_actor(None)
+    yield sessionmaker(class_=RoutingSession, autoflush=False, bind=primary, replica=replica)
+    primary.dispose()
+    replica.dispose()
+
+
+def seed_room(session_factory):
+    db = session_factory()
+    try:
+        host = AuthService.register(UserCreate(email="host@example.com", username="host", password="pass123"), db)
+        player = AuthService.register(UserCreate(email="player@example.com", username="player", password="pass123"), db)
+        room = RoomService.create_room(RoomCreate(), host.id, db)
+        return player.id, room.code, room.id
+    finally:
+        db.close()
+
+
+def test_replica_reads_and_primary_writes(databases):
+    """Test writes land on the primary while marked reads in a fresh session use the replica"""
+    _, room_code, room_id = seed_room(databases)
+
+    db = databases()
+    try:
+        assert RoomService.get_room_participants(room_id, db) == []
+        assert GameService.get_leaderboard(room_id, db) == []
+    finally:
+        db.close()
+
+
+def test_lookups_that_decide_writes_use_primary(databases):
+    """Test get_room, which handlers check before writing, never reads the lagging replica"""
+    _, room_code, room_id = seed_room(databases)
+
+    db = databases()
+    try:
+        room = RoomService.get_room(room_code, db)
+        assert room.id == room_id
+        assert room.current_round == 0
+    finally:
+        db.close()
+
+
+def test_session_reads_its_own_writes(databases):
+    """Test a session that has written keeps reading from the primary"""
+    db = databases()
+    try:
+        host = AuthService.register(UserCreate(email="host@example.com", username="host", password="pass123"), db)
+        room = RoomService.create_room(RoomCreate(), host.id, db)
+
+        assert RoomService.get_room(room.code, db).id == room.id
+        assert [p.username for p in RoomService.get_room_participants(room.id, db)] == ["host"]
+    finally:
+        db.close()
+
+
+def test_recent_writer_is_sticky_to_primary(databases):
+    """Test the user who just committed reads from the primary in later sessions; others do not"""
+    player_id, room_code, room_id = seed_room(databases)
+
+    db = databases()
+    try:
+        set_actor(player_id)
+        RoomService.join_room(room_code, player_id, db)
+    finally:
+        db.close()
+
+    db = databases()
+    try:
+        assert len(RoomService.get_room_participants(room_id, db)) == 2
+        set_actor("someone-else")
+        assert RoomService.get_room_participants(room_id, db) == []
+    finally:
+        db.close()
+        set_actor(None)
+
+
+class FakeRedis:
+    """The two calls the tracker makes, with expiry ignored"""
+
+    def __init__(self):
+        self.keys = {}
+        self.down = False
+
+    def set(self, key, value, px=None):
+        if self.down:
+            raise ConnectionError("redis down")
+        self.keys[key] = px
+
+    def exists(self, key):
+        if self.down:
+            raise ConnectionError("redis down")
+        return int(key in self.keys)
+
+
+def test_recent_write_is_seen_by_every_worker():
+    """Test a write recorded by one worker keeps the user on the primary in another"""
+    shared = FakeRedis()
+    worker_a = RedisReadYourWrites("redis://unused", window=5, client=shared)
+    worker_b = RedisReadYourWrites("redis://unused", window=5, client=shared)
+
+    worker_a.wrote("user-1")
+
+    assert worker_b.sticky("user-1")
+    assert not worker_b.sticky("user-2")
+    assert shared.keys == {"ryw:user-1": 5000}
+
+    shared.down = True
+    assert worker_b.sticky("user-2")
+
+
+def test_session_checks_the_sticky_store_once(databases, monkeypatch):
+    """Test a session asks the shared store about its actor once, not per statement"""
+    _, _, room_id = seed_room(databases)
+    checks = []
+
+    class CountingTracker(ReadYourWrites):
+        def sticky(self, user_id):
+            checks.append(user_id)
+            return False
+
+    monkeypatch.setattr(db_routing, "read_your_writes", CountingTracker())
+    set_actor("user-1")
+    db = databases()
+    try:
+        RoomService.get_room_participants(room_id, db)
+        GameService.get_leaderboard(room_id, db)
+    finally:
+        db.close()
+        set_actor(None)
+
+    assert checks == ["user-1"]
+
+
+def test_without_replica_everything_uses_primary(tmp_path):
+    """Test the routing session is a plain session when no replica is configured"""
+    primary = create_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+    Base.metadata.create_all(bind=primary)
+    session_factory = sessionmaker(class_=RoutingSession, autoflush=False, bind=primary)
+    _, room_code, _ = seed_room(session_factory)
+
+    db = session_factory()
+    try:
+        assert RoomService.get_room(room_code, db).code == room_code
+    finally:
+        db.close()
+        primary.dispose()
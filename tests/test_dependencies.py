@@ -0,0 +1,47 @@
+import uuid
+import pytest
+from app.dependencies import get_current_principal
+from app.services.auth_service import AuthService
+from app.schemas.user import UserCreate
+from app.schemas.records import Principal
+from app.utils.security import create_access_token, create_user_access_token
+from app.utils.exceptions import AuthenticationException
+
+
+class ExplodingSession:
+    """Session stand-in that fails the test if the dependency touches the database"""
+
+    def query(self, *args, **kwargs):
+        raise AssertionError("principal lookup should not query the database")
+
+
+async def test_principal_from_token_claims():
+    """Test the principal is built from claims without a user lookup"""
+    user = Principal(uuid.uuid4(), "testuser")
+
+    token = create_user_access_token(user)
+    principal = await get_current_principal(access_token=token, db=ExplodingSession())
+
+    assert principal.id == user.id
+    assert principal.username == "testuser"
+
+
+async def test_principal_from_legacy_token(db):
+    """Test tokens without a username claim fall back to loading the user"""
+    user_data = UserCreate(email="test@example.com", username="testuser", password="password123")
+    user = AuthService.register(user_data, db)
+
+    token = create_access_token(data={"sub": str(user.id)})
+    principal = await get_current_principal(access_token=token, db=db)
+
+    assert principal.id == user.id
+    assert principal.username == "testuser"
+
+
+async def test_principal_requires_token():
+    """Test missing or invalid tokens are rejected"""
+    with pytest.raises(AuthenticationException):
+        await get_current_principal(access_token=None, db=ExplodingSession())
+
+    with pytest.raises(AuthenticationException):
+        await get_current_principal(access_token="not-a-token", db=ExplodingSession())
@@ -0,0 +1,121 @@
+import pytest
+import socketio
+from app.api import rooms
+from app.schemas.records import Principal
+from app.schemas.room import RoomCreate
+from app.schemas.user import UserCreate
+from app.services.auth_service import AuthService
+from app.services.drain import DrainCoordinator
+from app.services.game_service import GameService
+from app.services.room_service import RoomService
+from app.utils.exceptions import ServiceUnavailableException
+from app.websocket import events
+
+
+class FakeManager:
+    def __init__(self, sids):
+        self.sids = sids
+
+    def get_participants(self, namespace, room):
+        return [(sid, sid) for sid in self.sids]
+
+
+class FakeSio:
+    def __init__(self, sids):
+        self.manager = FakeManager(sids)
+        self.calls = []
+
+    async def emit(self, event, data=None, **kwargs):
+        self.calls.append(("emit", event, data))
+
+    async def disconnect(self, sid):
+        self.calls.append(("disconnect", sid))
+
+
+class FakeHandoff:
+    def __init__(self, name, calls):
+        self.name = name
+        self.calls = calls
+
+    async def handoff(self, timeout):
+        self.calls.append(("handoff", self.name))
+
+
+@pytest.fixture
+def game(db):
+    host = AuthService.register(UserCreate(email="host@example.com", username="host", password="pass123"), db)
+    player = AuthService.register(UserCreate(email="player@example.com", username="player", password="pass123"), db)
+    room = RoomService.create_room(RoomCreate(), host.id, db)
+    RoomService.join_room(room.code, player.id, db)
+    return room, host, player
+
+
+def test_game_state_waiting_room(db, game):
+    """Test a room that has not started reports no round"""
+    room, _, _ = game
+
+    state = GameService.get_game_state(room, db)
+
+    assert state["status"] == "waiting"
+    assert state["round"] is None
+
+
+def test_game_state_follows_round_phase(db, game):
+    """Test the snapshot carries the current round's phase, time left and answers"""
+    room, host, player = game
+    GameService.start_game(room.code, host.id, db)
+    round_obj = GameService.start_round(room.id, 1, "Name a bad superhero", db)
+    GameService.submit_answer(round_obj.id, player.id, "Captain Obvious", db)
+
+    state = GameService.get_game_state(room, db)
+    assert state["status"] == "active"
+    assert state["round"]["round_id"] == str(round_obj.id)
+    assert state["round"]["status"] == "answering"
+    assert state["round"]["submitted_count"] == 1
+    assert 0 < state["round"]["time_left"] <= 60
+    assert "answers" not in state["round"]
+
+    GameService.start_voting(round_obj.id, db)
+    state = GameService.get_game_state(room, db)
+    assert state["round"]["status"] == "voting"
+    assert [answer["content"] for answer in state["round"]["answers"]] == ["Captain Obvious"]
+
+
+async def test_drain_hands_off_then_moves_clients():
+    """Test draining hands off background work before telling clients to reconnect"""
+    calls = []
+    sio = FakeSio(["a", "b"])
+    sio.calls = calls
+    coordinator = DrainCoordinator(feeds=FakeHandoff("feeds", calls), summaries=FakeHandoff("summaries", calls))
+
+    assert coordinator.start(sio, grace=1, spread=0)
+    assert not coordinator.start(sio, grace=1, spread=0)
+    assert coordinator.status()["draining"]
+    await coordinator.wait()
+
+    assert calls[:2] == [("handoff", "feeds"), ("handoff", "summaries")]
+    assert calls[2] == ("emit", "server_draining", {"reconnect_within_ms": 0})
+    assert calls[3:] == [("disconnect", "a"), ("disconnect", "b")]
+    assert coordinator.phase == "drained"
+
+
+async def test_create_room_refused_while_draining(db, game, monkeypatch):
+    """Test new rooms are sent elsewhere with a 503 while this worker drains"""
+    _, host, _ = game
+    monkeypatch.setattr(rooms.drain, "draining", True)
+
+    with pytest.raises(ServiceUnavailableException) as exc:
+        await rooms.create_room(RoomCreate(), Principal(host.id, host.username), db)
+
+    assert exc.value.status_code == 503
+    assert "Retry-After" in exc.value.headers
+
+
+async def test_connect_refused_with_a_reason_while_draining(monkeypatch):
+    """Test a draining worker refuses sockets with the reason the client retries on"""
+    monkeypatch.setattr(events.drain, "draining", True)
+
+    with pytest.raises(socketio.exceptions.ConnectionRefusedError) as exc:
+        await events.connect("sid", {}, {"token": "ignored"})
+
+    assert exc.value.error_args == {"message": "server_draining"}
@@ -122,4 +122,26 @@ def test_cannot_vote_for_own_answer(db):
 
     # Try to vote for own answer
     with pytest.raises(BadRequestException):
-        GameService.submit_vote(round_obj.id, host.id, answer.id, db)
\ No newline at end of file
+        GameService.submit_vote(round_obj.id, host.id, answer.id, db)
+
+def test_leaderboard_and_answers_are_records(db):
+    """Test leaderboard and answer reads return broadcast-ready records"""
+    host_data = UserCreate(email="host@example.com", username="host", password="pass123")
+    host = AuthService.register(host_data, db)
+    user_data = UserCreate(email="user@example.com", username="user", password="pass123")
+    user = AuthService.register(user_data, db)
+
+    room = RoomService.create_room(RoomCreate(), host.id, db)
+    round_obj = GameService.start_round(room.id, 1, "Test question?", db)
+    answer = GameService.submit_answer(round_obj.id, user.id, "User answer", db)
+    GameService.start_voting(round_obj.id, db)
+    GameService.submit_vote(round_obj.id, host.id, answer.id, db)
+
+    answers = GameService.get_round_answers(round_obj.id, db)
+    assert [a.to_dict() for a in answers] == [{'id': str(answer.id), 'content': "User answer"}]
+    assert answers[0].user_id == user.id
+
+    leaderboard = GameService.get_leaderboard(room.id, db)
+    assert [entry.to_dict() for entry in leaderboard] == [
+        {'user_id': str(user.id), 'username': "user", 'score': 1}
+    ]
@@ -0,0 +1,137 @@
+import pytest
+from fastapi import APIRouter, FastAPI
+from httpx import AsyncClient
+from sqlalchemy import create_engine, text
+from tests.conftest import TestingSessionLocal
+from app.models.room import RoomStatus
+from app.services.auth_service import AuthService
+from app.services.room_service import RoomService
+from app.schemas.room import RoomCreate
+from app.schemas.user import UserCreate
+from app.utils.instrumentation import (
+    MetricsMiddleware, active_rooms, http_requests, instrument_event, pool_connections,
+    pool_stats_collector, room_status_collector, socket_events
+)
+from app.utils.metrics import MetricsRegistry
+from app.utils.security import create_access_token
+from app.websocket import events
+
+
+def test_render_prometheus():
+    """Test counters and cumulative histogram buckets in text exposition format"""
+    registry = MetricsRegistry()
+    registry.counter("jobs_total", "Jobs run", ["queue"]).inc(3, queue='a"b')
+    histogram = registry.histogram("job_seconds", "Job latency", buckets=(0.1, 1))
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+    histogram.observe(5)
+
+    output = registry.render_prometheus()
+
+    assert "# TYPE jobs_total counter" in output
+    assert 'jobs_total{queue="a\\"b"} 3' in output
+    assert 'job_seconds_bucket{le="0.1"} 1' in output
+    assert 'job_seconds_bucket{le="1"} 2' in output
+    assert 'job_seconds_bucket{le="+Inf"} 3' in output
+    assert "job_seconds_count 3" in output
+    assert "job_seconds_sum 5.55" in output
+
+
+async def test_instrument_event_counts_outcomes():
+    """Test handler results map to ok and error outcomes"""
+    @instrument_event
+    async def metrics_probe(sid, data):
+        if data == "boom":
+            raise RuntimeError("boom")
+        return {"success": data == "ok"}
+
+    ok = socket_events.value(event="metrics_probe", outcome="ok")
+    error = socket_events.value(event="metrics_probe", outcome="error")
+
+    await metrics_probe("sid", "ok")
+    await metrics_probe("sid", "fail")
+    with pytest.raises(RuntimeError):
+        await metrics_probe("sid", "boom")
+
+    assert metrics_probe.__name__ == "metrics_probe"
+    assert socket_events.value(event="metrics_probe", outcome="ok") == ok + 1
+    assert socket_events.value(event="metrics_probe", outcome="error") == error + 2
+
+
+async def test_cookie_connect_without_auth_is_one_ok_event(monkeypatch):
+    """Test a connect with no auth payload succeeds on the first call, without an error first"""
+    async def save_session(sid, session):
+        pass
+
+    monkeypatch.setattr(events.sio, "save_session", save_session)
+    token = create_access_token({"sub": "user-1", "username": "host"})
+    ok = socket_events.value(event="connect", outcome="ok")
+    error = socket_events.value(event="connect", outcome="error")
+
+    # python-socketio calls connect(sid, environ) first when the client sent no auth
+    assert await events.connect("sid", {"HTTP_COOKIE": f"theme=dark; access_token={token}"}) is True
+
+    assert socket_events.value(event="connect", outcome="ok") == ok + 1
+    assert socket_events.value(event="connect", outcome="error") == error
+
+
+async def test_middleware_labels_by_route_template():
+    """Test REST requests are recorded under their route template, not the raw path"""
+    router = APIRouter()
+
+    @router.get("/probe/{item_id}")
+    async def probe(item_id: str):
+        return {"item_id": item_id}
+
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(router)
+    before = http_requests.value(method="GET", route="/probe/{item_id}", status="200")
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        await client.get("/probe/a")
+        await client.get("/probe/b")
+        await client.get("/nowhere")
+
+    assert http_requests.value(method="GET", route="/probe/{item_id}", status="200") == before + 2
+    assert http_requests.value(method="GET", route="unmatched", status="404") >= 1
+
+
+def test_pool_stats_collector(tmp_path):
+    """Test pool gauges reflect checked-out connections"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", pool_size=2, max_overflow=1)
+    collect = pool_stats_collector(engine)
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        collect()
+        assert pool_connections.value(state="checked_out") == 1
+
+    collect()
+    assert pool_connections.value(state="checked_out") == 0
+    assert pool_connections.value(state="size") == 2
+    engine.dispose()
+
+
+def test_room_status_collector(db):
+    """Test the rooms gauge counts rooms per status"""
+    host = AuthService.register(UserCreate(email="host@example.com", username="host", password="pass123"), db)
+    RoomService.create_room(RoomCreate(), host.id, db)
+    RoomService.create_room(RoomCreate(), host.id, db)
+
+    now = [0.0]
+    collect = room_status_collector(TestingSessionLocal, max_age=15, clock=lambda: now[0])
+    collect()
+
+    assert active_rooms.value(status=RoomStatus.WAITING.value) == 2
+    assert active_rooms.value(status=RoomStatus.ACTIVE.value) == 0
+
+    # Scrapes inside max_age reuse the last count without querying
+    RoomService.create_room(RoomCreate(), host.id, db)
+    now[0] = 10
+    collect()
+    assert active_rooms.value(status=RoomStatus.WAITING.value) == 2
+
+    now[0] = 16
+    collect()
+    assert active_rooms.value(status=RoomStatus.WAITING.value) == 3
@@ -0,0 +1,129 @@
+import io
+import json
+import logging
+import queue
+import subprocess
+import sys
+import threading
+import pytest
+from app.utils import logger as app_logger
+from app.utils.logger import (
+    JSONFormatter, NonBlockingQueueHandler, SamplingFilter, TextFormatter, configure_logging, dropped_records
+)
+
+
+def _record(name="app.test", level=logging.INFO, msg="hello %s", args=("world",), **extra):
+    record = logging.LogRecord(name, level, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+@pytest.fixture
+def pipeline():
+    """Route root logging into a buffer for one test, then detach it again"""
+    buffer = io.StringIO()
+
+    def start(**kwargs):
+        configure_logging(stream=buffer, **kwargs)
+        return buffer
+
+    yield start
+    app_logger.shutdown_logging()
+
+
+def test_json_formatter_merges_fields():
+    """Test structured fields become top-level keys of the JSON line"""
+    line = JSONFormatter().format(_record(fields={"room": "ABC123", "latency_ms": 12.5}))
+    entry = json.loads(line)
+
+    assert entry["msg"] == "hello world"
+    assert entry["level"] == "INFO"
+    assert entry["logger"] == "app.test"
+    assert entry["room"] == "ABC123"
+    assert entry["latency_ms"] == 12.5
+
+
+def test_text_formatter_appends_fields():
+    """Test text output keeps the classic layout with fields appended as JSON"""
+    line = TextFormatter().format(_record(msg="ai_call", args=(), fields={"outcome": "ok"}))
+
+    assert line.endswith('- app.test - INFO - ai_call {"outcome": "ok"}')
+
+
+def test_sampling_filter_by_prefix():
+    """Test the longest matching prefix sets the rate and warnings always pass"""
+    sampler = SamplingFilter({"app": 1.0, "app.websocket": 0.0, "app.websocket.events.debug": 1.0})
+
+    assert sampler.filter(_record(name="app.services.game_service"))
+    assert not sampler.filter(_record(name="app.websocket.events"))
+    assert sampler.filter(_record(name="app.websocket.events", level=logging.WARNING))
+    assert sampler.filter(_record(name="app.websocket.events.debug"))
+    assert sampler.rate("app.websocketry") == 1.0
+
+
+def test_queue_full_drops_instead_of_blocking():
+    """Test a full queue drops records rather than stalling the caller"""
+    handler = NonBlockingQueueHandler(queue.Queue(maxsize=1))
+    before = dropped_records.value()
+
+    handler.handle(_record())
+    handler.handle(_record())
+
+    assert handler.queue.qsize() == 1
+    assert dropped_records.value() == before + 1
+
+
+def test_arguments_not_formatted_by_caller():
+    """Test records are queued with their %-style arguments still unrendered"""
+    rendered = []
+
+    class Probe:
+        def __str__(self):
+            rendered.append(threading.current_thread().name)
+            return "probe"
+
+    handler = NonBlockingQueueHandler(queue.Queue())
+    handler.handle(_record(msg="value %s", args=(Probe(),)))
+    queued = handler.queue.get_nowait()
+
+    assert rendered == []
+    assert queued.msg == "value %s"
+    assert queued.getMessage() == "value probe"
+
+
+def test_configure_logging_writes_json(pipeline):
+    """Test records reach the stream as JSON through the background listener"""
+    buffer = pipeline(log_format="json", sample_rates={})
+
+    logging.getLogger("app.test").info("value %s", 42, extra={"fields": {"n": 1}})
+    app_logger.shutdown_logging()
+
+    entry = json.loads(buffer.getvalue().strip().splitlines()[-1])
+    assert entry["msg"] == "value 42"
+    assert entry["n"] == 1
+
+
+def test_configure_logging_sampling(pipeline):
+    """Test sampled-out loggers write nothing while others are unaffected"""
+    buffer = pipeline(log_format="text", sample_rates={"app.noisy": 0})
+
+    logging.getLogger("app.noisy").info("dropped")
+    logging.getLogger("app.noisy").warning("kept warning")
+    logging.getLogger("app.quiet").info("kept info")
+    app_logger.shutdown_logging()
+
+    output = buffer.getvalue()
+    assert "dropped" not in output
+    assert "kept warning" in output
+    assert "kept info" in output
+
+
+def test_importing_the_app_leaves_logging_alone():
+    """Test only app startup installs the pipeline, and stdlib logging settings stay untouched"""
+    probe = (
+        "import logging, threading, app.main; "
+        "print(len(logging.getLogger().handlers), threading.active_count(), logging._srcfile is not None, logging.logThreads)"
+    )
+    result = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, check=True)
+
+    assert result.stdout.split() == ["0", "1", "True", "True"]
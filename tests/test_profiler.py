@@ -0,0 +1,132 @@
+import asyncio
+import time
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from app.api import admin
+from app.config import settings
+from app.utils.instrumentation import instrument_event
+from app.utils.profiler import HandlerProfiler, SamplingProfiler, ProfilerBusyError, handler_profiler
+
+
+def _spin(seconds: float):
+    """Burn `seconds` of this thread's CPU time (wall time varies with other threads)"""
+    deadline = time.thread_time() + seconds
+    while time.thread_time() < deadline:
+        pass
+
+
+async def test_sampling_profile_collapsed_stacks():
+    """Test samples are returned as collapsed stacks naming the busy function"""
+    profiler = SamplingProfiler()
+
+    async def busy():
+        await asyncio.sleep(0.01)
+        _spin(0.15)
+
+    task = asyncio.create_task(busy())
+    stacks = await profiler.profile(0.1, interval=0.002)
+    await task
+
+    lines = stacks.strip().splitlines()
+    assert all(int(line.rsplit(" ", 1)[1]) > 0 for line in lines)
+    busy_stacks = [line for line in lines if "test_profiler.py:_spin" in line]
+    assert busy_stacks
+    assert busy_stacks[0].startswith("MainThread;")
+
+
+async def test_sampling_profile_one_at_a_time():
+    """Test a second concurrent profile is refused"""
+    profiler = SamplingProfiler()
+    first = asyncio.create_task(profiler.profile(0.05))
+    await asyncio.sleep(0)
+
+    with pytest.raises(ProfilerBusyError):
+        await profiler.profile(0.05)
+
+    await first
+    assert not profiler.running
+
+
+async def test_handler_profiler_excludes_time_awaiting():
+    """Test CPU time counts only the handler's own steps, not time spent suspended"""
+    profiler = HandlerProfiler()
+
+    async def handler():
+        _spin(0.02)
+        await asyncio.sleep(0.05)
+        return "done"
+
+    collecting = asyncio.create_task(profiler.collect(0.2))
+    await asyncio.sleep(0)
+    assert await profiler.run("handler", handler()) == "done"
+    handlers = await collecting
+
+    entry = handlers["handler"]
+    assert entry["calls"] == 1
+    assert entry["wall_ms"] >= 70
+    assert 15 <= entry["cpu_ms"] < 50
+
+
+async def test_handler_profiler_propagates_errors():
+    """Test exceptions thrown into and out of the handler pass through unchanged"""
+    profiler = HandlerProfiler()
+
+    async def failing():
+        await asyncio.sleep(0)
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        await profiler.run("failing", failing())
+
+    async def slow():
+        await asyncio.sleep(1)
+
+    task = asyncio.create_task(profiler.run("slow", slow()))
+    await asyncio.sleep(0.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+
+async def test_instrument_event_records_while_active():
+    """Test instrumented handlers are timed only during a collection window"""
+    @instrument_event
+    async def profiled_probe(sid):
+        return {"success": True}
+
+    await profiled_probe("sid")
+    collecting = asyncio.create_task(handler_profiler.collect(0.05))
+    await asyncio.sleep(0)
+    await profiled_probe("sid")
+    await profiled_probe("sid")
+    handlers = await collecting
+
+    assert handlers["profiled_probe"]["calls"] == 2
+    assert handlers["profiled_probe"]["queries"] == 0
+
+
+async def test_admin_endpoints_require_key(monkeypatch):
+    """Test the profiling endpoints are closed without a configured, matching admin key"""
+    app = FastAPI()
+    app.include_router(admin.router)
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        monkeypatch.setattr(settings, "ADMIN_API_KEY", "")
+        assert (await client.get("/api/admin/profile?seconds=0.01", headers={"X-Admin-Key": ""})).status_code == 403
+
+        monkeypatch.setattr(settings, "ADMIN_API_KEY", "secret")
+        assert (await client.get("/api/admin/profile?seconds=0.01")).status_code == 403
+        assert (await client.get("/api/admin/profile?seconds=0.01", headers={"X-Admin-Key": "nope"})).status_code == 403
+
+        response = await client.get("/api/admin/profile?seconds=0.02&interval_ms=1", headers={"X-Admin-Key": "secret"})
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+
+        response = await client.get("/api/admin/profile/handlers?seconds=0.01", headers={"X-Admin-Key": "secret"})
+        assert response.status_code == 200
+        assert response.json()["handlers"] == {}
+
+        too_long = settings.PROFILE_MAX_SECONDS + 1
+        response = await client.get(f"/api/admin/profile?seconds={too_long}", headers={"X-Admin-Key": "secret"})
+        assert response.status_code == 400
@@ -0,0 +1,88 @@
+import asyncio
+import contextvars
+import pytest
+from starlette.concurrency import run_in_threadpool
+from app.services.game_service import GameService
+from app.services.room_service import RoomService
+from app.services.auth_service import AuthService
+from app.schemas.room import RoomCreate
+from app.schemas.user import UserCreate
+from app.utils.query_stats import QueryBudget, QueryBudgetExceeded, offenders, track_queries
+
+
+@pytest.fixture
+def round_with_answers(db):
+    host = AuthService.register(UserCreate(email="host@example.com", username="host", password="pass123"), db)
+    room = RoomService.create_room(RoomCreate(), host.id, db)
+    round_obj = GameService.start_round(room.id, 1, "Name a bad superhero", db)
+    answer_ids = []
+    for i in range(6):
+        user = AuthService.register(UserCreate(email=f"p{i}@example.com", username=f"player{i}", password="pass123"), db)
+        answer_ids.append(GameService.submit_answer(round_obj.id, user.id, f"Answer {i}", db).id)
+    return round_obj.id, answer_ids
+
+
+def test_track_queries_flags_repeated_statements(db, round_with_answers):
+    """Test per-answer lookups in a loop are reported as a possible N+1"""
+    _, answer_ids = round_with_answers
+    before = offenders.value(unit="vote loop", reason="repeated")
+
+    with track_queries("vote loop") as stats:
+        for answer_id in answer_ids:
+            GameService.get_answer_vote_count(answer_id, db)
+
+    assert stats.count == 6
+    assert stats.repeated(5)[0][1] == 6
+    assert offenders.value(unit="vote loop", reason="repeated") == before + 1
+
+
+def test_round_vote_counts_fit_budget(db, round_with_answers, query_budget):
+    """Test answers plus vote counts for a round cost two statements"""
+    round_id, _ = round_with_answers
+
+    with query_budget(2):
+        answers = GameService.get_round_answers(round_id, db)
+        votes = GameService.get_round_vote_counts(round_id, db)
+
+    assert len(answers) == 6
+    assert votes == {}
+    with query_budget(1):
+        assert GameService.count_round_answers(round_id, db) == 6
+
+
+def test_budget_failure_lists_statements(db, round_with_answers, query_budget):
+    """Test exceeding the budget fails with the offending statements"""
+    _, answer_ids = round_with_answers
+
+    with pytest.raises(QueryBudgetExceeded, match="6 queries, budget 1"):
+        with query_budget(1):
+            for answer_id in answer_ids:
+                GameService.get_answer_vote_count(answer_id, db)
+
+
+async def test_budget_decorator_on_async_function(db, round_with_answers):
+    """Test the decorator form wraps coroutines"""
+    round_id, _ = round_with_answers
+
+    @QueryBudget(1)
+    async def load_answers():
+        return GameService.get_round_answers(round_id, db)
+
+    assert len(await load_answers()) == 6
+
+
+async def test_track_queries_follows_context_into_threads(db, round_with_answers):
+    """Test threadpool work is counted only when the context travels with it"""
+    round_id, _ = round_with_answers
+
+    def load_answers():
+        return GameService.get_round_answers(round_id, db)
+
+    loop = asyncio.get_running_loop()
+
+    with track_queries("threads") as stats:
+        await run_in_threadpool(load_answers)
+        await loop.run_in_executor(None, load_answers)
+        await loop.run_in_executor(None, contextvars.copy_context().run, load_answers)
+
+    assert stats.count == 2
@@ -0,0 +1,170 @@
+import sqlite3
+import threading
+import pytest
+from app.services import question_corpus as corpus_module
+from app.services import question_pool as pool_module
+from app.services.question_corpus import QuestionCorpus
+from app.services.question_dedup import QuestionDeduplicator
+from app.services.question_pool import QuestionPool
+
+QUESTIONS = [
+    "Invent a board game that uses only spoons",
+    "What would a dragon put on its grocery list?",
+    "Name a holiday celebrated only by cats",
+    "Describe the worst possible theme park ride",
+]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        self.now += 1
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def fresh_deduplicator(monkeypatch):
+    deduplicator = QuestionDeduplicator()
+    monkeypatch.setattr(corpus_module, "question_deduplicator", deduplicator)
+    monkeypatch.setattr(pool_module, "question_deduplicator", deduplicator)
+    return deduplicator
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    corpus = QuestionCorpus(str(tmp_path / "corpus.db"), clock=FakeClock())
+    yield corpus
+    corpus.close()
+
+
+def test_add_ignores_repeats(corpus):
+    """Test a question is stored once however often it is generated"""
+    assert corpus.add(QUESTIONS, "silly") == 4
+    assert corpus.add([QUESTIONS[0], QUESTIONS[0].upper() + "!"], "silly") == 0
+
+    assert corpus.count("silly") == 4
+    assert corpus.count("food") == 0
+
+
+def test_same_question_is_kept_per_category(corpus):
+    """Test a question generated for a second category is stored for that category too"""
+    corpus.add(QUESTIONS[:1], "silly")
+
+    assert corpus.add(QUESTIONS[:1], "food") == 1
+    assert corpus.pick(1, "food") == QUESTIONS[:1]
+
+
+def test_old_corpus_file_is_migrated(tmp_path):
+    """Test a file keyed on normalized text alone is rebuilt without losing rows"""
+    path = str(tmp_path / "old.db")
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE questions (
+            id INTEGER PRIMARY KEY, text TEXT NOT NULL, normalized TEXT NOT NULL UNIQUE,
+            category TEXT NOT NULL DEFAULT '', source TEXT NOT NULL DEFAULT 'ai',
+            uses INTEGER NOT NULL DEFAULT 0, last_used REAL NOT NULL DEFAULT 0, created_at REAL NOT NULL
+        );
+        INSERT INTO questions (text, normalized, category, uses, created_at)
+        VALUES ('Name a holiday celebrated only by cats', 'name a holiday celebrated only by cats', 'silly', 3, 1);
+    """)
+    conn.close()
+
+    corpus = QuestionCorpus(path)
+    assert corpus.add(["Name a holiday celebrated only by cats"], "food") == 1
+    assert corpus.stats() == [
+        {"category": "food", "questions": 1, "unused": 1, "uses": 0},
+        {"category": "silly", "questions": 1, "unused": 0, "uses": 3},
+    ]
+    corpus.close()
+
+    # Reopening an up-to-date file leaves it alone
+    corpus = QuestionCorpus(path)
+    assert corpus.count() == 2
+    corpus.close()
+
+
+async def test_async_methods_run_on_corpus_thread(corpus, monkeypatch):
+    """Test the app-facing methods keep SQLite work off the event loop thread"""
+    threads = []
+    candidates = corpus._candidates
+
+    def recording_candidates(*args):
+        threads.append(threading.current_thread().name)
+        return candidates(*args)
+
+    monkeypatch.setattr(corpus, "_candidates", recording_candidates)
+
+    assert await corpus.add_async(QUESTIONS, "silly") == 4
+    assert await corpus.count_async("silly") == 4
+    first = await corpus.pick_async(2, "silly")
+    second = await corpus.pick_async(2, "silly")
+
+    assert set(first + second) == set(QUESTIONS)
+    assert threads and all(name.startswith("question-corpus") for name in threads)
+
+
+def test_pick_is_least_recently_used_per_category(corpus):
+    """Test picks rotate through the category before reusing a question"""
+    corpus.add(QUESTIONS[:2], "silly")
+    corpus.add(QUESTIONS[2:], None)
+
+    first = corpus.pick(1, "silly")
+    second = corpus.pick(1, "silly")
+
+    assert first != second
+    assert set(first + second) == set(QUESTIONS[:2])
+    assert set(corpus.pick(2)) == set(QUESTIONS[2:])
+
+    stats = {row["category"]: row for row in corpus.stats()}
+    assert stats["silly"]["uses"] == 2
+    assert stats["default"]["unused"] == 0
+
+
+def test_pick_skips_room_history(corpus, fresh_deduplicator):
+    """Test a room never gets a question it has already seen"""
+    corpus.add(QUESTIONS)
+    fresh_deduplicator.remember(QUESTIONS[:3], "ROOM01")
+
+    assert corpus.pick(3, room_code="ROOM01") == [QUESTIONS[3]]
+
+
+def test_export_round_trips(corpus, tmp_path):
+    """Test exported rows can be imported into a fresh corpus"""
+    corpus.add(QUESTIONS[:2], "silly", source="import")
+
+    rows = corpus.export()
+    copy = QuestionCorpus(str(tmp_path / "copy.db"))
+    for row in rows:
+        copy.add([row["text"]], row["category"], source=row["source"])
+
+    assert [row["text"] for row in copy.export("silly")] == QUESTIONS[:2]
+    copy.close()
+
+
+def test_disabled_corpus_is_a_no_op():
+    """Test an empty path keeps every operation cheap and side-effect free"""
+    corpus = QuestionCorpus("")
+
+    assert corpus.add(QUESTIONS) == 0
+    assert corpus.pick(3) == []
+    assert corpus.stats() == []
+
+
+async def test_pool_uses_corpus_before_model(corpus, monkeypatch):
+    """Test a pool shortfall is covered from the corpus without an inline model call"""
+    corpus.add(QUESTIONS)
+    monkeypatch.setattr(pool_module, "question_corpus", corpus)
+    calls = []
+
+    async def inline(num_questions, category):
+        calls.append(num_questions)
+        return []
+
+    pool = QuestionPool(inline_generator=inline, low_water=0, target=0)
+    questions = await pool.get_questions(3, room_code="ROOM01")
+
+    assert len(questions) == 3
+    assert set(questions) <= set(QUESTIONS)
+    assert calls == []
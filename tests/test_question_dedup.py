@@ -0,0 +1,71 @@
+import time
+from app.services.question_dedup import QuestionDeduplicator
+from app.services.ai_service import FALLBACK_QUESTIONS
+from app.utils.similarity import SimilarityIndex, normalize_text
+
+
+def test_normalize_text():
+    """Test punctuation and case do not affect matching"""
+    assert normalize_text("  What's YOUR  theme-song?? ") == "what s your theme song"
+
+
+def test_index_finds_near_duplicates_only():
+    """Test rephrasings match while unrelated questions do not"""
+    index = SimilarityIndex(threshold=0.6)
+    index.add("yacht", "What's the worst possible name for a luxury yacht?")
+
+    assert index.find("What is the worst possible name for a luxury yacht") == "yacht"
+    assert index.find("Invent a new word and define it") is None
+
+    index.remove("yacht")
+    assert index.find("What's the worst possible name for a luxury yacht?") is None
+
+
+def test_index_evicts_beyond_window():
+    """Test the global window only remembers max_items questions"""
+    index = SimilarityIndex(max_items=2)
+    for i, question in enumerate(FALLBACK_QUESTIONS[:3]):
+        index.add(i, question)
+
+    assert len(index) == 2
+    assert index.find(FALLBACK_QUESTIONS[0]) is None
+    assert index.find(FALLBACK_QUESTIONS[2]) == 2
+
+
+def test_room_history_and_global_window():
+    """Test duplicates are detected per room and across games"""
+    deduplicator = QuestionDeduplicator(window=10)
+    deduplicator.remember(["Invent a new sport - what are the rules?"], room_code="ROOM01")
+
+    assert deduplicator.is_duplicate("Invent a new sport: what are the rules", room_code="ROOM02")
+    assert not deduplicator.is_duplicate(
+        "Invent a new sport: what are the rules", room_code="ROOM02", check_recent=False
+    )
+    assert deduplicator.is_duplicate(
+        "Invent a new sport: what are the rules", room_code="ROOM01", check_recent=False
+    )
+
+
+def test_unique_drops_duplicates_within_batch():
+    """Test a generated batch is reduced to distinct questions"""
+    deduplicator = QuestionDeduplicator()
+    batch = [
+        "What superpower would you want that only works on Tuesdays?",
+        "What superpower would you want that only works on Tuesday?",
+        "Design a holiday - what would people celebrate and how?",
+    ]
+
+    assert deduplicator.unique(batch) == [batch[0], batch[2]]
+
+
+def test_duplicate_check_is_sub_millisecond():
+    """Test a lookup against a full recent window stays well under a millisecond"""
+    deduplicator = QuestionDeduplicator(window=500)
+    deduplicator.remember([f"{q} (variant {i})" for i in range(25) for q in FALLBACK_QUESTIONS])
+
+    start = time.perf_counter()
+    for _ in range(100):
+        deduplicator.is_duplicate("Invent a board game played only with spoons")
+    per_check = (time.perf_counter() - start) / 100
+
+    assert per_check < 0.001
@@ -0,0 +1,167 @@
+import asyncio
+import time
+import pytest
+from openai import AsyncOpenAI
+from app.config import settings
+from app.services import ai_service, question_feed, question_pool
+from app.services.ai_client import ResilientAIClient
+from app.services.ai_service import AIService, NumberedListParser, parse_numbered_questions
+from app.services.question_dedup import QuestionDeduplicator
+from app.services.question_feed import QuestionFeeds
+from app.services.question_pool import QuestionPool
+from tests.fake_openai import FakeOpenAIServer
+
+STREAMED = "\n".join([
+    "Here are your questions:",
+    "1. Invent a board game that uses only spoons",
+    "2. What would a dragon put on its grocery list?",
+    "3. Name a holiday celebrated only by cats",
+])
+
+
+@pytest.fixture
+async def server(monkeypatch):
+    fake = await FakeOpenAIServer(content=STREAMED).start()
+    fake.stream_chunk_size = 5
+    client = ResilientAIClient(
+        client_factory=lambda: AsyncOpenAI(api_key="test", base_url=fake.base_url, max_retries=0)
+    )
+    deduplicator = QuestionDeduplicator()
+    monkeypatch.setattr(settings, "QUESTION_SOURCE", "ai")
+    monkeypatch.setattr(ai_service, "ai_client", client)
+    monkeypatch.setattr(ai_service, "question_deduplicator", deduplicator)
+    monkeypatch.setattr(question_pool, "question_deduplicator", deduplicator)
+    monkeypatch.setattr(question_feed, "question_deduplicator", deduplicator)
+    monkeypatch.setattr(question_feed, "question_pool", QuestionPool(low_water=0, target=0))
+    yield fake
+    await fake.stop()
+
+
+class NullSession:
+    """Session whose rooms are already gone, so stored questions go nowhere"""
+
+    def query(self, *args):
+        return self
+
+    def filter(self, *args):
+        return self
+
+    def first(self):
+        return None
+
+    def close(self):
+        pass
+
+
+def test_incremental_parser_matches_batch_parser():
+    """Test feeding text in arbitrary chunks yields the same questions as a full parse"""
+    parser = NumberedListParser()
+    streamed = []
+    for i in range(0, len(STREAMED), 3):
+        streamed += parser.feed(STREAMED[i:i + 3])
+    streamed += parser.close()
+
+    assert streamed == parse_numbered_questions(STREAMED)
+    assert len(streamed) == 3
+
+
+async def test_stream_questions_yields_as_lines_complete(server):
+    """Test questions arrive incrementally from the streamed completion"""
+    questions = [q async for q in AIService.stream_questions(3)]
+
+    assert questions == parse_numbered_questions(STREAMED)
+    assert server.bodies[0]["stream"] is True
+
+
+async def test_stream_questions_pads_on_failure(server):
+    """Test an upstream error still yields the requested number of questions"""
+    server.statuses = [500]
+
+    questions = [q async for q in AIService.stream_questions(2)]
+
+    assert len(questions) == 2
+    assert all(q in ai_service.FALLBACK_QUESTIONS for q in questions)
+
+
+async def test_feed_returns_first_question_before_stream_completes(server):
+    """Test start() hands back round one's question while the rest are still streaming"""
+    server.stream_delay = 0.05
+    stored = {}
+
+    class FakeSession:
+        def query(self, *args):
+            return self
+
+        def filter(self, *args):
+            return self
+
+        def first(self):
+            return stored.setdefault("room", type("Room", (), {"questions": []})())
+
+        def commit(self):
+            stored["committed"] = list(stored["room"].questions)
+
+        def close(self):
+            pass
+
+    feeds = QuestionFeeds(session_factory=FakeSession)
+
+    started = time.perf_counter()
+    feed = await feeds.start("ROOM01", 3)
+    first_latency = time.perf_counter() - started
+
+    assert len(feed.questions) >= 1
+    assert not feed.done
+
+    third = await feeds.wait_for_question("ROOM01", 3)
+    total_latency = time.perf_counter() - started
+
+    assert third == "Name a holiday celebrated only by cats"
+    assert first_latency < total_latency
+    await feed.wait_for(feed.num_questions + 1)  # returns once the feed is done and stored
+    assert stored["committed"] == parse_numbered_questions(STREAMED)
+
+
+async def test_handoff_stores_a_complete_list(server):
+    """Test draining mid-stream tops the feed up with fallbacks and stores it for other workers"""
+    server.stream_delay = 0.5
+    stored = {}
+
+    class FakeSession:
+        def query(self, *args):
+            return self
+
+        def filter(self, *args):
+            return self
+
+        def first(self):
+            return stored.setdefault("room", type("Room", (), {"questions": []})())
+
+        def commit(self):
+            stored["committed"] = list(stored["room"].questions)
+
+        def close(self):
+            pass
+
+    feeds = QuestionFeeds(session_factory=FakeSession)
+    feed = await feeds.start("ROOM02", 3)
+    assert not feed.done
+
+    await feeds.handoff(timeout=0.01)
+
+    assert len(stored["committed"]) == 3
+    assert stored["committed"] == feed.questions
+
+
+async def test_games_starting_together_share_one_stream(server):
+    """Test concurrent shortfalls are streamed by one model call and split between the rooms"""
+    server.stream_delay = 0.02
+    feeds = QuestionFeeds(session_factory=NullSession)
+
+    first, second = await asyncio.gather(feeds.start("ROOM03", 2), feeds.start("ROOM04", 1))
+    await asyncio.gather(first.wait_for(3), second.wait_for(2))
+
+    assert server.requests == 1
+    assert any("Generate 3 " in message["content"] for message in server.bodies[0]["messages"])
+    assert first.questions[0] != second.questions[0]
+    assert len(first.questions) == 2 and len(second.questions) == 1
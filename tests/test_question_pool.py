@@ -0,0 +1,102 @@
+import asyncio
+import hashlib
+from collections import deque
+import pytest
+from app.services import ai_service, question_pool
+from app.services.question_dedup import QuestionDeduplicator
+from app.services.question_pool import QuestionPool, pool_requests
+
+
+@pytest.fixture(autouse=True)
+def fresh_deduplicator(monkeypatch):
+    """Isolate near-duplicate history between tests"""
+    deduplicator = QuestionDeduplicator()
+    monkeypatch.setattr(question_pool, "question_deduplicator", deduplicator)
+    monkeypatch.setattr(ai_service, "question_deduplicator", deduplicator)
+    return deduplicator
+
+
+def distinct_question(n: int) -> str:
+    return f"Describe {hashlib.sha1(str(n).encode()).hexdigest()[:16]}?"
+
+
+class StubModel:
+    """Deterministic stand-in for the OpenAI-backed generator"""
+
+    def __init__(self, delay: float = 0):
+        self.delay = delay
+        self.calls = []
+        self.counter = 0
+
+    async def __call__(self, num_questions, category=None):
+        self.calls.append((num_questions, category))
+        await asyncio.sleep(self.delay)
+        questions = [distinct_question(self.counter + i) for i in range(num_questions)]
+        self.counter += num_questions
+        return questions
+
+
+async def test_get_questions_hits_warm_pool():
+    """Test a warmed pool serves a game without calling the model"""
+    model = StubModel()
+    pool = QuestionPool(generator=model, low_water=5, target=10, batch_size=5)
+
+    pool.warm()
+    await asyncio.sleep(0.01)
+    assert pool.depth() == 10
+    calls_before = len(model.calls)
+
+    questions = await pool.get_questions(5)
+
+    assert questions == [distinct_question(i) for i in range(5)]
+    assert len(model.calls) == calls_before
+    await pool.close()
+
+
+async def test_get_questions_falls_back_when_empty():
+    """Test an empty pool generates inline and schedules a refill"""
+    model = StubModel(delay=0.01)
+    pool = QuestionPool(generator=model, low_water=3, target=6, batch_size=3)
+    misses = pool_requests.value(category="trivia", outcome="miss")
+
+    questions = await pool.get_questions(2, category="trivia")
+
+    assert len(questions) == 2
+    assert pool_requests.value(category="trivia", outcome="miss") == misses + 1
+    assert (2, "trivia") in model.calls
+
+    await asyncio.sleep(0.05)
+    assert pool.depth("trivia") >= 6
+    await pool.close()
+
+
+async def test_partial_pool_tops_up_remainder():
+    """Test only the shortfall is generated when the pool is partly filled"""
+    model = StubModel()
+    pool = QuestionPool(generator=model, low_water=0, target=0)
+    pool._queues[None] = deque(["Pooled question?"])
+
+    questions = await pool.get_questions(3)
+
+    assert questions[0] == "Pooled question?"
+    assert model.calls == [(2, None)]
+    await pool.close()
+
+
+async def test_pool_skips_near_duplicates(fresh_deduplicator):
+    """Test near-duplicates of room history are discarded and replaced from the pool"""
+    model = StubModel()
+    pool = QuestionPool(generator=model, low_water=0, target=0)
+    pool._queues[None] = deque([
+        "What would you name a restaurant that only serves breakfast foods?",
+        "What would you name a restaurant that only serves breakfast food??",
+        "Invent a new sport - what are the rules?",
+    ])
+    fresh_deduplicator.seed_room("ROOM01", ["Invent a new sport: what are its rules?"])
+
+    questions = await pool.get_questions(2, room_code="ROOM01")
+
+    assert questions[0] == "What would you name a restaurant that only serves breakfast foods?"
+    assert questions[1] == distinct_question(0)
+    assert model.calls == [(1, None)]
+    assert fresh_deduplicator.is_duplicate("what would you name a restaurant that only serves breakfast foods")
@@ -0,0 +1,82 @@
+import time
+import pytest
+from app.config import settings
+from app.services import ai_service
+from app.services.ai_service import AIService, template_questions
+from app.services.question_dedup import QuestionDeduplicator
+from app.services.question_templates import MAX_QUESTION_LENGTH, TemplateQuestionGenerator
+from app.utils.similarity import normalize_text
+
+
+@pytest.fixture(autouse=True)
+def fresh_deduplicator(monkeypatch):
+    deduplicator = QuestionDeduplicator()
+    monkeypatch.setattr(ai_service, "question_deduplicator", deduplicator)
+    return deduplicator
+
+
+def test_same_seed_same_questions():
+    """Test output is reproducible for a given seed"""
+    first = TemplateQuestionGenerator(seed=7).generate(10, "food")
+    second = TemplateQuestionGenerator(seed=7).generate(10, "food")
+
+    assert first == second
+    assert first != TemplateQuestionGenerator(seed=8).generate(10, "food")
+
+
+def test_questions_are_distinct_and_well_formed():
+    """Test a large batch has no repeats and passes the quality checks"""
+    questions = TemplateQuestionGenerator(seed=1).generate(2000)
+
+    assert len({normalize_text(q) for q in questions}) == 2000
+    for question in questions:
+        assert len(question) <= MAX_QUESTION_LENGTH
+        assert question[0].isupper()
+        assert "{" not in question
+        assert " a a" not in question and " an one" not in question
+
+
+def test_generation_is_fast():
+    """Test thousands of questions are produced per second"""
+    generator = TemplateQuestionGenerator(seed=3)
+
+    started = time.perf_counter()
+    questions = generator.generate(1000)
+    elapsed = time.perf_counter() - started
+
+    assert len(questions) == 1000
+    assert elapsed < 1.0
+
+
+def test_unknown_category_is_used_as_topic():
+    """Test categories without their own templates still get on-topic questions"""
+    questions = TemplateQuestionGenerator(seed=5).generate(40, "Pirates")
+
+    assert any("pirates" in q for q in questions)
+
+
+async def test_template_source_never_calls_model(monkeypatch):
+    """Test AIService serves templates without touching the client"""
+    class ExplodingClient:
+        async def chat(self, *args, **kwargs):
+            raise AssertionError("model called")
+
+        def stream(self, *args, **kwargs):
+            raise AssertionError("model called")
+
+    monkeypatch.setattr(settings, "QUESTION_SOURCE", "templates")
+    monkeypatch.setattr(ai_service, "ai_client", ExplodingClient())
+
+    assert len(await AIService.generate_questions(5, "tech")) == 5
+    assert len([q async for q in AIService.stream_questions(3)]) == 3
+    assert await AIService.generate_question()
+
+
+def test_room_history_is_respected(fresh_deduplicator):
+    """Test template questions skip anything the room has already seen"""
+    seen = template_questions(5, room_code="ROOM01")
+    fresh_deduplicator.remember(seen, "ROOM01")
+
+    again = template_questions(5, room_code="ROOM01")
+
+    assert not set(seen) & set(again)
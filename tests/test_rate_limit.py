@@ -0,0 +1,53 @@
+import pytest
+from app.utils.rate_limit import InMemoryBucketBackend, TokenBucketLimiter, decisions
+from app.utils.exceptions import TooManyRequestsException
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+async def test_bucket_allows_burst_then_rejects():
+    """Test a bucket admits `capacity` requests then rejects with Retry-After"""
+    clock = FakeClock()
+    limiter = TokenBucketLimiter("test_burst", capacity=3, per_minute=60, backend=InMemoryBucketBackend(clock=clock))
+
+    for _ in range(3):
+        await limiter.check("1.2.3.4")
+
+    with pytest.raises(TooManyRequestsException) as exc_info:
+        await limiter.check("1.2.3.4")
+
+    assert exc_info.value.status_code == 429
+    assert exc_info.value.headers["Retry-After"] == "1"
+    assert decisions.value(limiter="test_burst", decision="rejected") == 1
+
+    # Other keys have their own bucket
+    await limiter.check("5.6.7.8")
+
+
+async def test_bucket_refills_over_time():
+    """Test tokens come back at the configured rate"""
+    clock = FakeClock()
+    limiter = TokenBucketLimiter("test_refill", capacity=1, per_minute=6, backend=InMemoryBucketBackend(clock=clock))
+
+    await limiter.check("user@example.com")
+    with pytest.raises(TooManyRequestsException):
+        await limiter.check("user@example.com")
+
+    clock.now += 10
+    await limiter.check("user@example.com")
+
+
+async def test_backend_evicts_oldest_keys():
+    """Test the in-memory backend stays bounded"""
+    backend = InMemoryBucketBackend(max_keys=2)
+
+    for key in ("a", "b", "c"):
+        await backend.consume(key, capacity=1, refill_rate=1)
+
+    assert list(backend._buckets) == ["b", "c"]
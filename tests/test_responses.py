@@ -0,0 +1,82 @@
+import json
+import uuid
+from datetime import datetime
+import pytest
+from fastapi import FastAPI
+from fastapi.encoders import jsonable_encoder
+from httpx import AsyncClient
+from tests.conftest import TestingSessionLocal
+from app.api import game
+from app.database import get_db
+from app.dependencies import get_current_principal
+from app.models.room import RoomStatus
+from app.schemas.game import AnswerResponse, LeaderboardResponse, ScoreResponse
+from app.schemas.records import Principal
+from app.schemas.room import RoomCreate, RoomDetailResponse
+from app.schemas.user import UserCreate
+from app.services.auth_service import AuthService
+from app.services.game_service import GameService
+from app.services.room_service import RoomService
+from app.utils.responses import FastJSONResponse, StandardJSONResponse, dump_model_json
+
+
+def test_model_json_matches_fastapi_encoding():
+    """Test models serialize to the same JSON FastAPI's encoder produced"""
+    leaderboard = LeaderboardResponse(scores=[
+        ScoreResponse(user_id=uuid.uuid4(), username=f"player{i}", total_points=i) for i in range(3)
+    ])
+    answers = [AnswerResponse(id=uuid.uuid4(), content="Captain Obvious", vote_count=2)]
+    room = RoomDetailResponse(
+        id=uuid.uuid4(), code="ROOM01", host_id=uuid.uuid4(), status=RoomStatus.WAITING, max_players=8,
+        total_rounds=5, current_round=0, created_at=datetime(2024, 5, 1, 12, 30, 15, 250000), participant_count=0
+    )
+
+    for content in (leaderboard, answers, room):
+        assert json.loads(dump_model_json(content)) == jsonable_encoder(content)
+    assert dump_model_json({"message": "ok"}) is None
+    assert dump_model_json([]) is None
+
+
+@pytest.mark.parametrize("response_class", [FastJSONResponse, StandardJSONResponse])
+def test_response_classes_render_models_and_plain_values(response_class):
+    """Test both classes write models directly and fall back for dicts and empty lists"""
+    score = ScoreResponse(user_id=uuid.uuid4(), username="host", total_points=3)
+
+    assert json.loads(response_class(score).body) == jsonable_encoder(score)
+    assert json.loads(response_class({"message": "ok"}).body) == {"message": "ok"}
+    assert json.loads(response_class([]).body) == []
+
+
+async def test_game_endpoints_return_serialized_models(db):
+    """Test the leaderboard and answer list come back as before, with their status codes"""
+    host = AuthService.register(UserCreate(email="host@example.com", username="host", password="pass123"), db)
+    room = RoomService.create_room(RoomCreate(), host.id, db)
+    GameService.start_game(room.code, host.id, db)
+    round_id = GameService.start_round(room.id, 1, "Name a bad superhero", db).id
+
+    def session():
+        db = TestingSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI(default_response_class=FastJSONResponse)
+    app.include_router(game.router)
+    app.dependency_overrides[get_db] = session
+    app.dependency_overrides[get_current_principal] = lambda: Principal(host.id, host.username)
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        assert (await client.get(f"/api/game/rounds/{round_id}/answers")).json() == []
+
+        submitted = await client.post(f"/api/game/rounds/{round_id}/answer", json={"content": "Captain Obvious"})
+        assert submitted.status_code == 201
+        assert submitted.headers["content-type"] == "application/json"
+        assert submitted.json()["is_own_answer"] is True
+
+        answers = (await client.get(f"/api/game/rounds/{round_id}/answers")).json()
+        assert answers == [{"id": submitted.json()["id"], "content": "Captain Obvious", "vote_count": 0, "is_own_answer": True}]
+
+        leaderboard = await client.get(f"/api/game/{room.code}/leaderboard")
+        assert leaderboard.status_code == 200
+        assert leaderboard.json() == {"scores": []}
@@ -0,0 +1,150 @@
+import uuid
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from tests.conftest import TestingSessionLocal, engine
+from app.database import Base
+from app.api import rooms
+from app.database import get_db
+from app.dependencies import get_current_principal
+from app.schemas.records import Principal
+from app.schemas.room import RoomCreate
+from app.schemas.user import UserCreate
+from app.services import room_cache
+from app.services.auth_service import AuthService
+from app.services.game_service import GameService
+from app.services.room_cache import RoomDetailCache
+from app.services.room_service import RoomService
+from app.utils.db_routing import RoutingSession
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = RoomDetailCache(ttl=60)
+    monkeypatch.setattr(room_cache, "room_details", cache)
+    monkeypatch.setattr(rooms, "room_details", cache)
+    return cache
+
+
+@pytest.fixture
+def game(db):
+    host = AuthService.register(UserCreate(email="host@example.com", username="host", password="pass123"), db)
+    player = AuthService.register(UserCreate(email="player@example.com", username="player", password="pass123"), db)
+    room = RoomService.create_room(RoomCreate(), host.id, db)
+    return room, host, player
+
+
+@pytest.fixture
+def app(game):
+    _, host, _ = game
+
+    def session():
+        db = TestingSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    app.include_router(rooms.router)
+    app.dependency_overrides[get_db] = session
+    app.dependency_overrides[get_current_principal] = lambda: Principal(host.id, host.username)
+    return app
+
+
+async def test_conditional_get_skips_the_database(db, game, app, cache, query_budget):
+    """Test a matching If-None-Match is answered with 304 and no SQL"""
+    room, _, _ = game
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        first = await client.get(f"/api/rooms/{room.code}")
+        assert first.status_code == 200
+        assert first.json()["participant_count"] == 1
+        etag = first.headers["etag"]
+
+        with query_budget(0):
+            second = await client.get(f"/api/rooms/{room.code}", headers={"If-None-Match": etag})
+            third = await client.get(f"/api/rooms/{room.code}")
+
+    assert second.status_code == 304
+    assert second.headers["etag"] == etag
+    assert third.status_code == 200
+    assert third.content == first.content
+
+
+async def test_room_changes_invalidate_the_cache(db, game, app, cache):
+    """Test joins and game progress bump the room version"""
+    room, host, player = game
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        etag = (await client.get(f"/api/rooms/{room.code}")).headers["etag"]
+
+        RoomService.join_room(room.code, player.id, db)
+        joined = await client.get(f"/api/rooms/{room.code}", headers={"If-None-Match": etag})
+        assert joined.status_code == 200
+        assert joined.json()["participant_count"] == 2
+        assert joined.headers["etag"] != etag
+
+        GameService.start_game(room.code, host.id, db)
+        GameService.start_round(room.id, 1, "Name a bad superhero", db)
+        started = await client.get(f"/api/rooms/{room.code}", headers={"If-None-Match": joined.headers["etag"]})
+        assert started.status_code == 200
+        assert started.json()["status"] == "active"
+        assert started.json()["current_round"] == 1
+
+
+async def test_cache_is_filled_from_the_primary(tmp_path, db, game, app, cache):
+    """Test a rebuilt body never comes from a replica that is behind the version it is stored under"""
+    room, _, _ = game
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    Base.metadata.create_all(bind=replica)
+    routed = sessionmaker(class_=RoutingSession, autoflush=False, bind=engine, replica=replica)
+
+    def session():
+        db = routed()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = session
+    try:
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            response = await client.get(f"/api/rooms/{room.code}")
+    finally:
+        replica.dispose()
+
+    assert response.status_code == 200
+    assert response.json()["participant_count"] == 1
+
+
+def test_rebuilt_body_from_another_worker_gets_a_new_version():
+    """Test an expired entry that rebuilds differently is versioned, and an identical one keeps its tag"""
+    cache = RoomDetailCache(ttl=0)
+    room_id = uuid.uuid4()
+
+    first = cache.store("ROOM01", room_id, b'{"participant_count":1}', cache.begin())
+    assert cache.get("ROOM01") is None
+
+    same = cache.store("ROOM01", room_id, b'{"participant_count":1}', cache.begin())
+    changed = cache.store("ROOM01", room_id, b'{"participant_count":2}', cache.begin())
+
+    assert same.etag == first.etag
+    assert changed.etag != first.etag
+    assert changed.etag.startswith(f'"{cache.epoch}-')
+
+
+def test_body_overtaken_by_a_commit_is_not_cached():
+    """Test a body read before a commit landed is served once without a tag"""
+    cache = RoomDetailCache(ttl=60)
+    room_id = uuid.uuid4()
+    cache.store("ROOM01", room_id, b"old", cache.begin())
+
+    since = cache.begin()
+    cache.bump({room_id})
+    overtaken = cache.store("ROOM01", room_id, b"stale", since)
+
+    assert overtaken.etag is None
+    assert cache.get("ROOM01") is None
@@ -3,6 +3,7 @@ from app.services.room_service import RoomService
 from app.services.auth_service import AuthService
 from app.schemas.room import RoomCreate
 from app.schemas.user import UserCreate
+from app.schemas.records import ParticipantRecord
 from app.utils.exceptions import NotFoundException, BadRequestException
 
 
@@ -63,4 +64,16 @@ def test_get_room_participants(db):
     participants = RoomService.get_room_participants(room.id, db)
 
     assert len(participants) == 1
-    assert participants[0].id == host.id
\ No newline at end of file
+    assert participants[0].id == host.id
+
+def test_get_room_participants_returns_records(db):
+    """Test participants are projected to lightweight id/username records"""
+    host_data = UserCreate(email="host@example.com", username="host", password="pass123")
+    host = AuthService.register(host_data, db)
+    room = RoomService.create_room(RoomCreate(), host.id, db)
+
+    participants = RoomService.get_room_participants(room.id, db)
+
+    assert isinstance(participants[0], ParticipantRecord)
+    assert not hasattr(participants[0], "password_hash")
+    assert participants[0].to_dict() == {'id': str(host.id), 'username': "host"}
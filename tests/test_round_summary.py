@@ -0,0 +1,71 @@
+import asyncio
+import pytest
+from uuid import UUID
+from tests.conftest import TestingSessionLocal
+from app.models.round import Round
+from app.services.game_service import GameService
+from app.services.room_service import RoomService
+from app.services.auth_service import AuthService
+from app.services.round_summary import RoundSummaries
+from app.schemas.room import RoomCreate
+from app.schemas.user import UserCreate
+
+
+@pytest.fixture
+def round_id(db):
+    host = AuthService.register(UserCreate(email="host@example.com", username="host", password="pass123"), db)
+    room = RoomService.create_room(RoomCreate(), host.id, db)
+    GameService.start_game(room.code, host.id, db)
+    return str(GameService.start_round(room.id, 1, "Name a bad superhero", db).id)
+
+
+def make_generator(delay: float = 0.0):
+    calls = []
+
+    async def generate(answers):
+        calls.append(answers)
+        await asyncio.sleep(delay)
+        return f"Summary of {len(answers)} answers"
+
+    return generate, calls
+
+
+async def test_summary_ready_before_round_ends(db, round_id):
+    """Test a summary started at voting is cached and persisted"""
+    generate, calls = make_generator()
+    summaries = RoundSummaries(generator=generate, session_factory=TestingSessionLocal)
+
+    summaries.start(round_id, ["Captain Obvious", "The Procrastinator"])
+    summaries.start(round_id, ["Captain Obvious", "The Procrastinator"])
+    await summaries.wait(round_id)
+
+    assert summaries.get(round_id) == "Summary of 2 answers"
+    assert len(calls) == 1
+
+    db.expire_all()
+    assert db.query(Round).filter(Round.id == UUID(round_id)).first().summary == "Summary of 2 answers"
+
+
+async def test_summary_pending_is_delivered_later(db, round_id):
+    """Test a slow summary does not block results and can be awaited for a follow-up"""
+    generate, _ = make_generator(delay=0.05)
+    summaries = RoundSummaries(generator=generate, session_factory=TestingSessionLocal)
+
+    summaries.start(round_id, ["Captain Obvious"])
+
+    assert summaries.get(round_id) is None
+    assert summaries.pending(round_id)
+    assert await summaries.wait(round_id) == "Summary of 1 answers"
+    assert not summaries.pending(round_id)
+
+
+async def test_persisted_summary_is_not_regenerated(db, round_id):
+    """Test a summary loaded from the database is served without a model call"""
+    generate, calls = make_generator()
+    summaries = RoundSummaries(generator=generate, session_factory=TestingSessionLocal)
+
+    assert summaries.get(round_id, "Stored summary") == "Stored summary"
+    summaries.start(round_id, ["Captain Obvious"])
+
+    assert not summaries.pending(round_id)
+    assert calls == []